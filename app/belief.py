@@ -0,0 +1,331 @@
+from operator import mul
+from app.piece import Owner
+from app.rank import NUM_RANKS, RANKS, ATTACK_OUTCOMES, INITIAL_RANK_COUNTS
+
+"""
+A Distribution is a tuple of NUM_RANKS floats, indexed by rank code,
+giving the probability of a piece having each rank.
+"""
+
+
+def _rank_mask(ranks):
+    """
+    iter(Rank) -> tuple(int)
+
+    Returns a mask with a 1 for each rank code in the given ranks and
+    a 0 everywhere else.
+
+    """
+    codes = {r.code for r in ranks}
+    return tuple(int(code in codes) for code in range(NUM_RANKS))
+
+
+# _OUTCOME_MASKS[(code, result)] keeps the ranks that produce result
+# when attacking a piece with the given rank code
+_OUTCOME_MASKS = {(code, result): tuple(
+    int(ATTACK_OUTCOMES[a][code] == result) for a in range(NUM_RANKS))
+    for code in range(NUM_RANKS) for result in ["win", "tie", "loss"]}
+_FLAG_MASK = _rank_mask([RANKS[-1]])
+
+# Expected number of each rank among the opponent's pieces at the start
+_INITIAL_COUNTS = tuple(float(INITIAL_RANK_COUNTS[r]) for r in RANKS)
+
+# Limits for balance: iteration stops once every column sum is within
+# BALANCE_TOLERANCE of its expected count, once a pass takes less than
+# BALANCE_PROGRESS of the error away, or after BALANCE_ITERATIONS
+BALANCE_ITERATIONS = 100
+BALANCE_TOLERANCE = 5e-3
+BALANCE_PROGRESS = 0.01
+
+# Largest factor balance may scale a column by, so that a column whose
+# count the rows cannot meet does not grow without bound
+MAX_COLUMN_SCALE = 1e6
+
+
+def _normalize(row):
+    """
+    list(float) -> Distribution
+
+    Scales the given row so that it sums to 1.
+
+    """
+    total = sum(row)
+    return tuple(p / total for p in row)
+
+
+def _distribution_of(piece):
+    """
+    Piece -> Distribution
+
+    Returns the given piece's rank distribution as floats.
+
+    """
+    return _normalize([float(p) for p in piece.distribution()])
+
+
+class BeliefMatrix:
+    """
+    Instance variables:
+    dict(Position, Distribution) rows
+    tuple(float)                 counts
+
+    Holds one rank distribution for every opponent piece, keyed by
+    the piece's position. Updates apply a mask to a whole row and
+    renormalize it, and return a new BeliefMatrix leaving this one
+    unchanged.
+
+    counts is the expected number of pieces of each rank (indexed by
+    rank code) still on the board. Each removed piece takes its row's
+    distribution out of counts. balance uses counts to make the rows
+    agree with how many pieces of each rank the opponent has.
+
+    """
+
+    def __init__(self, rows, counts=_INITIAL_COUNTS):
+        """
+        dict(Position, Distribution) tuple(float) -> BeliefMatrix
+
+        Constructs a BeliefMatrix with the given rows and counts.
+
+        """
+        self.rows = rows
+        self.counts = counts
+
+    def row(self, position):
+        """
+        Position -> Distribution
+
+        Returns the distribution of the piece at the given position.
+
+        """
+        return self.rows[position]
+
+    def column(self, rank):
+        """
+        Rank -> list(float)
+
+        Returns the probability of each opponent piece having the given
+        rank, in the same order as positions().
+
+        """
+        code = rank.code
+        return [row[code] for row in self.rows.values()]
+
+    def positions(self):
+        """
+        -> list(Position)
+
+        Returns the positions of all opponent pieces.
+
+        """
+        return list(self.rows.keys())
+
+    def _with_row(self, position, row):
+        """
+        Position Distribution -> BeliefMatrix
+
+        Returns a copy of this BeliefMatrix with the given row replaced.
+
+        """
+        rows = dict(self.rows)
+        rows[position] = row
+        return BeliefMatrix(rows, self.counts)
+
+    def apply_mask(self, position, mask):
+        """
+        Position tuple(int) -> BeliefMatrix
+
+        Zeroes every rank whose entry in mask is 0 for the piece at the
+        given position and renormalizes its row. If no rank remains,
+        the piece is assumed to be equally likely to be any unmasked
+        rank.
+
+        """
+        row = [p * m for (p, m) in zip(self.rows[position], mask)]
+        if sum(row) == 0:
+            row = [float(m) for m in mask]
+        return self._with_row(position, _normalize(row))
+
+    def exclude_ranks(self, position, ranks):
+        """
+        Position iter(Rank) -> BeliefMatrix
+
+        Excludes the given ranks for the piece at the given position.
+
+        """
+        excluded = _rank_mask(ranks)
+        return self.apply_mask(position, tuple(1 - m for m in excluded))
+
+    def update_from_attack(self, position, player_rank, attack_result):
+        """
+        Position Rank str -> BeliefMatrix
+
+        Keeps only the ranks for which the piece at the given position
+        attacking a piece of player_rank would have attack_result.
+
+        """
+        mask = _OUTCOME_MASKS[(player_rank.code, attack_result)]
+        return self.apply_mask(position, mask)
+
+    def set_flag(self, position):
+        """
+        Position -> BeliefMatrix
+
+        Indicates that the piece at the given position is the flag.
+
+        """
+        return self.apply_mask(position, _FLAG_MASK)
+
+    def add(self, piece):
+        """
+        Piece -> BeliefMatrix
+
+        Adds a row for the given opponent piece, starting from
+        the piece's own rank distribution.
+
+        """
+        return self._with_row(piece.position, _distribution_of(piece))
+
+    def move(self, src, dest):
+        """
+        Position Position -> BeliefMatrix
+
+        Moves the row for the piece at src to dest.
+
+        """
+        rows = dict(self.rows)
+        rows[dest] = rows.pop(src)
+        return BeliefMatrix(rows, self.counts)
+
+    def remove(self, position):
+        """
+        Position -> BeliefMatrix
+
+        Removes the row for the piece at the given position, taking
+        its distribution out of counts.
+
+        """
+        rows = dict(self.rows)
+        row = rows.pop(position)
+        counts = tuple(max(c - p, 0.0) for (c, p) in zip(self.counts, row))
+        return BeliefMatrix(rows, counts)
+
+    def balance(self):
+        """
+        -> BeliefMatrix
+
+        Adjusts the rows so that, summed over all pieces, the expected
+        number of pieces of each rank matches counts, while every row
+        still sums to 1 and ranks that were ruled out for a piece stay
+        ruled out. This is done by iterative proportional fitting:
+        alternately scaling each column to its count and each row to 1,
+        until every column is within BALANCE_TOLERANCE of its count.
+
+        Counts the rows cannot meet are first brought within reach (see
+        _targets), and ranks that some pieces must take up between them
+        are ruled out for every other piece (see _rule_out_taken_ranks),
+        which the fitting would otherwise only approach slowly.
+
+        """
+        positions = list(self.rows.keys())
+        targets = _targets(list(self.rows.values()), self.counts)
+        rows = _rule_out_taken_ranks(list(self.rows.values()), targets)
+        columns = list(zip(*rows))
+
+        # Every balanced row is rows[i][j] * row_scale[i] * column_scale[j],
+        # and ranks the opponent has none of left are ruled out at once
+        column_scale = [float(target > 0) for target in targets]
+        last_error = None
+        for i in range(BALANCE_ITERATIONS):
+            row_scale = [1 / (sum(map(mul, row, column_scale)) or 1.0)
+                         for row in rows]
+            totals = [sum(map(mul, column, row_scale)) for column in columns]
+
+            # Stop once every column with rows left in it sums to its
+            # target, or once the fitting is no longer getting closer
+            error = max([abs(total * scale - target)
+                         for (total, scale, target)
+                         in zip(totals, column_scale, targets) if total > 0],
+                        default=0.0)
+            if error < BALANCE_TOLERANCE or (
+                    last_error is not None and
+                    error > last_error * (1 - BALANCE_PROGRESS)):
+                break
+            last_error = error
+            column_scale = [min(target / total, MAX_COLUMN_SCALE)
+                            if total > 0 else scale
+                            for (total, scale, target)
+                            in zip(totals, column_scale, targets)]
+
+        balanced_rows = {}
+        for (position, row) in zip(positions, rows):
+            row = list(map(mul, row, column_scale))
+            total = sum(row)
+            # Keep the old row rather than rule out every rank
+            if 0 < total < float("inf"):
+                balanced_rows[position] = tuple(p / total for p in row)
+            else:
+                balanced_rows[position] = self.rows[position]
+
+        return BeliefMatrix(balanced_rows, self.counts)
+
+
+def _targets(rows, counts):
+    """
+    list(Distribution) tuple(float) -> list(float)
+
+    Returns the column sums balance aims for: counts, except that no
+    rank is given more pieces than there are rows it is possible for,
+    and the other counts are scaled so that the targets add up to the
+    number of rows.
+
+    """
+    capacities = [sum(1 for p in column if p > 0) for column in zip(*rows)]
+    targets = [min(count, capacity)
+               for (count, capacity) in zip(counts, capacities)]
+    capped = sum(t for (t, c) in zip(targets, counts) if t < c)
+    free = sum(t for (t, c) in zip(targets, counts) if t == c)
+    if free > 0:
+        scale = (len(rows) - capped) / free
+        targets = [min(t * scale, capacity) if t == c else t
+                   for (t, c, capacity) in zip(targets, counts, capacities)]
+    return targets
+
+
+def _rule_out_taken_ranks(rows, targets):
+    """
+    list(Distribution) list(float) -> list(Distribution)
+
+    Returns the rows with ranks ruled out for pieces that cannot have
+    them. When the pieces that can only have ranks in some set are at
+    least as many as the targets of those ranks add up to, they take
+    all of them, so no other piece can have any of those ranks. Only
+    the sets of ranks possible for some piece are checked.
+
+    """
+    supports = [frozenset(code for (code, p) in enumerate(row) if p > 0)
+                for row in rows]
+    for ranks in set(supports):
+        if len(ranks) == NUM_RANKS:
+            continue
+        inside = sum(1 for support in supports if support <= ranks)
+        if inside < sum(targets[code] for code in ranks) - BALANCE_TOLERANCE:
+            continue
+        mask = tuple(int(code not in ranks) for code in range(NUM_RANKS))
+        rows = [row if support <= ranks else tuple(map(mul, row, mask))
+                for (row, support) in zip(rows, supports)]
+        supports = [support if support <= ranks else support - ranks
+                    for support in supports]
+    return rows
+
+
+def from_board(board):
+    """
+    Board -> BeliefMatrix
+
+    Returns a BeliefMatrix holding the current rank distribution of
+    every opponent piece on the given board.
+
+    """
+    return BeliefMatrix({p.position: _distribution_of(p)
+                         for p in board.iterate_pieces(Owner.OPPONENT)})
@@ -0,0 +1,78 @@
+import app.board_layout as board_layout
+
+"""
+A Bitboard is an int where bit i is set if the space with
+board_layout.index_of(position) == i is included. The board has 60
+spaces, so every set of spaces fits in a single int.
+"""
+
+
+def bit(position):
+    """
+    Position -> Bitboard
+
+    Returns the bitboard containing only the given position.
+
+    """
+    return 1 << board_layout.index_of(position)
+
+
+def iterate_positions(mask):
+    """
+    Bitboard -> iter(Position)
+
+    Returns a generator of the positions in the given bitboard,
+    in order of increasing index.
+
+    """
+    while mask:
+        low = mask & -mask
+        yield board_layout.position_of(low.bit_length() - 1)
+        mask ^= low
+
+
+def iterate_indices(mask):
+    """
+    Bitboard -> iter(int)
+
+    Returns a generator of the space indices in the given bitboard,
+    in increasing order.
+
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _adjacent_mask(index):
+    """
+    int -> Bitboard
+
+    Returns the bitboard of spaces adjacent to the space at index.
+
+    """
+    mask = 0
+    for position in board_layout.iterate_adjacent(
+            board_layout.position_of(index)):
+        mask |= bit(position)
+    return mask
+
+
+def mask_where(predicate):
+    """
+    (Position -> bool) -> Bitboard
+
+    Returns the bitboard of all spaces satisfying the given predicate.
+
+    """
+    mask = 0
+    for i in range(board_layout.NUM_SPACES):
+        if predicate(board_layout.position_of(i)):
+            mask |= 1 << i
+    return mask
+
+
+ADJACENT_MASKS = [_adjacent_mask(i) for i in range(board_layout.NUM_SPACES)]
+CAMP_MASK = mask_where(board_layout.is_camp)
+HEADQUARTERS_MASK = mask_where(board_layout.is_headquarters)
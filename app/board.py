@@ -1,8 +1,15 @@
 import copy
 import logging
+import random
+import app.belief as belief
+import app.bitboard as bitboard
 import app.board_layout as board_layout
+import app.piece_square as piece_square
+import app.railroad as railroad
+import app.sampler as sampler
+import app.zobrist as zobrist
 from app.piece import Piece, Owner
-from app.rank import Rank
+from app.rank import Rank, NUM_RANKS
 
 
 """
@@ -12,6 +19,9 @@ row is 0 - 11 and col is 0 - 4.
 
 log = logging.getLogger("board")
 
+# Engineers may turn corners when moving along the railroad
+ENGINEER = Rank('1')
+
 
 class PieceNotFoundException(Exception):
     """
@@ -36,7 +46,52 @@ class PieceNotFoundException(Exception):
 class Board:
     """
     Instance variables:
-    list(Piece) pieces_list
+    list(Piece)         pieces_list
+    list(Piece | None)  cells
+    list(Bitboard)      occupancy
+    list(Bitboard)      mobile
+    int                 zobrist_key
+    BeliefMatrix | None beliefs
+    RankSampler | None  _sampler
+    list(list(Number))  rank_counts
+    list(Number)        material
+    list(int)           movable
+    Number              placement
+
+    cells holds one entry per space, indexed by board_layout.index_of,
+    and is kept in sync with pieces_list so that looking up the piece
+    at a position does not require scanning every piece.
+
+    occupancy holds the bitboard of spaces occupied by each Owner
+    (see app.bitboard) and is used for move generation. mobile holds
+    the bitboard of spaces occupied by each Owner's pieces that are not
+    stationary, so that move generation only visits pieces that can
+    move.
+
+    zobrist_key identifies the position (see app.zobrist) and is
+    updated incrementally along with cells.
+
+    beliefs is an optional app.belief.BeliefMatrix holding the rank
+    distributions of all opponent pieces as floats. It is only present
+    once enabled with with_beliefs, and is then kept up to date by
+    every operation that returns a new Board.
+
+    _sampler caches the RankSampler returned by rank_sampler, as
+    Boards do not change once they have been returned.
+
+    rank_counts, material and movable are tallies of each Owner's
+    pieces, and placement a tally of the player's pieces, updated
+    incrementally along with cells so that evaluation does not have to
+    scan every piece. rank_counts[owner] holds the expected number of
+    pieces of each rank, indexed by rank code, and material[owner]
+    their expected total worth by rank.RANK_WORTH; for the player's
+    pieces, whose ranks are known, these are exact counts.
+    movable[owner] is the number of pieces that are not stationary.
+    placement is the sum of the values of the player's pieces in the
+    piece-square tables (see app.piece_square), which are oriented for
+    the player. What each piece adds to them is cached by Piece.tally,
+    and moving a piece only updates the tallies that depend on its
+    position.
 
     """
 
@@ -47,25 +102,217 @@ class Board:
 
         """
         self.pieces_list = pieces_list
+        self.cells = [None] * board_layout.NUM_SPACES
+        self.occupancy = [0, 0]
+        self.mobile = [0, 0]
+        self.zobrist_key = 0
+        self.beliefs = None
+        self._sampler = None
+        self.rank_counts = [[0] * NUM_RANKS, [0] * NUM_RANKS]
+        self.material = [0, 0]
+        self.movable = [0, 0]
+        self.placement = 0
+
+        for piece in pieces_list:
+            self._add_to_index(piece)
+
+    def _copy(self, pieces_list):
+        """
+        list(Piece) -> Board
+
+        Returns a new Board with the given pieces whose index starts out
+        as a copy of this Board's. The caller is responsible for bringing
+        the index in line with pieces_list.
+
+        """
+        board = Board.__new__(Board)
+        board.pieces_list = pieces_list
+        board.cells = list(self.cells)
+        board.occupancy = list(self.occupancy)
+        board.mobile = list(self.mobile)
+        board.zobrist_key = self.zobrist_key
+        board.beliefs = self.beliefs
+        board._sampler = None
+        board.rank_counts = [list(counts) for counts in self.rank_counts]
+        board.material = list(self.material)
+        board.movable = list(self.movable)
+        board.placement = self.placement
+        return board
+
+    def _add_to_index(self, piece):
+        """
+        Piece ->
+
+        Records the given piece in this Board's index.
+
+        """
+        self.cells[board_layout.index_of(piece.position)] = piece
+        self.occupancy[piece.owner] |= bitboard.bit(piece.position)
+        self.zobrist_key ^= zobrist.piece_key(piece)
+        self._tally(piece, 1)
+
+    def _remove_from_index(self, piece):
+        """
+        Piece ->
+
+        Removes the given piece from this Board's index.
+
+        """
+        self.cells[board_layout.index_of(piece.position)] = None
+        self.occupancy[piece.owner] &= ~bitboard.bit(piece.position)
+        self.zobrist_key ^= zobrist.piece_key(piece)
+        self._tally(piece, -1)
+
+    def _tally(self, piece, sign):
+        """
+        Piece int ->
+
+        Adds the given piece to this Board's tallies if sign is 1, or
+        takes it away if sign is -1.
+
+        """
+        owner = piece.owner
+        index = board_layout.index_of(piece.position)
+        tables = piece_square.TABLES
+        (worth, support, immobile) = piece.tally()
+        counts = self.rank_counts[owner]
+        for (code, p) in support:
+            counts[code] += sign * p
+        self.material[owner] += sign * worth
+        if not (immobile or board_layout.is_headquarters(piece.position)):
+            self.movable[owner] += sign
+            self.mobile[owner] ^= 1 << index
+        if owner == Owner.PLAYER:
+            for (code, p) in support:
+                self.placement += sign * p * tables[code][index]
+
+    def _move_in_index(self, piece, moved):
+        """
+        Piece Piece ->
+
+        Replaces the given piece in this Board's index with moved, the
+        same piece at another position. Only the tallies that depend on
+        position are updated.
+
+        """
+        (src, dest) = (piece.position, moved.position)
+        src_index = board_layout.index_of(src)
+        dest_index = board_layout.index_of(dest)
+        owner = piece.owner
+        self.cells[src_index] = None
+        self.cells[dest_index] = moved
+        self.occupancy[owner] ^= (1 << src_index) | (1 << dest_index)
+        self.zobrist_key ^= zobrist.move_key(piece, dest)
+
+        (worth, support, immobile) = piece.tally()
+        if not immobile:
+            # Pieces in a headquarters can no longer move
+            src_bit = (1 << src_index) & ~bitboard.HEADQUARTERS_MASK
+            dest_bit = (1 << dest_index) & ~bitboard.HEADQUARTERS_MASK
+            self.mobile[owner] ^= src_bit | dest_bit
+            self.movable[owner] += (dest_bit != 0) - (src_bit != 0)
+        if owner == Owner.PLAYER:
+            tables = piece_square.TABLES
+            for (code, p) in support:
+                self.placement += p * (tables[code][dest_index] -
+                                       tables[code][src_index])
 
     def initialize_opponent_pieces(self):
         """
         -> Board
 
         Adds all of the opponent's pieces to the board in their
-        initial configuration.
+        initial configuration, one in every space on the opponent's
+        side except the camps.
 
         """
         board = self
 
         for x in range(0, 5):
             for y in range(6, 12):
+                # Camps are always empty at the start of the game
+                if board_layout.is_camp((x, y)):
+                    continue
                 (numerators, denominators) = _initial_probability_for((x, y))
                 piece = Piece((x, y), Owner.OPPONENT, numerators, denominators)
                 board = board.place_piece(piece)
 
         return board
 
+    def with_beliefs(self):
+        """
+        -> Board
+
+        Returns a copy of this Board that also tracks the rank
+        distributions of all opponent pieces in a BeliefMatrix.
+
+        """
+        board = self._copy(self.pieces_list)
+        board.beliefs = belief.from_board(self).balance()
+        return board
+
+    def with_belief_pieces(self):
+        """
+        -> Board
+
+        Returns a copy of this Board where every opponent piece has its
+        row of the BeliefMatrix as its rank distribution (see
+        Piece.with_distribution), so that Boards built from its pieces
+        without beliefs, such as SearchBoards, still use the balanced
+        distributions. Returns this Board if it has no BeliefMatrix.
+
+        """
+        if self.beliefs is None:
+            return self
+
+        rows = self.beliefs.rows
+        pieces_list = [p.with_distribution(rows[p.position])
+                       if p.position in rows else p
+                       for p in self.pieces_list]
+        board = self._copy(pieces_list)
+        for (piece, new_piece) in zip(self.pieces_list, pieces_list):
+            if new_piece is not piece:
+                board._remove_from_index(piece)
+                board._add_to_index(new_piece)
+        return board
+
+    def rank_distribution(self, position):
+        """
+        Position -> list(Number)
+
+        Returns the rank distribution, indexed by rank code, of the
+        piece at the given position. The BeliefMatrix is used for
+        opponent pieces when this Board has one.
+
+        """
+        if self.beliefs is not None and position in self.beliefs.rows:
+            return self.beliefs.row(position)
+        return self.piece_at(position).distribution()
+
+    def rank_sampler(self):
+        """
+        -> RankSampler
+
+        Returns a sampler of rank assignments for the opponent pieces
+        on this Board (see app.sampler). The sampler is built on the
+        first call and reused by later ones.
+
+        """
+        if self._sampler is None:
+            self._sampler = sampler.RankSampler(self)
+        return self._sampler
+
+    def sample_ranks(self, generator=random):
+        """
+        random.Random -> (tuple(Position), Assignment)
+
+        Returns the positions of the opponent pieces and a random
+        assignment of rank codes to them, drawn with the given generator.
+
+        """
+        rank_sampler = self.rank_sampler()
+        return (rank_sampler.positions, rank_sampler.sample(generator))
+
     def serialize(self):
         """
         -> str
@@ -85,7 +332,12 @@ class Board:
         """
         new_list = copy.copy(self.pieces_list)
         new_list.append(piece)
-        return Board(new_list)
+
+        board = self._copy(new_list)
+        board._add_to_index(piece)
+        if board.beliefs is not None and piece.owner == Owner.OPPONENT:
+            board.beliefs = board.beliefs.add(piece)
+        return board
 
     def piece_at(self, position):
         """
@@ -94,8 +346,7 @@ class Board:
         Returns the piece at the given position.
 
         """
-        return next(
-            (p for p in self.pieces_list if p.position == position), None)
+        return self.cells[board_layout.index_of(position)]
 
     def move_piece(self, src, dest):
         """
@@ -107,13 +358,19 @@ class Board:
         piece = self.piece_at(src)
 
         if piece is not None:
+            moved = piece.move(dest)
+
             # List without piece
-            new_list = [p for p in self.pieces_list if p != piece]
+            new_list = [p for p in self.pieces_list if p is not piece]
 
             # Add piece to list
-            new_list.append(piece.move(dest))
+            new_list.append(moved)
 
-            return Board(new_list)
+            board = self._copy(new_list)
+            board._move_in_index(piece, moved)
+            if board.beliefs is not None and piece.owner == Owner.OPPONENT:
+                board.beliefs = board.beliefs.move(src, dest)
+            return board
         else:
             raise PieceNotFoundException("Cannot move piece from ( %c%d )"
                                          % (ord('A') + src[0], src[1] + 1))
@@ -129,8 +386,13 @@ class Board:
 
         if piece is not None:
             # List without piece
-            new_list = [p for p in self.pieces_list if p != piece]
-            return Board(new_list)
+            new_list = [p for p in self.pieces_list if p is not piece]
+
+            board = self._copy(new_list)
+            board._remove_from_index(piece)
+            if board.beliefs is not None and piece.owner == Owner.OPPONENT:
+                board.beliefs = board.beliefs.remove(pos)
+            return board
         else:
             raise PieceNotFoundException("Cannot remove piece from ( %c%d )"
                                          % (ord('A') + pos[0], pos[1] + 1))
@@ -176,10 +438,45 @@ class Board:
         if piece.is_stationary():
             return iter([])
 
-        i = board_layout.iterate_adjacent(piece.position)
-        # Make sure we exclude blocked spaces
-        i = filter(lambda m: not self.is_space_blocked_for(m, piece.owner), i)
-        return i
+        return bitboard.iterate_positions(self.move_mask_for(piece))
+
+    def move_mask_for(self, piece):
+        """
+        Piece -> Bitboard
+
+        Returns the bitboard of spaces the given piece can move to or
+        attack, either by stepping to an adjacent space or by moving
+        along the railroad, excluding spaces that are blocked for it
+        (see is_space_blocked_for).
+
+        """
+        own = self.occupancy[piece.owner]
+        other = self.occupancy[1 - piece.owner]
+        index = board_layout.index_of(piece.position)
+
+        mask = bitboard.ADJACENT_MASKS[index]
+        if railroad.RAIL_MASK & (1 << index):
+            if ENGINEER in piece.ranks():
+                mask |= railroad.engineer_mask(index, own | other)
+            else:
+                mask |= railroad.slide_mask(index, own | other)
+
+        return mask & ~own & ~(other & bitboard.CAMP_MASK)
+
+    def step_mask_for(self, piece):
+        """
+        Piece -> Bitboard
+
+        Returns the bitboard of adjacent spaces that are not blocked
+        for the given piece, ignoring the railroad.
+
+        """
+        own = self.occupancy[piece.owner]
+        other = self.occupancy[1 - piece.owner]
+        adjacent = bitboard.ADJACENT_MASKS[
+            board_layout.index_of(piece.position)]
+
+        return adjacent & ~own & ~(other & bitboard.CAMP_MASK)
 
     def iterate_all_moves(self, owner):
         """
@@ -191,9 +488,14 @@ class Board:
         the given player and is allowed to relocate to position_to or attack
         a piece that is currently present at position_to
 
+        Only the pieces in mobile[owner] are visited, so stationary
+        pieces are skipped without being looked at.
+
         """
-        for piece in self.iterate_pieces(owner):
-            for move in self.iterate_moves_for_piece(piece):
+        cells = self.cells
+        for index in bitboard.iterate_indices(self.mobile[owner]):
+            piece = cells[index]
+            for move in bitboard.iterate_positions(self.move_mask_for(piece)):
                 yield (piece.position, move)
 
     def update_probabilities_from_attack(self, msg):
@@ -226,7 +528,13 @@ class Board:
                     attack_result):
                 ranks_to_exclude.append(rank)
 
-        return self.exclude_ranks(opponent_piece, ranks_to_exclude)
+        board = self._replace_piece(
+            opponent_piece, opponent_piece.exclude_ranks(ranks_to_exclude))
+        if board.beliefs is not None:
+            board.beliefs = board.beliefs.update_from_attack(
+                opponent_piece.position, player_piece.get_rank(),
+                attack_result)
+        return board
 
     def exclude_ranks(self, piece, ranks):
         """
@@ -236,16 +544,31 @@ class Board:
         the updated board.
 
         """
-        new_piece = piece.exclude_ranks(ranks)
+        board = self._replace_piece(piece, piece.exclude_ranks(ranks))
+        if board.beliefs is not None and piece.owner == Owner.OPPONENT:
+            board.beliefs = board.beliefs.exclude_ranks(piece.position, ranks)
+        return board
+
+    def _replace_piece(self, piece, new_piece):
+        """
+        Piece Piece -> Board
+
+        Returns a Board with the given piece replaced by new_piece,
+        which must have the same position.
+
+        """
         new_list = []
 
         for p in self.pieces_list:
-            if p == piece:
+            if p is piece:
                 new_list.append(new_piece)
             else:
                 new_list.append(p)
 
-        return Board(new_list)
+        board = self._copy(new_list)
+        board._remove_from_index(piece)
+        board._add_to_index(new_piece)
+        return board
 
     def update(self, msg):
         """
@@ -261,17 +584,34 @@ class Board:
             # If a piece moves, it cannot be a landmine
             piece = self.piece_at(msg.posfrom)
             updated = self.exclude_ranks(piece, {Rank('L')})
-            return updated.move_piece(msg.posfrom, msg.posto)
+            board = updated.move_piece(msg.posfrom, msg.posto)
+        else:
+            updated = self.update_probabilities_from_attack(msg)
 
-        updated = self.update_probabilities_from_attack(msg)
+            if move_type == "win":
+                without_loser = updated.remove_piece(msg.posto)
+                board = without_loser.move_piece(msg.posfrom, msg.posto)
+            elif move_type == "loss":
+                board = updated.remove_piece(msg.posfrom)
+            else:
+                board = (updated.remove_piece(msg.posfrom)
+                         .remove_piece(msg.posto))
 
-        if move_type == "win":
-            without_loser = updated.remove_piece(msg.posto)
-            return without_loser.move_piece(msg.posfrom, msg.posto)
-        if move_type == "loss":
-            return updated.remove_piece(msg.posfrom)
-        if move_type == "tie":
-            return updated.remove_piece(msg.posfrom).remove_piece(msg.posto)
+        board._balance_beliefs()
+        return board
+
+    def _balance_beliefs(self):
+        """
+        ->
+
+        Makes this Board's beliefs (if any) consistent with the number
+        of pieces of each rank the opponent has (see
+        BeliefMatrix.balance). Only used on Boards that have not yet
+        been returned to a caller.
+
+        """
+        if self.beliefs is not None:
+            self.beliefs = self.beliefs.balance()
 
     def set_flag(self, position):
         """
@@ -287,7 +627,12 @@ class Board:
         assert(board_layout.is_headquarters(position))
 
         piece = self.piece_at(position)
-        return self.exclude_ranks(piece, set(piece.ranks()) - {Rank('F')})
+        board = self._replace_piece(
+            piece, piece.exclude_ranks(set(piece.ranks()) - {Rank('F')}))
+        if board.beliefs is not None:
+            board.beliefs = board.beliefs.set_flag(position)
+            board._balance_beliefs()
+        return board
 
     def dump_debug_board(self):
         """
@@ -299,6 +644,9 @@ class Board:
         log.debug(" | ".join([str(p) for p in self.pieces_list]))
 
 
+_initial_probabilities = {}
+
+
 def _initial_probability_for(position):
     """
     Position -> dict(Rank, Fraction)
@@ -319,6 +667,12 @@ def _initial_probability_for(position):
 
     """
     (x, y) = position
+    key = (board_layout.is_headquarters(position),
+           y in range(10, 12), y in range(7, 12))
+
+    # Pieces in the same kind of space share the same dictionaries
+    if key in _initial_probabilities:
+        return _initial_probabilities[key]
 
     numerators = {}
     denominators = {}
@@ -349,4 +703,5 @@ def _initial_probability_for(position):
         numerators[Rank(str(r))] = 1
         denominators[Rank(str(r))] = 19
 
+    _initial_probabilities[key] = (numerators, denominators)
     return (numerators, denominators)
@@ -0,0 +1,120 @@
+import struct
+from array import array
+import app.board_layout as board_layout
+from app.belief import BeliefMatrix
+from app.board import Board
+from app.piece import Piece
+from app.rank import RANKS, NUM_RANKS
+
+"""
+A compact binary encoding of Boards and Moves, used to send them to
+other processes (see app.parallel) without pickling every Piece.
+
+A Board is encoded as a header (number of pieces, whether it has
+beliefs), then each piece in pieces_list order as its space index,
+owner and number of possible ranks followed by a (rank code,
+numerator, denominator) triple for each rank. If the Board has
+beliefs, the expected rank counts follow as doubles, then one row of
+doubles for each opponent piece, preceded by its space index.
+
+Moves are encoded as a pair of space indices each.
+"""
+
+_HEADER = struct.Struct("<B?")
+_PIECE = struct.Struct("<BBB")
+_RANK = struct.Struct("<Bhh")
+_INDEX = struct.Struct("<B")
+_ROW_BYTES = NUM_RANKS * array('d').itemsize
+
+
+def encode(board):
+    """
+    Board -> bytes
+
+    Returns the encoding of the given Board.
+
+    """
+    parts = [_HEADER.pack(len(board.pieces_list), board.beliefs is not None)]
+
+    for piece in board.pieces_list:
+        parts.append(_PIECE.pack(board_layout.index_of(piece.position),
+                                 piece.owner, len(piece.prob_numerators)))
+        for rank in piece.ranks():
+            parts.append(_RANK.pack(rank.code, piece.prob_numerators[rank],
+                                    piece.prob_denominators[rank]))
+
+    if board.beliefs is not None:
+        parts.append(array('d', board.beliefs.counts).tobytes())
+        for (position, row) in board.beliefs.rows.items():
+            parts.append(_INDEX.pack(board_layout.index_of(position)))
+            parts.append(array('d', row).tobytes())
+
+    return b"".join(parts)
+
+
+def decode(data):
+    """
+    bytes -> Board
+
+    Returns the Board with the given encoding.
+
+    """
+    (num_pieces, has_beliefs) = _HEADER.unpack_from(data, 0)
+    offset = _HEADER.size
+    pieces = []
+
+    for i in range(num_pieces):
+        (index, owner, num_ranks) = _PIECE.unpack_from(data, offset)
+        offset += _PIECE.size
+        position = board_layout.position_of(index)
+
+        numerators = {}
+        denominators = {}
+        for j in range(num_ranks):
+            (code, numerator, denominator) = _RANK.unpack_from(data, offset)
+            offset += _RANK.size
+            numerators[RANKS[code]] = numerator
+            denominators[RANKS[code]] = denominator
+
+        if num_ranks == 1 and numerator == denominator:
+            # Share the dictionaries of pieces of known rank
+            pieces.append(Piece(position, owner, RANKS[code]))
+        else:
+            pieces.append(Piece(position, owner, numerators, denominators))
+
+    board = Board(pieces)
+    if has_beliefs:
+        counts = tuple(array('d', data[offset:offset + _ROW_BYTES]))
+        offset += _ROW_BYTES
+        rows = {}
+        while offset < len(data):
+            (index,) = _INDEX.unpack_from(data, offset)
+            offset += _INDEX.size
+            rows[board_layout.position_of(index)] = tuple(
+                array('d', data[offset:offset + _ROW_BYTES]))
+            offset += _ROW_BYTES
+        board.beliefs = BeliefMatrix(rows, counts)
+    return board
+
+
+def encode_moves(moves):
+    """
+    list(Move) -> bytes
+
+    Returns the encoding of the given moves.
+
+    """
+    return bytes(board_layout.index_of(position)
+                 for move in moves for position in move)
+
+
+def decode_moves(data):
+    """
+    bytes -> list(Move)
+
+    Returns the moves with the given encoding.
+
+    """
+    return [(board_layout.position_of(data[i]),
+             board_layout.position_of(data[i + 1]))
+            for i in range(0, len(data), 2)]
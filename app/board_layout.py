@@ -13,6 +13,8 @@ _board_graph = {}
 _BOARD_FILE = "app/board_graph"
 STATION, CAMP, HEADQUARTERS = range(0, 3)
 TYPE_MAP = {"S": STATION, "C": CAMP, "H": HEADQUARTERS, "R": STATION}
+NUM_SPACES = _WIDTH * _HEIGHT
+_POSITIONS = [Position(i // _HEIGHT, i % _HEIGHT) for i in range(NUM_SPACES)]
 
 
 class Space:
@@ -75,6 +77,16 @@ def is_headquarters(p):
     return _board_graph[p].space_type == HEADQUARTERS
 
 
+def is_railroad(p):
+    """
+    Position -> bool
+
+    Checks if the given position is on a railroad
+
+    """
+    return _board_graph[p].on_railroad
+
+
 def iterate_adjacent(position):
     """
     Position -> iter(Position)
@@ -85,6 +97,27 @@ def iterate_adjacent(position):
     return iter(_board_graph[position])
 
 
+def index_of(position):
+    """
+    Position -> int
+
+    Returns the index (0 - 59) of the given position, for use with
+    fixed size arrays holding one entry per space.
+
+    """
+    return position[0] * _HEIGHT + position[1]
+
+
+def position_of(index):
+    """
+    int -> Position
+
+    Returns the position with the given index (the inverse of index_of).
+
+    """
+    return _POSITIONS[index]
+
+
 def generate_board():
     """
     ->
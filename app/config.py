@@ -1,4 +1,7 @@
 from optparse import OptionParser
+import app.numeric as numeric
+import app.search as search
+import app.transposition as transposition
 import sys
 import re
 
@@ -16,12 +19,71 @@ parser.add_option("-t",
                   dest="time",
                   help="specify the time per move")
 
+parser.add_option("-n",
+                  "--numeric",
+                  dest="numeric",
+                  default=numeric.FLOAT,
+                  help="specify how probabilities are computed "
+                       "(float or exact)")
+
+parser.add_option("-m",
+                  "--hash",
+                  dest="hash",
+                  type="float",
+                  default=transposition.DEFAULT_SIZE_MB,
+                  help="specify the transposition table size in megabytes "
+                       "(0 for none)")
+
+parser.add_option("-e",
+                  "--engine",
+                  dest="engine",
+                  default=search.EXPECTIMAX,
+                  help="specify how moves are picked "
+                       "(greedy, expectimax or mcts)")
+
+parser.add_option("-w",
+                  "--workers",
+                  dest="workers",
+                  type="int",
+                  default=1,
+                  help="specify the number of processes used to search "
+                       "(1 searches in the main process)")
+
+parser.add_option("-p",
+                  "--ponder",
+                  dest="ponder",
+                  action="store_true",
+                  default=False,
+                  help="search the opponent's likely replies while "
+                       "waiting for its move (needs --workers 1)")
+
+parser.add_option("-s",
+                  "--tables",
+                  dest="tables",
+                  default=None,
+                  help="load the piece-square tables from the given file "
+                       "instead of generating them")
+
+parser.add_option("-r",
+                  "--record",
+                  dest="record",
+                  default=None,
+                  help="append a transcript of the game to the given file "
+                       "(see app.transcript)")
+
 
 class Config:
     """
     Instance variables:
     float time
     int player
+    str numeric
+    float hash
+    str engine
+    int workers
+    bool ponder
+    str | None tables
+    str | None record
 
     """
     def __init__(self):
@@ -35,7 +97,12 @@ class Config:
 
         match = re.search(TIME_REGEX, options.time or "")
 
-        if (options.turn != "1" and options.turn != "2") or (not match):
+        if ((options.turn != "1" and options.turn != "2") or (not match) or
+                options.numeric not in numeric.BACKENDS or
+                options.hash < 0 or
+                options.engine not in search.ENGINES or
+                options.workers < 1 or
+                (options.ponder and options.workers > 1)):
             sys.stderr.write(parser.format_help())
             quit(1)
 
@@ -45,6 +112,13 @@ class Config:
             self.time = int(1000 * float(match.group(1)))
 
         self.turn = int(options.turn)
+        self.numeric = options.numeric
+        self.hash = options.hash
+        self.engine = options.engine
+        self.workers = options.workers
+        self.ponder = options.ponder
+        self.tables = options.tables
+        self.record = options.record
 
     def get_turn(self):
         """
@@ -55,6 +129,71 @@ class Config:
         """
         return self.turn
 
+    def get_numeric(self):
+        """
+        -> str
+
+        Get the numeric backend used for probabilities (see app.numeric)
+
+        """
+        return self.numeric
+
+    def get_hash(self):
+        """
+        -> float
+
+        Get the transposition table size in megabytes
+
+        """
+        return self.hash
+
+    def get_engine(self):
+        """
+        -> str
+
+        Get the name of the engine used to pick moves (see app.search)
+
+        """
+        return self.engine
+
+    def get_workers(self):
+        """
+        -> int
+
+        Get the number of processes used to search
+
+        """
+        return self.workers
+
+    def get_ponder(self):
+        """
+        -> bool
+
+        Get whether to search while waiting for the opponent's move
+
+        """
+        return self.ponder
+
+    def get_tables(self):
+        """
+        -> (str | None)
+
+        Get the file the piece-square tables are loaded from, if any
+        (see app.piece_square)
+
+        """
+        return self.tables
+
+    def get_record(self):
+        """
+        -> (str | None)
+
+        Get the file a transcript of the game is appended to, if any
+        (see app.transcript)
+
+        """
+        return self.record
+
     def get_time(self):
         """
         -> int
@@ -1,4 +1,6 @@
 import logging
+import app.numeric as numeric
+from app.piece import Owner
 
 DEBUGGING = False
 
@@ -10,13 +12,25 @@ def assert_all_probabilities_sum_to_one(board):
     Asserts that assert_piece_probabilities_sum_to_one holds
     for all pieces on the given board.
 
+    The expected rank counts tallied by the board (see Board) add up
+    to the number of pieces of each owner when every piece's
+    probabilities do, so the pieces are only walked to find the
+    culprit when they do not. A wrong probability sum is missed only
+    if it is cancelled out exactly by another.
+
     """
 
     if not DEBUGGING:
         return
 
-    for piece in board.pieces_list:
-        assert_piece_probabilities_sum_to_one(piece)
+    for owner in (Owner.PLAYER, Owner.OPPONENT):
+        num_pieces = bin(board.occupancy[owner]).count("1")
+        if not numeric.is_equal(sum(board.rank_counts[owner]), num_pieces):
+            for piece in board.iterate_pieces(owner):
+                assert_piece_probabilities_sum_to_one(piece)
+            log = logging.getLogger("probability")
+            log.error("Rank counts of owner %d are out of date" % owner)
+            assert(False)
 
 
 def assert_piece_probabilities_sum_to_one(piece):
@@ -32,7 +46,7 @@ def assert_piece_probabilities_sum_to_one(piece):
         return
 
     prob_sum = sum(piece.probability(rank) for rank in piece.ranks())
-    if not prob_sum == 1:
+    if not numeric.is_equal(prob_sum, 1):
         log = logging.getLogger("probability")
         log.error("Probability sum for %s is %s" % (str(piece), str(prob_sum)))
         assert(False)
@@ -1,3 +1,4 @@
+import asyncio
 import sys
 import logging
 import app.message as message
@@ -28,3 +29,123 @@ def receive():
     log.debug("received: " + packet)
     msg = message.deserialize(packet)
     return msg
+
+
+class RefereeStream:
+    """
+    Instance variables:
+    file                         input
+    file                         output
+    asyncio.StreamReader | None  reader
+    asyncio.StreamWriter | None  writer
+    asyncio.Transport | None     read_transport
+
+    Reads messages from the referee and writes ours without blocking
+    the event loop, for use by an asyncio driver. input and output are
+    stdin and stdout unless given otherwise.
+
+    When they are pipes, as when run by the referee, lines are read as
+    they arrive through reader and messages are written through writer,
+    whose buffer is flushed before send returns. Other files (such as
+    a regular file redirected to stdin) cannot be used through
+    asyncio, and are read or written in an executor thread instead,
+    leaving reader or writer None.
+
+    """
+
+    def __init__(self, input=None, output=None):
+        """
+        file file -> RefereeStream
+
+        Constructs a stream reading input and writing output. open
+        must be awaited before the stream is used.
+
+        """
+        self.input = input or sys.stdin
+        self.output = output or sys.stdout
+        self.reader = None
+        self.writer = None
+        self.read_transport = None
+
+    async def open(self):
+        """
+        ->
+
+        Connects the stream to the running event loop.
+
+        """
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        try:
+            (self.read_transport, protocol) = await loop.connect_read_pipe(
+                lambda: asyncio.StreamReaderProtocol(reader), self.input)
+            self.reader = reader
+        except (ValueError, OSError):
+            log.debug("input is not a pipe, reading in a thread")
+
+        try:
+            (transport, protocol) = await loop.connect_write_pipe(
+                asyncio.streams.FlowControlMixin, self.output)
+        except (ValueError, OSError):
+            log.debug("output is not a pipe, writing in a thread")
+            return
+
+        # Make drain wait until everything has been written
+        transport.set_write_buffer_limits(0)
+        self.writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+
+    async def receive(self):
+        """
+        -> Message
+
+        Waits for the next line from the referee and deserializes it.
+        An EmptyMessage is returned once the input has been closed.
+
+        """
+        if self.reader is not None:
+            packet = (await self.reader.readline()).decode()
+        else:
+            packet = await asyncio.get_running_loop().run_in_executor(
+                None, self.input.readline)
+        log.debug("received: " + packet)
+        return message.deserialize(packet)
+
+    async def send(self, msg):
+        """
+        Message ->
+
+        Serializes the message, writes it and waits until it has been
+        flushed.
+
+        """
+        serial = msg.serialize()
+        if self.writer is not None:
+            self.writer.write(serial.encode())
+            await self.writer.drain()
+        else:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._write, serial)
+        log.debug("sent: " + serial)
+
+    def close(self):
+        """
+        ->
+
+        Disconnects the stream from the event loop, closing input and
+        output if they are pipes.
+
+        """
+        if self.read_transport is not None:
+            self.read_transport.close()
+        if self.writer is not None:
+            self.writer.close()
+
+    def _write(self, serial):
+        """
+        str ->
+
+        Writes serial to output and flushes it, blocking until done.
+
+        """
+        self.output.write(serial)
+        self.output.flush()
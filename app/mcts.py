@@ -0,0 +1,333 @@
+import math
+import random
+import time
+import app.strategy as strategy
+from app.piece import Piece, Owner
+from app.rank import Rank, RANKS
+from app.search_board import SearchBoard
+
+"""
+Information set Monte Carlo tree search.
+
+The opponent's ranks are hidden, so rather than searching one game
+tree, every iteration samples a determinization: a consistent rank
+for every opponent piece, drawn by Board.sample_ranks. The iteration
+then descends a single tree shared by all determinizations, playing
+only the moves that are legal in its own determinization, and
+finishes with a short playout.
+
+A Move is a tuple of positions (position_from, position_to).
+"""
+
+# Exploration constant for the UCB1 formula used to select moves
+EXPLORATION = 0.7
+
+# Plies played at random after leaving the tree
+PLAYOUT_DEPTH = 20
+
+# Probability that a playout takes a capture that wins, when it has one
+CAPTURE_PROBABILITY = 0.8
+
+# Difference in strategy.evaluate that turns a playout result from
+# 0.5 into about 0.73
+EVALUATION_SCALE = 10
+
+# Number of iterations between checks of the deadline
+ITERATIONS_PER_TIME_CHECK = 4
+
+# Number of trees kept for reuse by later searches of the same board
+TREES_KEPT = 8
+
+_FLAG = Rank('F')
+
+
+class _Node:
+    """
+    Instance variables:
+    Owner                 owner
+    dict(Move, _Node)     children
+    int                   visits
+    int                   availability
+    float                 total
+
+    A node of the search tree. owner is the player to move from this
+    node. total is the sum of the results (1 for a player win and 0
+    for a loss) of the visits through this node, and availability
+    counts the visits to its parent in which its move was legal.
+
+    """
+    __slots__ = ('owner', 'children', 'visits', 'availability', 'total')
+
+    def __init__(self, owner):
+        """
+        Owner -> _Node
+
+        Constructs an unvisited node with owner to move.
+
+        """
+        self.owner = owner
+        self.children = {}
+        self.visits = 0
+        self.availability = 1
+        self.total = 0.0
+
+    def ucb(self, mover):
+        """
+        Owner -> float
+
+        Returns the UCB1 score of reaching this node by a move made
+        by mover.
+
+        """
+        mean = self.total / self.visits
+        if mover == Owner.OPPONENT:
+            mean = 1 - mean
+        return mean + EXPLORATION * math.sqrt(
+            math.log(self.availability) / self.visits)
+
+
+def determinize(board, positions, assignment):
+    """
+    Board tuple(Position) Assignment -> SearchBoard
+
+    Returns a SearchBoard where every opponent piece has the rank
+    given for its position by an assignment from Board.sample_ranks.
+
+    """
+    determinized = SearchBoard(board)
+    for (position, code) in zip(positions, assignment):
+        determinized._remove_from_index(determinized.piece_at(position))
+        determinized._add_to_index(
+            Piece(position, Owner.OPPONENT, RANKS[code]))
+    return determinized
+
+
+def attack_outcome(board, src, dest):
+    """
+    SearchBoard Position Position -> str
+
+    Returns the outcome ("move", "win", "tie" or "loss") of moving the
+    piece at src to dest on a board where every rank is known.
+
+    """
+    defender = board.piece_at(dest)
+    if defender is None:
+        return "move"
+    attacker = board.piece_at(src)
+    return attacker.known_rank().attack_outcome(defender.known_rank())
+
+
+def _play(board, move):
+    """
+    SearchBoard Move -> bool
+
+    Makes the given move on a board where every rank is known and
+    returns True if it captured a flag.
+
+    """
+    (src, dest) = move
+    outcome = attack_outcome(board, src, dest)
+    captured_flag = (outcome != "move" and outcome != "loss" and
+                     board.piece_at(dest).known_rank() == _FLAG)
+    board.make_move(src, dest, outcome)
+    return captured_flag
+
+
+class ISMCTSEngine:
+    """
+    Instance variables:
+    Move | None        best_move
+    float              best_value
+    int                depth
+    int                iterations
+    random.Random      generator
+    _Node | None       root
+    dict(int, _Node)   trees
+
+    Picks moves with single observer information set Monte Carlo tree
+    search. Each iteration samples a determinization of the opponent's
+    ranks, selects moves with UCB1 among those legal in it, adds one
+    node to the tree and plays out PLAYOUT_DEPTH plies with a light
+    policy that usually takes winning captures. The result of a
+    playout is 1 or 0 if a flag was captured, and otherwise squashes
+    the change in strategy.evaluate into the range 0 - 1.
+
+    The best move is the root move visited most often; best_value is
+    its mean result and depth the deepest node in the tree, whose root
+    is kept until the next search. best_move always holds a legal move
+    (or None if the player has no moves), so the search can be stopped
+    at any time.
+
+    trees holds the roots of the last TREES_KEPT searches by the
+    Zobrist key of the board searched, so that searching the same
+    board again (for instance after pondering it, see app.ponder)
+    continues from the existing tree.
+
+    """
+
+    def __init__(self, seed=None):
+        """
+        int | None -> ISMCTSEngine
+
+        Constructs an engine whose random choices are seeded with seed.
+
+        """
+        self.generator = random.Random(seed)
+        self.best_move = None
+        self.best_value = 0.0
+        self.depth = 0
+        self.iterations = 0
+        self.root = None
+        self.trees = {}
+
+    def predicted_reply(self, board):
+        """
+        Board -> (Move | None)
+
+        Returns the opponent's most visited reply to the best move of
+        the last search, or None if there is none. board is the board
+        after that move.
+
+        """
+        if self.root is None or self.best_move not in self.root.children:
+            return None
+        replies = self.root.children[self.best_move].children
+        if not replies:
+            return None
+        return max(replies.items(), key=lambda item: item[1].visits)[0]
+
+    def search(self, board, deadline, token=None):
+        """
+        Board float (CancellationToken | None) -> (Move | None)
+
+        Runs iterations on the given board until time.monotonic()
+        reaches deadline or token is cancelled, and returns the most
+        visited root move. The tree of an earlier search of the same
+        board is reused.
+
+        """
+        moves = list(board.iterate_all_moves(Owner.PLAYER))
+        self.best_move = moves[0] if moves else None
+        self.best_value = 0.0
+        self.depth = 0
+        self.iterations = 0
+        key = board.zobrist_key
+        root = self.trees.pop(key, None) or _Node(Owner.PLAYER)
+        self.trees[key] = self.root = root
+        while len(self.trees) > TREES_KEPT:
+            del self.trees[next(iter(self.trees))]
+        if len(moves) < 2:
+            return self.best_move
+
+        baseline = strategy.evaluate(board)
+        if root.children:
+            self._publish(root)
+
+        while not (token is not None and token.is_cancelled()) and (
+                self.iterations % ITERATIONS_PER_TIME_CHECK != 0 or
+                time.monotonic() < deadline):
+            self._iterate(board, root, baseline)
+            self.iterations += 1
+            self._publish(root)
+
+        return self.best_move
+
+    def _publish(self, root):
+        """
+        _Node ->
+
+        Makes the most visited child of root the best move.
+
+        """
+        (self.best_move, child) = max(root.children.items(),
+                                      key=lambda item: item[1].visits)
+        self.best_value = child.total / child.visits
+
+    def root_statistics(self):
+        """
+        -> dict(Move, (int, float))
+
+        Returns the number of visits and the total result of each
+        root move tried in the last search.
+
+        """
+        if self.root is None:
+            return {}
+        return {move: (child.visits, child.total)
+                for (move, child) in self.root.children.items()}
+
+    def _iterate(self, board, root, baseline):
+        """
+        Board _Node float ->
+
+        Runs one iteration from root on a new determinization of board.
+
+        """
+        (positions, assignment) = board.sample_ranks(self.generator)
+        determinized = determinize(board, positions, assignment)
+        path = [root]
+        node = root
+        result = None
+
+        # Select moves down the tree, adding the first unvisited one
+        while result is None:
+            moves = list(determinized.iterate_all_moves(node.owner))
+            if not moves:
+                result = 0.0 if node.owner == Owner.PLAYER else 1.0
+                break
+
+            untried = [m for m in moves if m not in node.children]
+            for move in moves:
+                if move in node.children:
+                    node.children[move].availability += 1
+
+            if untried:
+                move = self.generator.choice(untried)
+                child = _Node(1 - node.owner)
+                node.children[move] = child
+            else:
+                move = max(moves,
+                           key=lambda m: node.children[m].ucb(node.owner))
+                child = node.children[move]
+
+            if _play(determinized, move):
+                result = 1.0 if node.owner == Owner.PLAYER else 0.0
+            path.append(child)
+            node = child
+            if child.visits == 0:
+                break
+
+        self.depth = max(self.depth, len(path) - 1)
+        if result is None:
+            result = self._playout(determinized, node.owner, baseline)
+
+        for node in path:
+            node.visits += 1
+            node.total += result
+
+    def _playout(self, board, owner, baseline):
+        """
+        SearchBoard Owner float -> float
+
+        Plays random moves on the given board, starting with owner,
+        and returns the result from the player's point of view.
+
+        """
+        for ply in range(PLAYOUT_DEPTH):
+            moves = list(board.iterate_all_moves(owner))
+            if not moves:
+                return 0.0 if owner == Owner.PLAYER else 1.0
+
+            wins = [m for m in moves
+                    if attack_outcome(board, m[0], m[1]) == "win"]
+            if wins and self.generator.random() < CAPTURE_PROBABILITY:
+                move = self.generator.choice(wins)
+            else:
+                move = self.generator.choice(moves)
+
+            if _play(board, move):
+                return 1.0 if owner == Owner.PLAYER else 0.0
+            owner = 1 - owner
+
+        change = strategy.evaluate(board) - baseline
+        return 1 / (1 + math.exp(-change / EVALUATION_SCALE))
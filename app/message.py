@@ -35,6 +35,24 @@ RE_MAP = {
     WINNING_RE: (lambda match: WinningMessage(match.group(1)))
     }
 
+"""
+Each kind of ref->player message ends in a different word, so the last
+word of a message picks the only regex in RE_MAP that can match it.
+_LAST_WORD_RE maps those last words to their regexes; any other last
+word can only end a flag message. _COMPILED_RE_MAP holds the compiled
+regexes and thunks of RE_MAP.
+"""
+_LAST_WORD_RE = {"Setup": INVALID_SETUP_RE,
+                 "movable": INVALID_MOVE_RE,
+                 "Piece": INVALID_MOVE_RE,
+                 "Invalid": INVALID_MOVE_RE,
+                 "move": RCV_MOVE_RE,
+                 "win": RCV_MOVE_RE,
+                 "loss": RCV_MOVE_RE,
+                 "tie": RCV_MOVE_RE,
+                 "Victory": WINNING_RE}
+_COMPILED_RE_MAP = {rx: (re.compile(rx), RE_MAP[rx]) for rx in RE_MAP}
+
 
 def pos_to_tuple(pos):
     """
@@ -55,7 +73,9 @@ def deserialize(packet):
     str -> Message
 
     Finds a matching of the given message to a regex in RE_MAP and
-    returns the corresponding instance of a subclass of Message.
+    returns the corresponding instance of a subclass of Message. Only
+    the regex picked by the message's last word is tried, already
+    compiled.
 
     Raises a BadMessageException if the given message does not match
     any regexes in RE_MAP.
@@ -65,16 +85,32 @@ def deserialize(packet):
 
     """
     p = packet.strip()
-    for rx in RE_MAP:
-        match = re.search(rx, p)
-        if match:
-            return RE_MAP[rx](match)
     if len(p) == 0:
         return EmptyMessage()
 
+    (rx, thunk) = _COMPILED_RE_MAP[
+        _LAST_WORD_RE.get(p.rpartition(" ")[2], FLAG_RE)]
+    match = rx.search(p)
+    if match:
+        return thunk(match)
+
     raise BadMessageException("Invalid Message from the Ref: %s" % (packet))
 
 
+def deserialize_many(packets):
+    """
+    iter(str) -> list(Message)
+
+    Deserializes each of the given messages, such as the lines of a
+    transcript, in order.
+
+    Raises a BadMessageException if any of the given messages does not
+    match any regexes in RE_MAP.
+
+    """
+    return [deserialize(packet) for packet in packets]
+
+
 class BadMessageException(Exception):
     """
     Instance variables:
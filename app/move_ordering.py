@@ -0,0 +1,124 @@
+import app.bitboard as bitboard
+import app.board_layout as board_layout
+from app.rank import expected_outcome
+
+"""
+A Move is a tuple of positions (position_from, position_to).
+"""
+
+# Number of killer moves remembered for each depth
+KILLERS_PER_DEPTH = 2
+
+# Ordering scores. Captures are ordered by how likely they are to
+# succeed, ahead of killer moves unless they are likely to fail.
+CAPTURE_SCORE = 2000000
+CAPTURE_WIN_SCORE = 1000000
+KILLER_SCORES = [1500000, 1400000]
+FLAG_APPROACH_SCORE = 100000
+
+
+def _approach_mask(headquarters_row):
+    """
+    int -> Bitboard
+
+    Returns the bitboard of the headquarters in the given row and
+    the spaces adjacent to them.
+
+    """
+    mask = 0
+    for position in bitboard.iterate_positions(bitboard.HEADQUARTERS_MASK):
+        if position[1] == headquarters_row:
+            mask |= bitboard.bit(position)
+            mask |= bitboard.ADJACENT_MASKS[board_layout.index_of(position)]
+    return mask
+
+
+# Spaces where a piece threatens the enemy flag, indexed by Owner
+FLAG_APPROACH_MASKS = [_approach_mask(11), _approach_mask(0)]
+
+
+class MoveOrderer:
+    """
+    Instance variables:
+    dict(int, list(Move))  killers
+    dict(Move, int)        history
+
+    Orders moves so that a search tries the most promising ones first:
+    likely captures, killer moves (moves that recently caused a cutoff
+    at the same depth), moves towards the enemy flag, and finally moves
+    that have caused cutoffs before according to the history table.
+
+    Killers and history are kept across the iterations of an iterative
+    deepening search and cleared with new_turn.
+
+    """
+
+    def __init__(self):
+        """
+        -> MoveOrderer
+
+        Constructs a MoveOrderer with no killers or history.
+
+        """
+        self.new_turn()
+
+    def new_turn(self):
+        """
+        ->
+
+        Forgets all killer moves and history.
+
+        """
+        self.killers = {}
+        self.history = {}
+
+    def score(self, board, move, depth, owner):
+        """
+        Board Move int Owner -> Number
+
+        Returns how promising the given move is for owner; higher
+        scores are searched first.
+
+        """
+        (src, dest) = move
+        killers = self.killers.get(depth, [])
+
+        if board.piece_at(dest) is not None:
+            (p_win, p_tie, p_loss) = expected_outcome(
+                board.rank_distribution(src), board.rank_distribution(dest))
+            return CAPTURE_SCORE + CAPTURE_WIN_SCORE * (p_win - p_loss)
+        elif move in killers:
+            return KILLER_SCORES[killers.index(move)]
+
+        score = self.history.get(move, 0)
+        if FLAG_APPROACH_MASKS[owner] & bitboard.bit(dest):
+            score += FLAG_APPROACH_SCORE
+        return score
+
+    def order(self, board, moves, depth, owner):
+        """
+        Board iter(Move) int Owner -> list(Move)
+
+        Returns the given moves for owner, most promising first.
+
+        """
+        return sorted(moves, reverse=True,
+                      key=lambda m: self.score(board, m, depth, owner))
+
+    def record_cutoff(self, board, move, depth):
+        """
+        Board Move int ->
+
+        Records that the given move caused a cutoff when searched
+        depth plies deep.
+
+        """
+        if board.piece_at(move[1]) is not None:
+            # Captures are already ordered first
+            return
+
+        killers = self.killers.setdefault(depth, [])
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[KILLERS_PER_DEPTH:]
+        self.history[move] = self.history.get(move, 0) + depth * depth
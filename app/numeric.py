@@ -0,0 +1,65 @@
+from fractions import Fraction
+
+"""
+Selects the kind of number used for piece probabilities.
+
+The "exact" backend uses Fractions, which keeps probabilities exact
+for tests and app/debug.py assertions. The "float" backend uses plain
+floats, which are much faster and are meant for actual play.
+"""
+
+EXACT = "exact"
+FLOAT = "float"
+BACKENDS = [EXACT, FLOAT]
+
+# Largest difference allowed between floats that should be equal
+FLOAT_TOLERANCE = 1e-9
+
+_backend = EXACT
+
+
+def set_backend(name):
+    """
+    str ->
+
+    Selects the numeric backend, one of BACKENDS.
+
+    """
+    global _backend
+    assert(name in BACKENDS)
+    _backend = name
+
+
+def get_backend():
+    """
+    -> str
+
+    Returns the name of the current numeric backend.
+
+    """
+    return _backend
+
+
+def ratio(numerator, denominator):
+    """
+    Number Number -> Number
+
+    Returns numerator / denominator using the current backend.
+
+    """
+    if _backend == FLOAT:
+        return numerator / denominator
+    return Fraction(numerator, denominator)
+
+
+def is_equal(a, b):
+    """
+    Number Number -> bool
+
+    Checks if the two numbers are equal, allowing for rounding
+    error when using the float backend.
+
+    """
+    if _backend == FLOAT:
+        return abs(a - b) <= FLOAT_TOLERANCE
+    return a == b
@@ -0,0 +1,229 @@
+import concurrent.futures
+import logging
+import time
+import app.board_codec as board_codec
+import app.numeric as numeric
+import app.piece_square as piece_square
+import app.search as search
+import app.transposition as transposition
+from app.piece import Owner
+
+"""
+Root-parallel search over a pool of worker processes.
+
+Each worker process holds its own engine, created once when the pool
+starts, so that its transposition table and other state last for the
+whole game. For every move, the root moves are dealt out between the
+workers (or, for the MCTS engine, every worker grows its own tree from
+different determinizations) and the results are merged before the
+deadline. Boards and moves are sent to the workers in the compact form
+of app.board_codec.
+"""
+
+log = logging.getLogger("parallel")
+
+# Time left at the end of a worker's search for sending its results
+# back to the main process, in seconds
+RESULT_MARGIN = 0.05
+
+# Longest time between checks of the cancellation token while waiting
+# for the workers, in seconds
+WAIT_STEP = 0.01
+
+# The engine of this worker process and its name, set by _start_worker
+_engine = None
+_engine_name = None
+
+
+def _start_worker(engine_name, table_mb, backend, tables):
+    """
+    str Number str Tables ->
+
+    Sets up a worker process with a new engine of the given kind,
+    using the given numeric backend and piece-square tables.
+
+    """
+    global _engine
+    global _engine_name
+    numeric.set_backend(backend)
+    piece_square.use(tables)
+    _engine = search.new_engine(engine_name, table_mb=table_mb)
+    _engine_name = engine_name
+
+
+def _ready():
+    """
+    -> bool
+
+    Does nothing; submitted once per worker to start the workers.
+
+    """
+    return True
+
+
+def _search(encoded_board, encoded_moves, deadline):
+    """
+    bytes bytes float -> (list((int, Number, Move)) |
+                          dict(Move, (int, float)))
+
+    Searches the encoded board with this worker's engine until the
+    deadline. Returns the statistics of each root move for the MCTS
+    engine, and otherwise the (depth, value, move) found by each
+    completed iteration over the encoded root moves.
+
+    """
+    board = board_codec.decode(encoded_board)
+    if _engine_name == search.MCTS:
+        _engine.search(board, deadline)
+        return _engine.root_statistics()
+
+    moves = board_codec.decode_moves(encoded_moves)
+    _engine.search(board, deadline, moves=moves)
+    if _engine_name == search.GREEDY:
+        return [(1, _engine.best_value, _engine.best_move)]
+    return _engine.completed
+
+
+class ParallelEngine:
+    """
+    Instance variables:
+    str                                     engine_name
+    int                                     workers
+    concurrent.futures.ProcessPoolExecutor  pool
+    Move | None                             best_move
+    Number                                  best_value
+    int                                     depth
+
+    Picks moves by searching in workers worker processes, each with an
+    engine of the kind named engine_name (see search.ENGINES).
+
+    For the greedy and expectimax engines the root moves are split
+    between the workers. Their results are compared at the deepest
+    depth every worker completed, since values found at different
+    depths are not comparable. Workers have no cancellation token, so
+    every worker completes at least its first iteration (see
+    search.ExpectimaxEngine) and no root move is left out. For the
+    MCTS engine the root statistics of all the workers' trees are added
+    up and the most visited move is picked.
+
+    best_move holds a legal move as soon as search starts (or None if
+    the player has no moves), and is replaced by the merged result.
+
+    """
+
+    def __init__(self, engine_name, workers,
+                 table_mb=transposition.DEFAULT_SIZE_MB):
+        """
+        str int Number -> ParallelEngine
+
+        Starts workers worker processes, each with an engine of the
+        kind named engine_name, using the current numeric backend and
+        piece-square tables.
+
+        """
+        self.engine_name = engine_name
+        self.workers = workers
+        self.best_move = None
+        self.best_value = 0
+        self.depth = 0
+        self.pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, initializer=_start_worker,
+            initargs=(engine_name, table_mb, numeric.get_backend(),
+                      piece_square.TABLES))
+
+        # Start every worker now rather than during the first move
+        concurrent.futures.wait(
+            [self.pool.submit(_ready) for i in range(workers)])
+
+    def shutdown(self):
+        """
+        ->
+
+        Stops the worker processes.
+
+        """
+        self.pool.shutdown(cancel_futures=True)
+
+    def search(self, board, deadline, token=None):
+        """
+        Board float (CancellationToken | None) -> (Move | None)
+
+        Searches the given board in the worker processes until
+        time.monotonic() reaches deadline and returns the best move.
+        If token is cancelled, the results the workers have returned
+        so far are used; the others keep searching until the deadline.
+
+        """
+        moves = list(board.iterate_all_moves(Owner.PLAYER))
+        self.best_move = moves[0] if moves else None
+        self.best_value = 0
+        self.depth = 0
+        if len(moves) < 2:
+            return self.best_move
+
+        encoded_board = board_codec.encode(board)
+        worker_deadline = deadline - RESULT_MARGIN
+        if self.engine_name == search.MCTS:
+            futures = [self.pool.submit(_search, encoded_board, b"",
+                                        worker_deadline)
+                       for i in range(self.workers)]
+        else:
+            chunks = min(self.workers, len(moves))
+            futures = [self.pool.submit(
+                _search, encoded_board,
+                board_codec.encode_moves(moves[i::chunks]), worker_deadline)
+                for i in range(chunks)]
+
+        not_done = futures
+        while not_done and not (token is not None and token.is_cancelled()):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            (done, not_done) = concurrent.futures.wait(
+                futures, timeout=min(remaining, WAIT_STEP))
+        done = [f for f in futures if f.done()]
+        if not_done:
+            log.debug("%d of %d workers missed the deadline" %
+                      (len(not_done), len(futures)))
+        results = [f.result() for f in done if f.exception() is None]
+
+        if self.engine_name == search.MCTS:
+            self._merge_statistics(results)
+        else:
+            self._merge_iterations(results)
+        return self.best_move
+
+    def _merge_iterations(self, results):
+        """
+        list(list((int, Number, Move))) ->
+
+        Picks the best move from the iterations completed by each worker.
+
+        """
+        results = [r for r in results if r]
+        if not results:
+            return
+
+        depth = min(r[-1][0] for r in results)
+        best = max((entry for r in results for entry in r
+                    if entry[0] == depth), key=lambda entry: entry[1])
+        (self.depth, self.best_value, self.best_move) = best
+
+    def _merge_statistics(self, results):
+        """
+        list(dict(Move, (int, float))) ->
+
+        Picks the most visited move over all of the workers' trees.
+
+        """
+        statistics = {}
+        for r in results:
+            for (move, (visits, total)) in r.items():
+                (v, t) = statistics.get(move, (0, 0.0))
+                statistics[move] = (v + visits, t + total)
+        if not statistics:
+            return
+
+        (move, (visits, total)) = max(statistics.items(),
+                                      key=lambda item: item[1][0])
+        (self.best_move, self.best_value) = (move, total / visits)
@@ -1,6 +1,6 @@
 import app.board_layout as board_layout
-from app.rank import Rank
-from fractions import Fraction
+import app.numeric as numeric
+from app.rank import Rank, RANKS, WORTHS, expected_outcome
 
 SOLDIER_RANKS = {Rank(str(r)) for r in range(1, 10)}
 ALL_RANKS = SOLDIER_RANKS.union({Rank('F'), Rank('L'), Rank('B')})
@@ -16,18 +16,32 @@ class Owner:
     OPPONENT = 1
 
 
+_FLAG = Rank('F')
+_LANDMINE = Rank('L')
+_BOMB = Rank('B')
+
+# Probability dictionaries for pieces whose rank is certain, shared by
+# all such pieces since the numerator and denominator are both 1
+_CERTAIN = {rank: {rank: 1} for rank in ALL_RANKS}
+
+
 class Piece:
     """
     Instance variables:
     Position                    position
     Owner                       owner
-    dict(Rank, Fraction)  numerators
-    dict(Rank, Fraction)  denominators
+    dict(Rank, Number)    prob_numerators
+    dict(Rank, Number)    prob_denominators
 
     The numerators and denominators dictionaries map a rank
     to a probability (numerators[rank]/denominators[rank]).
+    They are never modified once a Piece is constructed, so pieces
+    may share them, and the normalized distribution computed from them
+    can be cached (see distribution).
 
     """
+    __slots__ = ('position', 'owner', 'prob_numerators', 'prob_denominators',
+                 '_distribution', '_backend', '_tally')
 
     def __init__(self, position, owner,
                  rank_or_prob_numerators, prob_denominators={}):
@@ -45,6 +59,10 @@ class Piece:
         owner and set of all possible ranks.
 
         """
+        self._distribution = None
+        self._backend = None
+        self._tally = None
+
         # Number tuple (row, column)
         self.position = position
         # Owner object
@@ -54,8 +72,8 @@ class Piece:
         # dictionary, convert it into a dictionary where the
         # probability of this piece having that rank is 1.0
         if isinstance(rank_or_prob_numerators, Rank):
-            self.prob_numerators = {rank_or_prob_numerators: 1}
-            self.prob_denominators = {rank_or_prob_numerators: 1}
+            self.prob_numerators = _CERTAIN[rank_or_prob_numerators]
+            self.prob_denominators = _CERTAIN[rank_or_prob_numerators]
         else:
             self.prob_numerators = rank_or_prob_numerators
             self.prob_denominators = prob_denominators
@@ -65,10 +83,33 @@ class Piece:
         Position -> Piece
 
         Returns a hard copy of this instance with a changed position.
+        Moving does not change the rank probabilities, so the copy
+        keeps this piece's cached distribution.
+
+        """
+        moved = Piece(new_posn, self.owner,
+                      self.prob_numerators, self.prob_denominators)
+        moved._distribution = self._distribution
+        moved._backend = self._backend
+        moved._tally = self._tally
+        return moved
+
+    def with_distribution(self, distribution):
+        """
+        tuple(Number) -> Piece
+
+        Returns a copy of this instance whose rank distribution is the
+        given one rather than the one computed from its numerators and
+        denominators, such as a row of a balanced BeliefMatrix. The
+        distribution is kept for as long as the numeric backend does
+        not change.
 
         """
-        return Piece(new_posn, self.owner,
-                     self.prob_numerators, self.prob_denominators)
+        piece = Piece(self.position, self.owner,
+                      self.prob_numerators, self.prob_denominators)
+        piece._distribution = tuple(distribution)
+        piece._backend = numeric.get_backend()
+        return piece
 
     def is_stationary(self):
         """
@@ -79,7 +120,7 @@ class Piece:
 
         """
         return (board_layout.is_headquarters(self.position) or
-                self.probability(Rank('L')) + self.probability(Rank('F')) == 1)
+                self.tally()[2])
 
     def exclude_ranks(self, ranks):
         """
@@ -89,15 +130,16 @@ class Piece:
         possible ranks, and returns the modified Piece.
 
         """
-        ranks_to_remove = set(self.ranks()).intersection(set(ranks))
-        ranks_to_keep = set(self.ranks()).difference(ranks_to_remove)
-        soldiers_to_keep = ranks_to_keep.intersection(SOLDIER_RANKS)
+        ranks = set(ranks)
+        ranks_to_keep = [r for r in self.ranks() if r not in ranks]
+        soldiers_to_keep = [r for r in ranks_to_keep if r in SOLDIER_RANKS]
         new_numerators = {}
         new_denominators = {}
 
         num_soldiers_to_remove = 0
-        for rank in ranks_to_remove.intersection(SOLDIER_RANKS):
-            num_soldiers_to_remove += self.prob_numerators[rank]
+        for rank in self.ranks():
+            if rank in ranks and rank in SOLDIER_RANKS:
+                num_soldiers_to_remove += self.prob_numerators[rank]
 
         for rank in ranks_to_keep:
             if rank in SOLDIER_RANKS:
@@ -110,71 +152,108 @@ class Piece:
 
         if len(soldiers_to_keep) == 0:
             if Rank('B') in new_numerators:
-                new_numerators[Rank('B')] = Fraction(1)
-                new_denominators[Rank('B')] = Fraction(1)
+                new_numerators[Rank('B')] = 1
+                new_denominators[Rank('B')] = 1
             else:
                 if Rank('L') in new_numerators:
-                    new_numerators[Rank('L')] = Fraction(1)
-                    new_denominators[Rank('L')] = Fraction(1)
+                    new_numerators[Rank('L')] = 1
+                    new_denominators[Rank('L')] = 1
                 else:
-                    new_numerators[Rank('F')] = Fraction(1)
-                    new_denominators[Rank('F')] = Fraction(1)
+                    new_numerators[Rank('F')] = 1
+                    new_denominators[Rank('F')] = 1
 
         return Piece(self.position, self.owner,
                      new_numerators, new_denominators)
 
     def probability(self, rank):
         """
-        Rank -> Fraction
+        Rank -> Number
 
-        Returns the probability that this piece has the given Rank.
+        Returns the probability that this piece has the given Rank,
+        as a Fraction or a float depending on the numeric backend
+        (see app.numeric).
 
         """
-        if not rank in self.ranks():
-            return Fraction(0)
+        return self.distribution()[rank.code]
 
-        probability = Fraction(self.prob_numerators[rank],
-                               self.prob_denominators[rank])
-        if rank == Rank('F'):
-            return probability
-        elif rank == Rank('L'):
-            return (probability * (1 - self.probability(Rank('F'))))
-        elif rank == Rank('B'):
-            return (probability *
-                    (1 - self.probability(Rank('L'))
-                       - self.probability(Rank('F'))))
-        else:
-            return (probability *
-                    (1 - self.probability(Rank('B'))
-                       - self.probability(Rank('L'))
-                       - self.probability(Rank('F'))))
+    def distribution(self):
+        """
+        -> tuple(Number)
+
+        Returns the probability of this piece having each rank,
+        as a tuple indexed by rank code. The distribution is computed
+        the first time it is needed and then cached, which is safe
+        since a Piece never changes.
+
+        """
+        backend = numeric.get_backend()
+        if self._distribution is None or self._backend != backend:
+            self._distribution = self._compute_distribution()
+            self._backend = backend
+            self._tally = None
+        return self._distribution
+
+    def tally(self):
+        """
+        -> (Number, tuple((int, Number)), bool)
+
+        Returns what this piece adds to the tallies of a Board (see
+        app.board): its expected worth by rank.RANK_WORTH, the code
+        and probability of each rank it may have, and whether its rank
+        (flag or landmine) keeps it from ever moving. It is cached
+        along with the distribution.
+
+        """
+        distribution = self.distribution()
+        if self._tally is None:
+            support = tuple((code, p) for (code, p) in enumerate(distribution)
+                            if p)
+            self._tally = (
+                sum(p * WORTHS[code] for (code, p) in support),
+                support,
+                numeric.is_equal(distribution[_LANDMINE.code] +
+                                 distribution[_FLAG.code], 1))
+        return self._tally
+
+    def _compute_distribution(self):
+        """
+        -> tuple(Number)
+
+        Computes the probability of this piece having each rank.
+        The numerators and denominators give the probability of the
+        flag, then of a landmine given that the piece is not the flag,
+        then of a bomb given that it is neither, and finally of each
+        soldier given that it is none of the above.
+
+        """
+        def ratio(rank):
+            if rank in self.prob_numerators:
+                return numeric.ratio(self.prob_numerators[rank],
+                                     self.prob_denominators[rank])
+            return numeric.ratio(0, 1)
+
+        p_flag = ratio(_FLAG)
+        p_landmine = ratio(_LANDMINE) * (1 - p_flag)
+        p_bomb = ratio(_BOMB) * (1 - p_landmine - p_flag)
+        p_soldier = 1 - p_bomb - p_landmine - p_flag
+
+        distribution = [ratio(r) * p_soldier for r in RANKS]
+        distribution[_FLAG.code] = p_flag
+        distribution[_LANDMINE.code] = p_landmine
+        distribution[_BOMB.code] = p_bomb
+        return tuple(distribution)
 
     def expected_attack_outcome(self, other_piece):
         """
-        Piece -> (Fraction, Fraction, Fraction)
+        Piece -> (Number, Number, Number)
 
         Returns the expected outcome of an attack made by this piece
         against other_piece. The expected outcome is returned as a tuple
         of probabilities: (P(win), P(tie), P(loss)).
 
         """
-        p_win = 0
-        p_tie = 0
-        p_loss = 0
-
-        for rank_a in self.prob_numerators:
-            for rank_b in other_piece.prob_numerators:
-                p = (self.probability(rank_a) *
-                     other_piece.probability(rank_b))
-
-                if rank_a.wins_against(rank_b):
-                    p_win += p
-                elif rank_a.loses_against(rank_b):
-                    p_loss += p
-                else:
-                    p_tie += p
-
-        return (p_win, p_tie, p_loss)
+        return expected_outcome(self.distribution(),
+                                other_piece.distribution())
 
     def get_rank(self):
         """
@@ -187,6 +266,18 @@ class Piece:
         assert(self.owner == Owner.PLAYER)
         return next(self.ranks())
 
+    def known_rank(self):
+        """
+        -> (Rank | None)
+
+        Returns this piece's rank if only one rank is possible,
+        otherwise None.
+
+        """
+        if len(self.prob_numerators) == 1:
+            return next(self.ranks())
+        return None
+
     def ranks(self):
         """
         -> iter(Rank)
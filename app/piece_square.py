@@ -0,0 +1,167 @@
+import app.board_layout as board_layout
+from app.rank import Rank, RANKS, NUM_RANKS
+
+"""
+Piece-square tables: the positional value of a piece of each rank on
+each space, used to score moves and positions by lookup.
+
+A Table is a tuple of NUM_SPACES numbers indexed by
+board_layout.index_of. Tables is a tuple of one Table per rank,
+indexed by rank code.
+
+The default tables are generated from the board layout when this
+module is loaded. They value advancing up the board, standing in a
+camp, being close to one of the opponent's headquarters (where its
+flag is) and, for engineers, standing on the railroad. Flags and
+landmines never move and have no positional value.
+
+Tables are oriented for the player, whose pieces start in rows 0 - 5,
+so Boards only tally the placement of the player's pieces.
+
+Tables can be written to and read back from a data file with dump and
+load, so that they can be tuned offline. A data file holds, for each
+rank, a line with the rank's name followed by one line of five values
+for each row from 0 to 11. Blank lines and lines starting with "#"
+are ignored.
+"""
+
+# Weights of the features of a space, in rows advanced
+ADVANCE_WEIGHT = 1
+CAMP_WEIGHT = 1
+HEADQUARTERS_WEIGHT = 2
+RAILROAD_WEIGHT = {Rank('1'): 1}
+
+# Ranks that never move, which have no positional value
+STATIONARY_RANKS = {Rank('F'), Rank('L')}
+
+# Values are divided by the number of rows that can be advanced
+_LAST_ROW = 11
+_WIDTH = 5
+
+
+def enemy_headquarters():
+    """
+    -> list(Position)
+
+    Returns the positions of the opponent's headquarters.
+
+    """
+    positions = (board_layout.position_of(i)
+                 for i in range(board_layout.NUM_SPACES))
+    return [p for p in positions
+            if board_layout.is_headquarters(p) and p[1] > _LAST_ROW // 2]
+
+
+def distances_from(sources):
+    """
+    list(Position) -> list(int)
+
+    Returns the number of steps from the closest of the given positions
+    to every space, indexed by board_layout.index_of.
+
+    """
+    distances = [None] * board_layout.NUM_SPACES
+    frontier = list(sources)
+    for p in frontier:
+        distances[board_layout.index_of(p)] = 0
+
+    for p in frontier:
+        distance = distances[board_layout.index_of(p)] + 1
+        for q in board_layout.iterate_adjacent(p):
+            if distances[board_layout.index_of(q)] is None:
+                distances[board_layout.index_of(q)] = distance
+                frontier.append(q)
+    return distances
+
+
+def generate():
+    """
+    -> Tables
+
+    Returns the default tables, generated from the board layout.
+
+    """
+    distances = distances_from(enemy_headquarters())
+    tables = []
+    for rank in RANKS:
+        table = []
+        for i in range(board_layout.NUM_SPACES):
+            p = board_layout.position_of(i)
+            if rank in STATIONARY_RANKS:
+                table.append(0.0)
+                continue
+            railroad = board_layout.is_railroad(p)
+            value = (ADVANCE_WEIGHT * p[1] +
+                     CAMP_WEIGHT * board_layout.is_camp(p) +
+                     HEADQUARTERS_WEIGHT / (1 + distances[i]) +
+                     RAILROAD_WEIGHT.get(rank, 0) * railroad)
+            table.append(value / _LAST_ROW)
+        tables.append(tuple(table))
+    return tuple(tables)
+
+
+def dump(tables, path):
+    """
+    Tables str ->
+
+    Writes the given tables to the data file at path.
+
+    """
+    with open(path, "w") as fp:
+        for rank in RANKS:
+            fp.write("%s\n" % rank)
+            table = tables[rank.code]
+            for y in range(_LAST_ROW + 1):
+                fp.write(" ".join(
+                    repr(table[board_layout.index_of((x, y))])
+                    for x in range(_WIDTH)) + "\n")
+
+
+def load(path):
+    """
+    str -> Tables
+
+    Reads tables from the data file at path. Raises ValueError if the
+    file does not hold a table for every rank.
+
+    """
+    with open(path, "r") as fp:
+        lines = [line.split() for line in fp]
+    lines = [fields for fields in lines
+             if fields and not fields[0].startswith("#")]
+
+    tables = [None] * NUM_RANKS
+    for start in range(0, len(lines), _LAST_ROW + 2):
+        rows = lines[start + 1:start + _LAST_ROW + 2]
+        if (len(lines[start]) != 1 or len(rows) != _LAST_ROW + 1 or
+                any(len(row) != _WIDTH for row in rows)):
+            raise ValueError("Malformed table in %s" % path)
+
+        table = [0.0] * board_layout.NUM_SPACES
+        for (y, row) in enumerate(rows):
+            for (x, value) in enumerate(row):
+                table[board_layout.index_of((x, y))] = float(value)
+        tables[Rank(lines[start][0]).code] = tuple(table)
+
+    if None in tables:
+        raise ValueError("Missing tables in %s" % path)
+    return tuple(tables)
+
+
+def use(tables):
+    """
+    Tables ->
+
+    Makes the given tables the ones used for evaluation. Boards keep a
+    tally of their pieces' values (see app.board), so this is called
+    before any Board is built.
+
+    """
+    global TABLES
+    TABLES = tables
+
+
+"""
+The tables in use, generated from the layout unless replaced by use
+"""
+TABLES = generate()
@@ -0,0 +1,182 @@
+import logging
+import threading
+import time
+from app.message import MoveMessage
+from app.move_ordering import MoveOrderer
+from app.piece import Owner
+from app.rank import expected_outcome
+from app.timing import CancellationToken
+
+"""
+Pondering: searching on the opponent's time.
+
+While the opponent decides on its move, the Ponderer guesses its
+likely replies and, for each of them, works out the board that would
+follow (Board.update, including the belief updates) and searches it
+with the engine. When the real reply arrives, a matching board is
+taken from the cache instead of being worked out again, and the
+engine's own caches (the transposition table of an ExpectimaxEngine
+or the trees of an ISMCTSEngine) let the real search continue where
+pondering left off.
+
+A Reply is a tuple (position_from, position_to, movetype), matching a
+MoveMessage from the opponent.
+"""
+
+log = logging.getLogger("ponder")
+
+# Largest number of replies pondered after each of our moves
+PONDER_REPLIES = 4
+
+
+class Ponderer:
+    """
+    Instance variables:
+    Engine                 engine
+    int                    opponent
+    Board | None           board
+    dict(Reply, Board)     boards
+    CancellationToken      token
+    threading.Thread|None  thread
+    int                    hits
+    int                    misses
+
+    Searches the likely replies of the opponent, whose turn number
+    (1 or 2) is opponent, with an engine that has a predicted_reply
+    method (see app.search and app.mcts). board is the board the
+    opponent is replying to, and boards caches the board after each
+    reply pondered so far. token is cancelled to stop pondering.
+
+    The replies are searched one after another for slice seconds each,
+    starting with the engine's predicted reply, then over and over for
+    twice as long each time, until stop is called. stop does not wait
+    for the current search to end, so that it can be called from an
+    event loop; wait must be called before the engine is used again.
+    hits and misses count the replies that were and were not pondered.
+
+    """
+
+    def __init__(self, engine, opponent):
+        """
+        Engine int -> Ponderer
+
+        Constructs a Ponderer searching with the given engine.
+
+        """
+        self.engine = engine
+        self.opponent = opponent
+        self.board = None
+        self.boards = {}
+        self.token = CancellationToken()
+        self.thread = None
+        self.hits = 0
+        self.misses = 0
+
+    def start(self, board, slice):
+        """
+        Board float ->
+
+        Starts pondering the opponent's replies on the given board in
+        a new thread, once any earlier pondering has ended.
+
+        """
+        self.stop()
+        self.wait()
+        self.board = board
+        self.boards = {}
+        self.token = CancellationToken()
+        self.thread = threading.Thread(target=self._ponder,
+                                       args=(board, slice, self.token),
+                                       daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        ->
+
+        Stops pondering. The current search ends soon after, in the
+        background (see wait).
+
+        """
+        self.token.cancel()
+
+    def wait(self):
+        """
+        ->
+
+        Waits for the search stopped by stop to end, after which the
+        engine may be used again.
+
+        """
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def board_after(self, board, msg):
+        """
+        Board MoveMessage -> Board
+
+        Returns board.update(msg), taken from the cache if msg is a
+        reply that was pondered on the same board.
+
+        """
+        reply = (msg.posfrom, msg.posto, msg.movetype)
+        if board is self.board and reply in self.boards:
+            self.hits += 1
+            log.debug("ponder hit on %s (%d hits, %d misses)" %
+                      (reply, self.hits, self.misses))
+            return self.boards[reply]
+
+        if board is self.board and msg.player == self.opponent:
+            self.misses += 1
+        return board.update(msg)
+
+    def replies(self, board):
+        """
+        Board -> list(Reply)
+
+        Returns the replies to ponder on the given board, most likely
+        first. An attack is split into one reply for each outcome it
+        can have, most likely first.
+
+        """
+        moves = MoveOrderer().order(
+            board, board.iterate_all_moves(Owner.OPPONENT), 0, Owner.OPPONENT)
+        predicted = self.engine.predicted_reply(board)
+        if predicted in moves:
+            moves.remove(predicted)
+            moves.insert(0, predicted)
+
+        replies = []
+        for (src, dest) in moves[:PONDER_REPLIES]:
+            if board.piece_at(dest) is None:
+                replies.append((src, dest, "move"))
+                continue
+            outcomes = zip(expected_outcome(board.rank_distribution(src),
+                                            board.rank_distribution(dest)),
+                           ["win", "tie", "loss"])
+            for (p, outcome) in sorted(outcomes, reverse=True):
+                if p:
+                    replies.append((src, dest, outcome))
+        return replies[:PONDER_REPLIES]
+
+    def _ponder(self, board, slice, token):
+        """
+        Board float CancellationToken ->
+
+        Searches the boards after each reply to the given board until
+        token is cancelled.
+
+        """
+        replies = self.replies(board)
+        while replies and not token.is_cancelled():
+            for reply in replies:
+                if token.is_cancelled():
+                    return
+                if reply not in self.boards:
+                    (src, dest, outcome) = reply
+                    self.boards[reply] = board.update(
+                        MoveMessage(src, dest, self.opponent, outcome))
+                self.engine.search(self.boards[reply],
+                                   time.monotonic() + slice, token)
+            slice *= 2
@@ -0,0 +1,130 @@
+import app.bitboard as bitboard
+import app.board_layout as board_layout
+
+"""
+Railroad move generation.
+
+A piece on a railroad may slide any distance along a straight rail
+line until it reaches an occupied space, and an engineer may also
+turn corners. Rail lines and rail adjacency are precomputed from the
+board layout when this module is loaded.
+"""
+
+_DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+
+# Maximum number of engineer paths to remember before starting over
+MAX_ENGINEER_CACHE_SIZE = 50000
+
+
+def _is_rail_link(p1, p2):
+    """
+    Position Position -> bool
+
+    Checks if the two positions are adjacent spaces joined by a railroad.
+
+    """
+    return (board_layout.is_adjacent(p1, p2) and
+            board_layout.is_railroad(p1) and board_layout.is_railroad(p2))
+
+
+def _rail_lines(index):
+    """
+    int -> list(list(int))
+
+    Returns the straight rail lines leading away from the space at
+    index, each given as a list of space indices ordered by distance.
+
+    """
+    lines = []
+    start = board_layout.position_of(index)
+    if not board_layout.is_railroad(start):
+        return lines
+
+    for (dx, dy) in _DIRECTIONS:
+        line = []
+        (x, y) = start
+        while _is_rail_link((x, y), (x + dx, y + dy)):
+            (x, y) = (x + dx, y + dy)
+            line.append(board_layout.index_of((x, y)))
+        if line:
+            lines.append(line)
+    return lines
+
+
+def _rail_neighbours(index):
+    """
+    int -> Bitboard
+
+    Returns the bitboard of spaces joined to the space at index by
+    a railroad.
+
+    """
+    p = board_layout.position_of(index)
+    mask = 0
+    for q in board_layout.iterate_adjacent(p):
+        if _is_rail_link(p, q):
+            mask |= bitboard.bit(q)
+    return mask
+
+
+RAIL_MASK = bitboard.mask_where(board_layout.is_railroad)
+RAIL_LINES = [_rail_lines(i) for i in range(board_layout.NUM_SPACES)]
+RAIL_NEIGHBOURS = [_rail_neighbours(i)
+                   for i in range(board_layout.NUM_SPACES)]
+_engineer_cache = {}
+
+
+def slide_mask(index, occupied):
+    """
+    int Bitboard -> Bitboard
+
+    Returns the bitboard of spaces reachable by sliding along a straight
+    rail line from the space at index. Each line ends at (and includes)
+    the first occupied space.
+
+    """
+    mask = 0
+    for line in RAIL_LINES[index]:
+        for i in line:
+            b = 1 << i
+            mask |= b
+            if occupied & b:
+                break
+    return mask
+
+
+def engineer_mask(index, occupied):
+    """
+    int Bitboard -> Bitboard
+
+    Returns the bitboard of spaces an engineer can reach along the
+    railroad from the space at index, turning corners as needed. Paths
+    end at (and include) the first occupied space.
+
+    """
+    if not RAIL_MASK & (1 << index):
+        return 0
+
+    key = (index, occupied & RAIL_MASK)
+    reached = _engineer_cache.get(key)
+    if reached is not None:
+        return reached
+
+    frontier = 1 << index
+    visited = frontier
+    reached = 0
+    while frontier:
+        step = 0
+        while frontier:
+            low = frontier & -frontier
+            step |= RAIL_NEIGHBOURS[low.bit_length() - 1]
+            frontier ^= low
+        step &= ~visited
+        visited |= step
+        reached |= step
+        frontier = step & ~occupied
+
+    if len(_engineer_cache) >= MAX_ENGINEER_CACHE_SIZE:
+        _engineer_cache.clear()
+    _engineer_cache[key] = reached
+    return reached
@@ -1,18 +1,52 @@
+"""
+Rank names, in order of their integer codes
+"""
+RANK_NAMES = "123456789BLF"
+NUM_RANKS = len(RANK_NAMES)
+
+
 class Rank:
     """
     Instance variables:
     str rank
+    int code
+
+    Ranks are interned: constructing a Rank with a given name always
+    returns the same instance, so ranks are compared and hashed by
+    identity. code is the index of the rank's name in RANK_NAMES and
+    can be used to index fixed size per-rank arrays.
 
     """
+    __slots__ = ('rank', 'code')
 
-    def __init__(self, rank):
+    _interned = {}
+
+    def __new__(cls, rank):
         """
         str -> Rank
 
-        Constructs a Rank with the given rank
+        Returns the Rank with the given name.
+
+        """
+        interned = cls._interned.get(rank)
+        if interned is None:
+            if rank not in RANK_NAMES or len(rank) != 1:
+                raise ValueError("Invalid rank: %s" % (rank))
+            interned = object.__new__(cls)
+            interned.rank = rank
+            interned.code = RANK_NAMES.index(rank)
+            cls._interned[rank] = interned
+        return interned
 
+    def __reduce__(self):
         """
-        self.rank = rank
+        -> (type, tuple)
+
+        Pickles this Rank by name so that unpickling returns the
+        interned instance.
+
+        """
+        return (Rank, (self.rank,))
 
     def __str__(self):
         """
@@ -26,25 +60,6 @@ class Rank:
         """
         return self.rank
 
-    def __eq__(self, other):
-        """
-        -> Rank
-
-        Checks if this is equal to the given Rank by comparing
-        self.rank for equality.
-
-        """
-        return self.rank == other.rank
-
-    def __hash__(self):
-        """
-        -> int
-
-        Hashes this instance.
-
-        """
-        return hash(self.rank)
-
     def is_soldier(self):
         """
         -> bool
@@ -62,17 +77,7 @@ class Rank:
         piece of other_rank.
 
         """
-        if self.is_soldier():
-            if other_rank.is_soldier():
-                return self.rank > other_rank.rank
-            elif other_rank.rank == 'B':
-                return False
-            elif other_rank.rank == 'L':
-                return self.rank == '1'
-            else:
-                return True
-        else:
-            return False
+        return ATTACK_OUTCOMES[self.code][other_rank.code] == "win"
 
     def loses_against(self, other_rank):
         """
@@ -82,7 +87,7 @@ class Rank:
         piece of this rank.
 
         """
-        return other_rank.wins_against(self)
+        return ATTACK_OUTCOMES[self.code][other_rank.code] == "loss"
 
     def ties_against(self, other_rank):
         """
@@ -92,8 +97,7 @@ class Rank:
         a piece of other rank.
 
         """
-        return not (self.wins_against(other_rank) or
-                    self.loses_against(other_rank))
+        return ATTACK_OUTCOMES[self.code][other_rank.code] == "tie"
 
     def attack_outcome(self, other_rank):
         """
@@ -105,10 +109,104 @@ class Rank:
         of other_rank.
 
         """
+        return ATTACK_OUTCOMES[self.code][other_rank.code]
+
+
+def _wins_against(rank, other_rank):
+    """
+    str str -> bool
 
-        if self.wins_against(other_rank):
-            return "win"
-        elif self.loses_against(other_rank):
-            return "loss"
+    Returns true if a piece of rank can defeat a piece of other_rank.
+    These are the rules used to build ATTACK_OUTCOMES.
+
+    """
+    if rank.isdigit():
+        if other_rank.isdigit():
+            return rank > other_rank
+        elif other_rank == 'B':
+            return False
+        elif other_rank == 'L':
+            return rank == '1'
         else:
-            return "tie"
+            return True
+    else:
+        return False
+
+
+def _attack_outcome(rank, other_rank):
+    """
+    str str -> Result
+
+    Returns the result of a piece of rank attacking a piece of other_rank.
+
+    """
+    if _wins_against(rank, other_rank):
+        return "win"
+    elif _wins_against(other_rank, rank):
+        return "loss"
+    else:
+        return "tie"
+
+
+"""
+All ranks, indexed by code
+"""
+RANKS = tuple(Rank(name) for name in RANK_NAMES)
+
+"""
+The number of pieces of each rank every player starts with
+"""
+INITIAL_RANK_COUNTS = {Rank('1'): 3, Rank('2'): 3, Rank('3'): 3,
+                       Rank('4'): 2, Rank('5'): 2, Rank('6'): 2,
+                       Rank('7'): 2, Rank('8'): 1, Rank('9'): 1,
+                       Rank('B'): 2, Rank('L'): 3, Rank('F'): 1}
+
+"""
+The worth of each movable rank, used to weigh material. Flags and
+landmines are not worth anything as they cannot move.
+
+WORTHS holds the same worths indexed by rank code, with 0 for the flag
+and landmines.
+"""
+RANK_WORTH = {Rank('1'): 2, Rank('2'): 2, Rank('3'): 3, Rank('4'): 4,
+              Rank('5'): 5, Rank('6'): 6, Rank('7'): 7, Rank('8'): 8,
+              Rank('9'): 9, Rank('B'): 5}
+WORTHS = tuple(RANK_WORTH.get(rank, 0) for rank in RANKS)
+
+"""
+ATTACK_OUTCOMES[a][b] is the result ("win", "loss" or "tie") of a piece
+with rank code a attacking a piece with rank code b.
+
+WINS_AGAINST[a], TIES_AGAINST[a] and LOSES_AGAINST[a] list the rank
+codes that rank code a wins, ties and loses against.
+"""
+ATTACK_OUTCOMES = tuple(tuple(_attack_outcome(a, b) for b in RANK_NAMES)
+                        for a in RANK_NAMES)
+WINS_AGAINST, TIES_AGAINST, LOSES_AGAINST = (
+    tuple(tuple(b for b in range(NUM_RANKS) if outcomes[b] == result)
+          for outcomes in ATTACK_OUTCOMES)
+    for result in ["win", "tie", "loss"])
+
+
+def expected_outcome(attacker, defender):
+    """
+    list(Number) list(Number) -> (Number, Number, Number)
+
+    Given the rank distributions of an attacking and a defending piece,
+    each a list of probabilities indexed by rank code, returns the
+    expected outcome of the attack as (P(win), P(tie), P(loss)).
+
+    """
+    p_win = 0
+    p_tie = 0
+    p_loss = 0
+
+    for a in range(NUM_RANKS):
+        p = attacker[a]
+        if not p:
+            continue
+        p_win += p * sum(defender[b] for b in WINS_AGAINST[a])
+        p_tie += p * sum(defender[b] for b in TIES_AGAINST[a])
+        p_loss += p * sum(defender[b] for b in LOSES_AGAINST[a])
+
+    return (p_win, p_tie, p_loss)
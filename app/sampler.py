@@ -0,0 +1,197 @@
+import random
+from array import array
+from bisect import bisect
+import app.board_layout as board_layout
+from app.piece import Owner
+from app.rank import Rank, RANKS, INITIAL_RANK_COUNTS
+
+"""
+Sampling of complete assignments of ranks to the opponent's pieces.
+
+An Assignment is an array of rank codes, one for each opponent piece,
+in the order of RankSampler.positions.
+"""
+
+# Number of times a sample is restarted after running out of ranks
+# before the rank counts are ignored
+SAMPLE_ATTEMPTS = 20
+
+_FLAG = Rank('F').code
+_LANDMINE = Rank('L').code
+_INITIAL_COUNTS = [INITIAL_RANK_COUNTS[r] for r in RANKS]
+
+
+def placement_allows(position, code):
+    """
+    Position int -> bool
+
+    Returns whether a piece at the given position can have the rank
+    with the given code, given that the flag and landmines never move
+    from where they were placed (see board._initial_probability_for).
+    Bombs can move, so the rule keeping them out of the front row
+    says nothing about where they are now.
+
+    """
+    if code == _FLAG:
+        return board_layout.is_headquarters(position)
+    elif code == _LANDMINE:
+        return position[1] in range(10, 12)
+    return True
+
+
+def _bisect(cumulative, draw):
+    """
+    list(float) (-> float) -> int
+
+    Returns the index of a random entry, where each entry is chosen
+    with probability proportional to its weight and cumulative is the
+    running total of the weights.
+
+    """
+    return bisect(cumulative, draw() * cumulative[-1], 0, len(cumulative) - 1)
+
+
+class RankSampler:
+    """
+    Instance variables:
+    tuple(Position)      positions
+    list(tuple(int))     codes
+    list(tuple(float))   weights
+    list(list(float))    cumulative
+    int                  last_flag
+
+    Draws Assignments for the opponent pieces of one Board that are
+    consistent with each piece's rank distribution, the placement
+    rules (see placement_allows) and the number of pieces of each
+    rank the opponent started with. Exactly one piece is the flag.
+
+    Everything that does not change between samples is worked out
+    once, when the sampler is constructed: codes and weights hold the
+    possible rank codes of each piece with their probabilities, and
+    cumulative their running totals for drawing by bisection. Pieces
+    are drawn in the order of positions: flag candidates first, then
+    pieces with fewer possible ranks, which rarely leaves a later
+    piece without a rank. last_flag is the index of the last flag
+    candidate, which becomes the flag if none of the others did.
+
+    """
+
+    def __init__(self, board):
+        """
+        Board -> RankSampler
+
+        Constructs a sampler for the opponent pieces on the given Board.
+
+        """
+        pieces = []
+        for piece in board.iterate_pieces(Owner.OPPONENT):
+            position = piece.position
+            distribution = board.rank_distribution(position)
+            possible = [(code, float(p))
+                        for (code, p) in enumerate(distribution)
+                        if p and placement_allows(position, code)]
+            if not possible:
+                # Trust the distribution over the placement rules
+                possible = [(code, float(p))
+                            for (code, p) in enumerate(distribution) if p]
+            pieces.append((position, possible))
+        pieces.sort(key=lambda item: (
+            all(code != _FLAG for (code, p) in item[1]), len(item[1])))
+
+        self.positions = tuple(position for (position, possible) in pieces)
+        self.codes = [tuple(code for (code, p) in possible)
+                      for (position, possible) in pieces]
+        self.weights = [tuple(p for (code, p) in possible)
+                        for (position, possible) in pieces]
+        self.cumulative = []
+        for weights in self.weights:
+            total = 0.0
+            cumulative = []
+            for p in weights:
+                total += p
+                cumulative.append(total)
+            self.cumulative.append(cumulative)
+
+        self.last_flag = -1
+        for (i, codes) in enumerate(self.codes):
+            if _FLAG in codes:
+                self.last_flag = i
+
+    def sample(self, generator=random):
+        """
+        random.Random -> Assignment
+
+        Returns a random Assignment drawn with the given generator. If
+        no consistent Assignment is found after SAMPLE_ATTEMPTS
+        attempts, each piece's rank is drawn from its own distribution
+        alone.
+
+        """
+        draw = generator.random
+        for attempt in range(SAMPLE_ATTEMPTS):
+            assignment = self._sample_consistent(draw)
+            if assignment is not None:
+                return assignment
+
+        assignment = array('B')
+        for (codes, cumulative) in zip(self.codes, self.cumulative):
+            assignment.append(codes[_bisect(cumulative, draw)])
+        return assignment
+
+    def sample_many(self, count, generator=random):
+        """
+        int random.Random -> list(Assignment)
+
+        Returns count random Assignments.
+
+        """
+        return [self.sample(generator) for i in range(count)]
+
+    def _sample_consistent(self, draw):
+        """
+        (-> float) -> (Assignment | None)
+
+        Draws an Assignment using draw for random numbers in [0, 1),
+        returning None if some piece is left with no rank available.
+
+        """
+        counts = list(_INITIAL_COUNTS)
+        assignment = array('B')
+        last_flag = self.last_flag
+
+        for (i, codes) in enumerate(self.codes):
+            if i == last_flag and counts[_FLAG]:
+                # The opponent still has its flag
+                code = _FLAG
+            else:
+                cumulative = self.cumulative[i]
+                code = codes[_bisect(cumulative, draw)]
+                if not counts[code]:
+                    code = self._redraw(i, counts, draw)
+                    if code is None:
+                        return None
+            counts[code] -= 1
+            assignment.append(code)
+
+        return assignment
+
+    def _redraw(self, i, counts, draw):
+        """
+        int list(int) (-> float) -> (int | None)
+
+        Draws a rank code for the i-th piece among the ranks that have
+        pieces left in counts, or returns None if there are none.
+
+        """
+        available = [(code, p)
+                     for (code, p) in zip(self.codes[i], self.weights[i])
+                     if counts[code]]
+        if not available:
+            return None
+
+        target = draw() * sum(p for (code, p) in available)
+        for (code, p) in available:
+            target -= p
+            if target < 0:
+                return code
+        return available[-1][0]
@@ -0,0 +1,442 @@
+import logging
+import time
+import app.strategy as strategy
+import app.transposition as transposition
+import app.zobrist as zobrist
+from app.mcts import ISMCTSEngine
+from app.move_ordering import MoveOrderer
+from app.piece import Owner
+from app.rank import expected_outcome
+from app.search_board import SearchBoard
+from app.transposition import TranspositionTable
+
+"""
+A Move is a tuple of positions (position_from, position_to).
+"""
+
+log = logging.getLogger("search")
+
+# Deepest search attempted, whatever the time budget
+MAX_DEPTH = 20
+
+# Number of nodes searched between checks of the deadline
+NODES_PER_TIME_CHECK = 64
+
+INFINITY = float("inf")
+
+# Names of the engines that can be selected with new_engine
+GREEDY = "greedy"
+EXPECTIMAX = "expectimax"
+MCTS = "mcts"
+ENGINES = [GREEDY, EXPECTIMAX, MCTS]
+
+
+class SearchTimeout(Exception):
+    """
+    Exception thrown inside the search when the deadline has passed
+    or the search has been cancelled.
+
+    """
+    pass
+
+
+def new_engine(name, table_mb=transposition.DEFAULT_SIZE_MB):
+    """
+    str Number -> Engine
+
+    where Engine is a GreedyEngine, ExpectimaxEngine or ISMCTSEngine
+
+    Returns a new engine of the kind with the given name (one of
+    ENGINES). table_mb is the size of the expectimax engine's
+    transposition table.
+
+    """
+    if name == GREEDY:
+        return GreedyEngine()
+    elif name == MCTS:
+        return ISMCTSEngine()
+    return ExpectimaxEngine(table_mb=table_mb)
+
+
+class GreedyEngine:
+    """
+    Instance variables:
+    Move | None  best_move
+    Number       best_value
+    int          depth
+
+    Picks the move with the highest strategy.action_value, looking
+    only one ply ahead. As action_value is partly random, so is the
+    move picked. All moves are rated at once with strategy.score_moves,
+    which takes far less time than any search, and best_move holds the
+    first move until then.
+
+    """
+
+    def __init__(self):
+        """
+        -> GreedyEngine
+
+        Constructs a GreedyEngine.
+
+        """
+        self.best_move = None
+        self.best_value = -1
+        self.depth = 0
+
+    def predicted_reply(self, board):
+        """
+        Board -> (Move | None)
+
+        Returns None, as this engine does not look at the opponent's
+        replies.
+
+        """
+        return None
+
+    def search(self, board, deadline, token=None, moves=None):
+        """
+        Board float (CancellationToken | None) (list(Move) | None)
+            -> (Move | None)
+
+        Returns the best move for the player on the given board, or
+        None if the player has no moves. Only the given moves are rated
+        if moves is not None. The deadline and token are not checked,
+        as rating the moves is quick.
+
+        """
+        if moves is None:
+            moves = list(board.iterate_all_moves(Owner.PLAYER))
+        self.best_move = moves[0] if moves else None
+        self.best_value = -1
+        self.depth = 1
+
+        if moves:
+            weights = strategy.score_moves(board, moves)
+            best = max(range(len(moves)), key=lambda i: weights[i])
+            self.best_move = moves[best]
+            self.best_value = weights[best]
+
+        return self.best_move
+
+
+class ExpectimaxEngine:
+    """
+    Instance variables:
+    Move | None                  best_move
+    Number                       best_value
+    int                          depth
+    int                          nodes
+    int                          cutoffs
+    int                          first_move_cutoffs
+    list((int, Number, Move))    completed
+    MoveOrderer | None           orderer
+    TranspositionTable | None    table
+
+    Picks moves with an iterative deepening expectimax search. The
+    player maximizes and the opponent minimizes the value given by
+    strategy.evaluate. Attacks are chance nodes: each outcome ("win",
+    "tie" or "loss") is weighted by its probability given the rank
+    distributions of the two pieces. Alpha-beta pruning is applied at
+    the player and opponent nodes, but bounds are not passed through
+    chance nodes, where pruning would not be valid.
+
+    Ranks are not updated within the search tree, so an opponent piece
+    keeps its distribution after an attack.
+
+    best_move always holds the best move found so far (or None if the
+    player has no moves), so it can be used as soon as time runs out.
+    The first iteration, which only searches one ply, ignores the
+    deadline so that every root move is given a value (see
+    app.parallel), but still stops when the token is cancelled, as the
+    caller then sends best_move without waiting for the search.
+    completed lists the (depth, value, move) found by each completed
+    iteration of the last search.
+
+    Moves are searched in the order given by a MoveOrderer, unless
+    ordering is disabled. nodes, cutoffs and first_move_cutoffs count
+    the nodes searched, the alpha-beta cutoffs and the cutoffs caused
+    by the first move searched during the last call to search, which
+    shows how well moves are being ordered.
+
+    Results are stored in a TranspositionTable, unless table_mb is 0,
+    and reused when the same position with the same player to move is
+    reached again. The best move stored for a position is searched
+    first. The table is kept between calls to search; as ranks are not
+    part of a hidden piece's key, an entry may be reused after a
+    piece's distribution has changed, which is accepted for the sake
+    of speed.
+
+    """
+
+    def __init__(self, max_depth=MAX_DEPTH, ordering=True,
+                 table_mb=transposition.DEFAULT_SIZE_MB):
+        """
+        int bool Number -> ExpectimaxEngine
+
+        Constructs an engine that searches at most max_depth plies,
+        ordering moves unless ordering is False and using a
+        transposition table of at most table_mb megabytes (none if
+        table_mb is 0).
+
+        """
+        self.max_depth = max_depth
+        self.best_move = None
+        self.best_value = -INFINITY
+        self.depth = 0
+        self.nodes = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.completed = []
+        self.orderer = MoveOrderer() if ordering else None
+        self.table = TranspositionTable(table_mb) if table_mb else None
+
+    def predicted_reply(self, board):
+        """
+        Board -> (Move | None)
+
+        Returns the opponent move the transposition table holds as the
+        best reply on the given board, with the opponent to move, or
+        None if there is none.
+
+        """
+        if self.table is None:
+            return None
+        entry = self.table.probe(zobrist.position_key(board, Owner.OPPONENT))
+        if entry is None:
+            return None
+        return entry[4]
+
+    def search(self, board, deadline, token=None, moves=None):
+        """
+        Board float (CancellationToken | None) (list(Move) | None)
+            -> (Move | None)
+
+        Searches the given board one ply deeper at a time until
+        time.monotonic() reaches deadline, token is cancelled or
+        max_depth is reached, and returns the best move from the
+        deepest completed search.
+        If moves is not None, only the given player moves are searched
+        from the root, and they are searched even if there is only one.
+
+        """
+        self.nodes = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.depth = 0
+        self.best_value = -INFINITY
+        self.completed = []
+
+        # SearchBoards do not track beliefs, so chance nodes use the
+        # balanced distributions through the pieces themselves
+        board = board.with_belief_pieces()
+
+        if moves is None:
+            moves = list(board.iterate_all_moves(Owner.PLAYER))
+            if len(moves) < 2:
+                self.best_move = moves[0] if moves else None
+                return self.best_move
+        else:
+            moves = list(moves)
+        if self.orderer is not None:
+            self.orderer.new_turn()
+            moves = self.orderer.order(board, moves, 0, Owner.PLAYER)
+        self.best_move = moves[0] if moves else None
+        if not moves:
+            return None
+
+        for depth in range(1, self.max_depth + 1):
+            # The first iteration is completed unless token is cancelled
+            limit = deadline if depth > 1 else INFINITY
+            try:
+                (value, move) = self._search_root(
+                    SearchBoard(board), moves, depth, limit, token)
+            except SearchTimeout:
+                break
+
+            self.best_move = move
+            self.best_value = value
+            self.depth = depth
+            self.completed.append((depth, value, move))
+
+            # Search the best move first next time for better pruning
+            moves.remove(move)
+            moves.insert(0, move)
+
+        log.debug("depth %d, %d nodes, %d cutoffs (%d on first move), "
+                  "value %s, move %s" %
+                  (self.depth, self.nodes, self.cutoffs,
+                   self.first_move_cutoffs, self.best_value, self.best_move))
+        if self.table is not None:
+            log.debug("table: %.1f%% hits, %d collisions, %.1f%% full" %
+                      (100 * self.table.hit_rate(), self.table.collisions,
+                       100 * self.table.fill()))
+        return self.best_move
+
+    def _search_root(self, board, moves, depth, deadline, token):
+        """
+        SearchBoard list(Move) int float (CancellationToken | None)
+            -> (Number, Move)
+
+        Returns the best of the given player moves and its value,
+        raising SearchTimeout once time.monotonic() reaches deadline or
+        token is cancelled.
+
+        """
+        alpha = -INFINITY
+        best_move = moves[0]
+
+        for (src, dest) in moves:
+            value = self._move_value(board, src, dest, depth,
+                                     alpha, INFINITY, Owner.PLAYER,
+                                     deadline, token)
+            if value > alpha:
+                alpha = value
+                best_move = (src, dest)
+
+        return (alpha, best_move)
+
+    def _tick(self, deadline, token):
+        """
+        float (CancellationToken | None) ->
+
+        Counts a node, raising SearchTimeout if time.monotonic() has
+        reached deadline or token has been cancelled.
+
+        """
+        self.nodes += 1
+        if self.nodes % NODES_PER_TIME_CHECK == 0 and (
+                time.monotonic() >= deadline or
+                (token is not None and token.is_cancelled())):
+            raise SearchTimeout()
+
+    def _value(self, board, depth, alpha, beta, owner, deadline, token):
+        """
+        SearchBoard int Number Number Owner float
+            (CancellationToken | None) -> Number
+
+        Returns the value of the given board with owner to move,
+        searching depth plies ahead until deadline or token stops the
+        search (see _tick).
+
+        """
+        self._tick(deadline, token)
+        # Nothing is searched after a flag has been captured
+        if (depth == 0 or strategy.flag_taken(board, Owner.PLAYER) or
+                strategy.flag_taken(board, Owner.OPPONENT)):
+            return strategy.evaluate(board)
+
+        key = None
+        table_move = None
+        if self.table is not None:
+            key = zobrist.position_key(board, owner)
+            entry = self.table.probe(key)
+            if entry is not None:
+                (_, entry_depth, value, bound, table_move) = entry
+                if entry_depth >= depth and (
+                        bound == transposition.EXACT or
+                        (bound == transposition.LOWER and value >= beta) or
+                        (bound == transposition.UPPER and value <= alpha)):
+                    return value
+
+        moves = board.iterate_all_moves(owner)
+        if self.orderer is not None:
+            moves = self.orderer.order(board, moves, depth, owner)
+        if table_move is not None:
+            moves = list(moves)
+            if table_move in moves:
+                moves.remove(table_move)
+                moves.insert(0, table_move)
+        original_window = (alpha, beta)
+        best = None
+        best_move = None
+
+        for (i, (src, dest)) in enumerate(moves):
+            value = self._move_value(board, src, dest, depth,
+                                     alpha, beta, owner, deadline, token)
+            if owner == Owner.PLAYER:
+                if best is None or value > best:
+                    (best, best_move) = (value, (src, dest))
+                alpha = max(alpha, value)
+            else:
+                if best is None or value < best:
+                    (best, best_move) = (value, (src, dest))
+                beta = min(beta, value)
+            if alpha >= beta:
+                self._record_cutoff(board, (src, dest), depth, i)
+                break
+
+        if best is None:
+            # A player with no moves left loses
+            if owner == Owner.PLAYER:
+                best = -strategy.WIN_SCORE
+            else:
+                best = strategy.WIN_SCORE
+
+        if key is not None:
+            self._store(key, depth, best, best_move, original_window)
+        return best
+
+    def _store(self, key, depth, value, move, window):
+        """
+        int int Number (Move | None) (Number, Number) ->
+
+        Stores the value found for the position with the given key,
+        searched depth plies deep with the given (alpha, beta) window.
+
+        """
+        (alpha, beta) = window
+        if value <= alpha:
+            bound = transposition.UPPER
+        elif value >= beta:
+            bound = transposition.LOWER
+        else:
+            bound = transposition.EXACT
+        self.table.store(key, depth, value, bound, move)
+
+    def _record_cutoff(self, board, move, depth, index):
+        """
+        SearchBoard Move int int ->
+
+        Records that move, the index-th move searched at a node depth
+        plies from the leaves, caused a cutoff.
+
+        """
+        self.cutoffs += 1
+        if index == 0:
+            self.first_move_cutoffs += 1
+        if self.orderer is not None:
+            self.orderer.record_cutoff(board, move, depth)
+
+    def _move_value(self, board, src, dest, depth, alpha, beta, owner,
+                    deadline, token):
+        """
+        SearchBoard Position Position int Number Number Owner float
+            (CancellationToken | None) -> Number
+
+        Returns the value of owner making the given move on the given
+        board, searching depth plies ahead in total until deadline or
+        token stops the search (see _tick).
+
+        """
+        other = 1 - owner
+
+        if board.piece_at(dest) is None:
+            board.make_move(src, dest, "move")
+            value = self._value(board, depth - 1, alpha, beta, other,
+                                deadline, token)
+            board.unmake_move()
+            return value
+
+        (p_win, p_tie, p_loss) = expected_outcome(
+            board.rank_distribution(src), board.rank_distribution(dest))
+        value = 0
+        for (outcome, p) in [("win", p_win), ("tie", p_tie),
+                             ("loss", p_loss)]:
+            if p:
+                board.make_move(src, dest, outcome)
+                value += p * self._value(board, depth - 1,
+                                         -INFINITY, INFINITY, other,
+                                         deadline, token)
+                board.unmake_move()
+        return value
@@ -0,0 +1,117 @@
+import app.sampler as sampler
+from app.board import Board, PieceNotFoundException
+
+
+class SearchBoard(Board):
+    """
+    Instance variables:
+    list(Piece | None)                     cells
+    list(Bitboard)                         occupancy
+    list(Bitboard)                         mobile
+    int                                    zobrist_key
+    list(list(Number))                     rank_counts
+    list(Number)                           material
+    list(int)                              movable
+    Number                                 placement
+    list((Position, Position, str,
+          Piece, Piece | None))            history
+
+    A mutable Board for use during search. SearchBoards do not track
+    opponent beliefs (see Board.beliefs) or cache a RankSampler.
+    Rather than returning a new Board for every move, make_move changes
+    this board in place and records what it did on an undo stack so
+    that unmake_move can restore the previous state.
+
+    """
+
+    def __init__(self, board):
+        """
+        Board -> SearchBoard
+
+        Constructs a SearchBoard holding the same pieces as the
+        given Board.
+
+        """
+        self.cells = list(board.cells)
+        self.occupancy = list(board.occupancy)
+        self.mobile = list(board.mobile)
+        self.zobrist_key = board.zobrist_key
+        self.beliefs = None
+        self.rank_counts = [list(counts) for counts in board.rank_counts]
+        self.material = list(board.material)
+        self.movable = list(board.movable)
+        self.placement = board.placement
+        self.history = []
+
+    @property
+    def pieces_list(self):
+        """
+        -> list(Piece)
+
+        Returns all of the pieces on this board, ordered by position.
+
+        """
+        return [p for p in self.cells if p is not None]
+
+    def rank_sampler(self):
+        """
+        -> RankSampler
+
+        Returns a sampler of rank assignments for the opponent pieces
+        currently on this board.
+
+        """
+        return sampler.RankSampler(self)
+
+    def make_move(self, src, dest, outcome):
+        """
+        Position Position str ->
+
+        where outcome is one of "move", "win", "loss" or "tie"
+
+        Moves the piece at src to dest in place, resolving an attack
+        on the piece at dest (if any) with the given outcome.
+
+        """
+        attacker = self.piece_at(src)
+        if attacker is None:
+            raise PieceNotFoundException("Cannot move piece from ( %c%d )"
+                                         % (ord('A') + src[0], src[1] + 1))
+        defender = self.piece_at(dest)
+        self.history.append((src, dest, outcome, attacker, defender))
+
+        if outcome == "move" or outcome == "win":
+            if defender is not None:
+                self._remove_from_index(defender)
+            self._move_in_index(attacker, attacker.move(dest))
+        else:
+            self._remove_from_index(attacker)
+            if outcome == "tie":
+                self._remove_from_index(defender)
+
+    def unmake_move(self):
+        """
+        ->
+
+        Reverts the most recent make_move.
+
+        """
+        (src, dest, outcome, attacker, defender) = self.history.pop()
+
+        if outcome == "move" or outcome == "win":
+            self._move_in_index(self.piece_at(dest), attacker)
+            if defender is not None:
+                self._add_to_index(defender)
+        else:
+            if outcome == "tie":
+                self._add_to_index(defender)
+            self._add_to_index(attacker)
+
+    def to_board(self):
+        """
+        -> Board
+
+        Returns an immutable Board holding this board's current pieces.
+
+        """
+        return Board(self.pieces_list)
@@ -1,14 +1,11 @@
 from app.board import Board
 from app.piece import Owner
-from app.rank import Rank
+from app.rank import Rank, RANK_WORTH, expected_outcome
 from app.board_layout import *
+import app.numeric as numeric
+import app.piece_square as piece_square
 import random
 
-# Note that we are ONLY considering movable pieces i.e. no landmines or flags
-RANK_WORTH = {Rank('1'): 2, Rank('2'): 2, Rank('3'): 3, Rank('4'): 4,
-              Rank('5'): 5, Rank('6'): 6, Rank('7'): 7, Rank('8'): 8,
-              Rank('9'): 9, Rank('B'): 5}
-
 RANK_INIT_AMT = {Rank('1'): 3, Rank('2'): 3, Rank('3'): 3, Rank('4'): 2,
                  Rank('5'): 2, Rank('6'): 2, Rank('7'): 2, Rank('8'): 1,
                  Rank('9'): 1, Rank('B'): 2}
@@ -22,6 +19,11 @@ PROXIMITY_FACTOR = 5
 RANDOM_FACTOR = 1
 MOVE_VALUE = 4
 
+# Weights used by evaluate
+FLAG_WORTH = 50
+PLACEMENT_FACTOR = 1
+WIN_SCORE = 1000
+
 
 def action_value(board, src, dest):
     """
@@ -47,6 +49,66 @@ def action_value(board, src, dest):
         return value
 
 
+def score_moves(board, moves):
+    """
+    Board list(Move) -> list(Number)
+
+    where Move is a tuple of positions (position_from, position_to)
+
+    Returns the action_value of each of the given player moves, in the
+    same order, in a single pass over the moves. The moving piece's
+    rank is looked up once per source space, features that depend only
+    on the moving piece's rank (piece_worth, piece_commonality_rating and
+    brave_rating) are computed once per rank, and the chance of winning
+    once per attacked space and rank. The random parts are drawn in the
+    same order as calling action_value on each move in turn, so the
+    results are identical.
+
+    """
+    cells = board.cells
+    tables = piece_square.TABLES
+    rank_counts = board.rank_counts[Owner.PLAYER]
+    rank_features = {}
+    wins = {}
+
+    # Rank of the piece at each source space
+    ranks = {}
+
+    values = []
+    for (src, dest) in moves:
+        rank = ranks.get(src)
+        if rank is None:
+            rank = ranks[src] = cells[index_of(src)].get_rank()
+        dest_index = index_of(dest)
+        proximity = tables[rank.code][dest_index]
+        if cells[dest_index] is None:
+            values.append(
+                MOVE_VALUE +
+                PROXIMITY_FACTOR * proximity +
+                RANDOM_FACTOR * gen_rand())
+            continue
+
+        features = rank_features.get(rank)
+        if features is None:
+            features = rank_features[rank] = (
+                _worth_of(rank),
+                _commonality_of(rank, rank_counts[rank.code]),
+                _bravery_of(rank, rank_counts))
+        (worth, commonality, bravery) = features
+        win = wins.get((dest_index, rank))
+        if win is None:
+            win = wins[(dest_index, rank)] = prob_win_loss_tie(
+                board, src, dest)[0]
+        values.append(
+            PROXIMITY_FACTOR * proximity +
+            WORTH_FACTOR * worth +
+            WINNING_FACTOR * win +
+            COMMONALITY_FACTOR * commonality +
+            BRAVE_FACTOR * bravery +
+            RANDOM_FACTOR * gen_rand())
+    return values
+
+
 def gen_rand():
     return random.random()
 
@@ -58,9 +120,8 @@ def prob_win_loss_tie(board, src, dest):
     Returns probability of winning, losing and tying
 
     """
-    player_piece = board.piece_at(src)
-    opponent_piece = board.piece_at(dest)
-    return player_piece.expected_attack_outcome(opponent_piece)
+    return expected_outcome(board.rank_distribution(src),
+                            board.rank_distribution(dest))
 
 
 def piece_worth(board, pos):
@@ -69,11 +130,20 @@ def piece_worth(board, pos):
 
     Returns the hard-coded worth of a piece
 
+    """
+    piece = board.piece_at(pos)
+    return _worth_of(piece.get_rank())
+
+
+def _worth_of(rank):
+    """
+    Rank -> Number
+
+    Returns the piece_worth of a piece of the given rank
+
     """
     max = 9
     min = 2
-    piece = board.piece_at(pos)
-    rank = piece.get_rank()
     return (RANK_WORTH[rank] - min) / (max - min)
 
 
@@ -84,14 +154,22 @@ def piece_commonality_rating(board, src):
     Rates the commonality of the piece in the 
     board with ratio to their initial amount
 
+    """
+    src_rank = board.piece_at(src).get_rank()
+    num_same_pieces = board.rank_counts[Owner.PLAYER][src_rank.code]
+    return _commonality_of(src_rank, num_same_pieces)
+
+
+def _commonality_of(src_rank, num_same_pieces):
+    """
+    Rank int -> Number
+
+    Returns the piece_commonality_rating of a piece of the given rank
+    when the player has num_same_pieces pieces of that rank
+
     """
     max = 2
     min = 2/3
-    lop = board.iterate_pieces(Owner.PLAYER)
-    src_piece = board.piece_at(src)
-    src_rank = src_piece.get_rank()
-    num_same_pieces = len(list(
-        filter(lambda p: p.get_rank() == src_rank, lop)))
     num_orig = RANK_INIT_AMT[src_rank]
 
     current_present = num_same_pieces / num_orig
@@ -106,15 +184,12 @@ def proximity_rating(board, src, dest):
     Board Position Position -> Number
 
     Produces a proximity rating of destination to
-    flag and destination to a camp
+    flag and destination to a camp, looked up in
+    the moving piece's piece-square table
 
     """
-    max = 11
-    min = 0
-    if is_camp(dest):
-        return (dest[1] + 1) / (max - min)
-    else:
-        return dest[1] / (max - min)
+    rank = board.piece_at(src).get_rank()
+    return piece_square.TABLES[rank.code][index_of(dest)]
 
 
 def brave_rating(board, pos):
@@ -125,17 +200,64 @@ def brave_rating(board, pos):
     comparing how many pieces have a higher or
     equal worth than it
 
+    """
+    rank = board.piece_at(pos).get_rank()
+    return _bravery_of(rank, board.rank_counts[Owner.PLAYER])
+
+
+def _bravery_of(rank, rank_counts):
+    """
+    Rank list(Number) -> Number
+
+    Returns the brave_rating of a piece of the given rank, given the
+    number of pieces of each rank the player has, indexed by rank code
+
     """
     max = 18
     min = 0
-    piece = board.piece_at(pos)
-    rank = piece.get_rank()
     subj_worth = RANK_WORTH[rank]
-    lop = board.iterate_pieces(Owner.PLAYER)
-    higher_worth_pieces = list(
-        filter(lambda p:
-               p.get_rank() != Rank('F') and
-               p.get_rank() != Rank('L') and
-               RANK_WORTH[p.get_rank()] >= subj_worth, lop))
-    num_higher_worth_pieces = len(higher_worth_pieces)
+    num_higher_worth_pieces = sum(rank_counts[r.code]
+                                  for (r, w) in RANK_WORTH.items()
+                                  if w >= subj_worth)
     return num_higher_worth_pieces / (max - min)
+
+
+def evaluate(board):
+    """
+    Board -> Number
+
+    Returns a static evaluation of the given board from the player's
+    point of view: the worth of the player's pieces (plus a bonus for
+    their placement, see app.piece_square) minus the expected worth of
+    the opponent's pieces.
+    Unlike action_value, the result is deterministic.
+
+    Returns -WIN_SCORE if the player has lost their flag and WIN_SCORE
+    if the opponent has (see flag_taken).
+
+    """
+    flag = Rank('F').code
+    (player, opponent) = (Owner.PLAYER, Owner.OPPONENT)
+    if flag_taken(board, player):
+        return -WIN_SCORE
+    if flag_taken(board, opponent):
+        return WIN_SCORE
+
+    return (board.material[player] +
+            FLAG_WORTH * board.rank_counts[player][flag] +
+            PLACEMENT_FACTOR * board.placement -
+            board.material[opponent] -
+            FLAG_WORTH * board.rank_counts[opponent][flag])
+
+
+def flag_taken(board, owner):
+    """
+    Board Owner -> bool
+
+    Returns True if the given owner's flag has been captured, that is,
+    if none of their pieces left on the board can be the flag. The
+    game is then over.
+
+    """
+    count = board.rank_counts[owner][Rank('F').code]
+    return count <= numeric.FLOAT_TOLERANCE
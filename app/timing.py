@@ -0,0 +1,210 @@
+import logging
+import threading
+import time
+
+"""
+Time control for each move.
+
+A TimeManager turns the time allowed per move into a deadline for the
+search, keeping back a reserve for the work done after the search:
+building the move message and writing it to the referee. The reserve
+is not fixed but follows the latencies measured on this machine.
+Searches are stopped cooperatively through a CancellationToken.
+
+All times come from time.monotonic().
+"""
+
+log = logging.getLogger("timing")
+
+# Smallest reserve kept back from every move, in seconds, which covers
+# the time taken to deliver a move to the referee that cannot be
+# measured from here
+MIN_RESERVE = 0.02
+
+# The reserve is SAFETY_FACTOR times the slowest latency measured
+SAFETY_FACTOR = 2
+
+# Number of recent latencies the reserve is based on
+LATENCIES_KEPT = 20
+
+
+class CancellationToken:
+    """
+    Instance variables:
+    threading.Event _event
+
+    Tells a search running in another thread that it should stop. A
+    token starts out not cancelled and stays cancelled once cancel has
+    been called, so a new token is needed for each search.
+
+    """
+
+    def __init__(self):
+        """
+        -> CancellationToken
+
+        Constructs a token that has not been cancelled.
+
+        """
+        self._event = threading.Event()
+
+    def cancel(self):
+        """
+        ->
+
+        Asks every search holding this token to stop.
+
+        """
+        self._event.set()
+
+    def is_cancelled(self):
+        """
+        -> bool
+
+        Checks if cancel has been called.
+
+        """
+        return self._event.is_set()
+
+    def wait(self, timeout):
+        """
+        float -> bool
+
+        Waits at most timeout seconds for cancel to be called and
+        returns whether it was.
+
+        """
+        return self._event.wait(max(timeout, 0))
+
+
+class TimeManager:
+    """
+    Instance variables:
+    float        budget
+    list(float)  latencies
+    int          moves
+    float        received
+    float        deadline
+    float        searched
+
+    Works out the deadline of each move from budget, the time allowed
+    per move in seconds. latencies holds the most recent measurements
+    of the time from the end of a search (or its deadline, if that came
+    first) to the move having been written, and the reserve kept back
+    from each move grows and shrinks with them.
+
+    For each move, start_move is called as soon as the referee's
+    message has been read, search_ended when the search has returned
+    or been given up on, and move_sent once the move has been written.
+    The timing of every move is logged.
+
+    """
+
+    def __init__(self, budget):
+        """
+        float -> TimeManager
+
+        Constructs a TimeManager allowing budget seconds per move.
+
+        """
+        self.budget = budget
+        self.latencies = []
+        self.moves = 0
+        self.received = None
+        self.deadline = None
+        self.searched = None
+
+    def reserve(self):
+        """
+        -> float
+
+        Returns the time kept back from each move for sending it.
+
+        """
+        if not self.latencies:
+            return MIN_RESERVE
+        return max(MIN_RESERVE, SAFETY_FACTOR * max(self.latencies))
+
+    def _record(self, latency):
+        """
+        float ->
+
+        Adds a measured latency.
+
+        """
+        self.latencies.append(latency)
+        del self.latencies[:-LATENCIES_KEPT]
+
+    def measure(self, function, *args):
+        """
+        (X ... -> Y) X ... -> Y
+
+        Calls function with the given arguments, such as io.send with
+        a message, and records how long it took as a latency.
+
+        """
+        start = time.monotonic()
+        result = function(*args)
+        self._record(time.monotonic() - start)
+        return result
+
+    async def measure_async(self, awaitable):
+        """
+        Awaitable(Y) -> Y
+
+        Awaits the given awaitable, such as RefereeStream.send with a
+        message, and records how long it took as a latency.
+
+        """
+        start = time.monotonic()
+        result = await awaitable
+        self._record(time.monotonic() - start)
+        return result
+
+    def start_move(self):
+        """
+        -> float
+
+        Starts timing a move whose message has just been received, and
+        returns the deadline for its search.
+
+        """
+        self.received = time.monotonic()
+        self.deadline = self.received + self.budget - self.reserve()
+        self.searched = None
+        return self.deadline
+
+    def search_ended(self):
+        """
+        ->
+
+        Records that the search for the current move has ended.
+
+        """
+        self.searched = time.monotonic()
+
+    def move_sent(self):
+        """
+        -> (float, float)
+
+        Records that the current move has been written, updates the
+        reserve and logs the timing of the move. Returns the seconds
+        spent searching and the seconds from the end of the search (or
+        its deadline, if that came first) to the move being written.
+
+        """
+        sent = time.monotonic()
+        stopped = min(self.searched or sent, self.deadline)
+        self._record(sent - stopped)
+        self.moves += 1
+
+        log.debug("move %d: searched %.1f ms, sent %.1f ms later, "
+                  "%.1f of %.1f ms used, reserve now %.1f ms" %
+                  (self.moves, 1000 * (stopped - self.received),
+                   1000 * (sent - stopped), 1000 * (sent - self.received),
+                   1000 * self.budget, 1000 * self.reserve()))
+        if sent - self.received > self.budget:
+            log.warning("move %d took %.1f ms, over the %.1f ms allowed" %
+                        (self.moves, 1000 * (sent - self.received),
+                         1000 * self.budget))
+        return (stopped - self.received, sent - stopped)
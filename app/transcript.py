@@ -0,0 +1,323 @@
+import struct
+import app.board_layout as board_layout
+from app.board import Board
+from app.message import InitMessage, MoveMessage, FlagMessage, WinningMessage
+from app.piece import Piece, Owner
+from app.rank import RANKS
+
+"""
+Compact binary transcripts of games, and replaying them.
+
+A transcript file holds any number of games, one after another, so
+that transcripts can be appended to a single file. Every game starts
+with MAGIC, so that the games after one whose transcript was cut short
+(when the player was stopped mid-game) can still be found. Each record
+is a tag byte followed by a fixed size payload:
+
+    INIT      our turn number, the time per move in milliseconds and
+              the number of our pieces, followed by the space index
+              and rank code of each piece; follows MAGIC
+    MOVE      a move from the referee: the space indices moved from
+              and to, the player who moved and the outcome
+    FLAG      the space index of a flag revealed by the referee
+    WINNING   the result of the game: 0 for no victory, or the winner
+    OUR_MOVE  a move we picked: the space indices moved from and to,
+              the seconds spent searching and the seconds from the end
+              of the search to the move having been written
+
+A Game rebuilds the Board at any ply from the referee's messages with
+Board.update, as play4500 does, without searching again.
+"""
+
+MAGIC = b"LZQT\x01"
+
+INIT, MOVE, FLAG, WINNING, OUR_MOVE = range(5)
+
+OUTCOMES = ["move", "win", "loss", "tie"]
+
+_TAG = struct.Struct("<B")
+_INIT = struct.Struct("<BIB")
+_PIECE = struct.Struct("<BB")
+_MOVE = struct.Struct("<BBBB")
+_FLAG = struct.Struct("<B")
+_WINNING = struct.Struct("<B")
+_OUR_MOVE = struct.Struct("<BBff")
+
+# Results of a WinningMessage, indexed by their encoding
+_RESULTS = ["No", "1", "2"]
+
+
+class Recorder:
+    """
+    Instance variables:
+    file  output
+    int   turn
+    int   time
+
+    Appends the transcript of a game to a file as it is played. turn
+    is our turn number (1 or 2) and time the time per move in
+    milliseconds, which are recorded with the InitMessage. Every record
+    is flushed as soon as it has been written, so the transcript
+    survives the player being stopped.
+
+    """
+
+    def __init__(self, path, turn, time):
+        """
+        str int int -> Recorder
+
+        Constructs a Recorder appending to the file at path, which is
+        created if it does not exist.
+
+        """
+        self.output = open(path, "ab")
+        self.turn = turn
+        self.time = time
+
+    def close(self):
+        """
+        ->
+
+        Closes the transcript file.
+
+        """
+        self.output.close()
+
+    def record(self, msg):
+        """
+        Message ->
+
+        Records an InitMessage, or a MoveMessage, FlagMessage or
+        WinningMessage received from the referee. Other messages are
+        not recorded.
+
+        """
+        if isinstance(msg, InitMessage):
+            pieces = msg.board.pieces_list
+            parts = [MAGIC, _TAG.pack(INIT),
+                     _INIT.pack(self.turn, self.time, len(pieces))]
+            for piece in pieces:
+                parts.append(_PIECE.pack(
+                    board_layout.index_of(piece.position),
+                    piece.get_rank().code))
+            self._write(b"".join(parts))
+        elif isinstance(msg, MoveMessage):
+            self._write(_TAG.pack(MOVE) + _MOVE.pack(
+                board_layout.index_of(msg.posfrom),
+                board_layout.index_of(msg.posto),
+                msg.player, OUTCOMES.index(msg.movetype)))
+        elif isinstance(msg, FlagMessage):
+            self._write(_TAG.pack(FLAG) +
+                        _FLAG.pack(board_layout.index_of(msg.pos)))
+        elif isinstance(msg, WinningMessage):
+            self._write(_TAG.pack(WINNING) +
+                        _WINNING.pack(_RESULTS.index(msg.result)))
+
+    def record_our_move(self, move, searched, latency):
+        """
+        Move float float ->
+
+        where Move is a tuple of positions (position_from, position_to)
+
+        Records a move we picked, the seconds spent searching for it
+        and the seconds from the end of the search to it being written.
+
+        """
+        (src, dest) = move
+        self._write(_TAG.pack(OUR_MOVE) + _OUR_MOVE.pack(
+            board_layout.index_of(src), board_layout.index_of(dest),
+            searched, latency))
+
+    def _write(self, record):
+        """
+        bytes ->
+
+        Appends a record to the transcript.
+
+        """
+        self.output.write(record)
+        self.output.flush()
+
+
+class Game:
+    """
+    Instance variables:
+    int                               turn
+    int                               time
+    list(Piece)                       pieces
+    list(Message)                     messages
+    list((int, Move, float, float))   our_moves
+    list(Board)                       _boards
+
+    A game read from a transcript. pieces holds our pieces as sent to
+    the referee and messages the MoveMessages, FlagMessages and
+    WinningMessage received from the referee, in order. our_moves
+    holds each move we picked with the ply at which it was picked,
+    the seconds spent searching and the seconds taken to write it.
+
+    A ply is one MoveMessage from the referee (which also reports our
+    own moves). _boards caches the Board at every ply, indexed by ply,
+    once board_at has been called.
+
+    """
+
+    def __init__(self, turn, time, pieces):
+        """
+        int int list(Piece) -> Game
+
+        Constructs a Game with no messages yet.
+
+        """
+        self.turn = turn
+        self.time = time
+        self.pieces = pieces
+        self.messages = []
+        self.our_moves = []
+        self._boards = []
+
+    def setup(self):
+        """
+        -> Board
+
+        Returns the Board holding our pieces as sent to the referee.
+        Boards are only built when needed, so that scanning many games
+        stays fast.
+
+        """
+        return Board(self.pieces)
+
+    def plies(self):
+        """
+        -> int
+
+        Returns the number of plies in this game.
+
+        """
+        return sum(isinstance(msg, MoveMessage) for msg in self.messages)
+
+    def result(self):
+        """
+        -> (str | None)
+
+        Returns the result of this game ("1", "2" or "No"), or None if
+        the transcript ends before the game did.
+
+        """
+        if self.messages and isinstance(self.messages[-1], WinningMessage):
+            return self.messages[-1].result
+        return None
+
+    def board_at(self, ply):
+        """
+        int -> Board
+
+        Returns the Board after the given number of plies, as it was
+        when play4500 received the last of them, including any flag
+        revealed before the next ply. Uses the current numeric backend.
+
+        """
+        if not self._boards:
+            board = self.setup().initialize_opponent_pieces().with_beliefs()
+            for msg in self.messages:
+                if isinstance(msg, MoveMessage):
+                    self._boards.append(board)
+                    board = board.update(msg)
+                elif isinstance(msg, FlagMessage):
+                    board = board.set_flag(msg.pos)
+            self._boards.append(board)
+        return self._boards[ply]
+
+
+def read_games(path):
+    """
+    str -> list(Game)
+
+    Returns every game in the transcript file at path (see decode).
+
+    """
+    with open(path, "rb") as fp:
+        return decode(fp.read())
+
+
+def decode(data):
+    """
+    bytes -> list(Game)
+
+    Returns every game in the given transcript. A game whose transcript
+    was cut short holds the records written before then, and decoding
+    carries on with the next game. Raises ValueError if data is not a
+    transcript.
+
+    """
+    if not data.startswith(MAGIC):
+        raise ValueError("Not a transcript")
+
+    games = []
+    for part in data.split(MAGIC)[1:]:
+        games.extend(_decode_games(part))
+    return games
+
+
+def _decode_games(data):
+    """
+    bytes -> list(Game)
+
+    Returns the games in a part of a transcript between two MAGICs.
+    Decoding stops at the first record that is cut short or cannot be
+    read, such as the start of a record that was never finished.
+
+    """
+    games = []
+    game = None
+    plies = 0
+    offset = 0
+    try:
+        while offset < len(data):
+            (tag,) = _TAG.unpack_from(data, offset)
+            offset += _TAG.size
+
+            if tag == INIT:
+                (turn, time, num_pieces) = _INIT.unpack_from(data, offset)
+                offset += _INIT.size
+                pieces = []
+                for i in range(num_pieces):
+                    (index, code) = _PIECE.unpack_from(data, offset)
+                    offset += _PIECE.size
+                    pieces.append(Piece(board_layout.position_of(index),
+                                        Owner.PLAYER, RANKS[code]))
+                game = Game(turn, time, pieces)
+                games.append(game)
+                plies = 0
+            elif game is None:
+                break
+            elif tag == MOVE:
+                (src, dest, player, outcome) = _MOVE.unpack_from(data, offset)
+                offset += _MOVE.size
+                game.messages.append(MoveMessage(
+                    board_layout.position_of(src),
+                    board_layout.position_of(dest),
+                    player, OUTCOMES[outcome]))
+                plies += 1
+            elif tag == FLAG:
+                (index,) = _FLAG.unpack_from(data, offset)
+                offset += _FLAG.size
+                game.messages.append(
+                    FlagMessage(board_layout.position_of(index)))
+            elif tag == WINNING:
+                (result,) = _WINNING.unpack_from(data, offset)
+                offset += _WINNING.size
+                game.messages.append(WinningMessage(_RESULTS[result]))
+            elif tag == OUR_MOVE:
+                (src, dest, searched, latency) = _OUR_MOVE.unpack_from(
+                    data, offset)
+                offset += _OUR_MOVE.size
+                game.our_moves.append(
+                    (plies, (board_layout.position_of(src),
+                             board_layout.position_of(dest)),
+                     searched, latency))
+            else:
+                break
+    except (struct.error, IndexError):
+        # The last record was cut short, or an index is out of range
+        pass
+    return games
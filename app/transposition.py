@@ -0,0 +1,143 @@
+"""
+A fixed-size transposition table for the search.
+
+Positions reached by different move orders have the same Zobrist key
+(see app.zobrist), so the result of searching one can be reused for
+the others. Entries are stored in buckets of two slots: the first
+keeps whichever entry was searched deepest, and the second is always
+replaced, so that deep results survive while recent ones are still
+kept.
+
+An Entry is a tuple (key, depth, value, bound, move) where bound is
+one of EXACT, LOWER or UPPER and move is the best Move found, or None.
+"""
+
+# The value stored is the exact value, or a lower or upper bound on it
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+# Default memory cap in megabytes
+DEFAULT_SIZE_MB = 16
+
+# Approximate memory used by one entry, including the list slot
+# holding it, in bytes
+ENTRY_BYTES = 200
+
+SLOTS_PER_BUCKET = 2
+DEPTH_PREFERRED = 0
+ALWAYS_REPLACE = 1
+
+
+class TranspositionTable:
+    """
+    Instance variables:
+    list(Entry | None) slots
+    int                buckets
+    int                filled
+    int                probes
+    int                hits
+    int                stores
+    int                collisions
+
+    Maps Zobrist keys to search results, using at most about size_mb
+    megabytes. probes and hits count lookups and the lookups that
+    found an entry for the same key; stores counts the entries stored
+    and collisions the stores that overwrote an entry for a different
+    key. Together with fill, they show whether the table is big enough
+    for the time allowed per move.
+
+    """
+
+    def __init__(self, size_mb=DEFAULT_SIZE_MB):
+        """
+        Number -> TranspositionTable
+
+        Constructs an empty table using at most about size_mb megabytes.
+
+        """
+        entries = int(size_mb * 2 ** 20) // ENTRY_BYTES
+        self.buckets = max(entries // SLOTS_PER_BUCKET, 1)
+        self.clear()
+
+    def clear(self):
+        """
+        ->
+
+        Removes every entry and resets the statistics.
+
+        """
+        self.slots = [None] * (self.buckets * SLOTS_PER_BUCKET)
+        self.filled = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.collisions = 0
+
+    def _bucket(self, key):
+        """
+        int -> int
+
+        Returns the index of the first slot of the bucket for key.
+
+        """
+        return (key % self.buckets) * SLOTS_PER_BUCKET
+
+    def probe(self, key):
+        """
+        int -> (Entry | None)
+
+        Returns the entry stored for key, or None if there is none.
+
+        """
+        self.probes += 1
+        i = self._bucket(key)
+        for entry in self.slots[i:i + SLOTS_PER_BUCKET]:
+            if entry is not None and entry[0] == key:
+                self.hits += 1
+                return entry
+        return None
+
+    def store(self, key, depth, value, bound, move):
+        """
+        int int Number int (Move | None) ->
+
+        Stores the result of searching the position with the given key
+        depth plies deep. The entry goes in the depth-preferred slot if
+        it was searched at least as deep as the entry there (or is for
+        the same key), and in the always-replace slot otherwise.
+
+        """
+        i = self._bucket(key)
+        preferred = self.slots[i + DEPTH_PREFERRED]
+        if (preferred is None or preferred[0] == key or
+                depth >= preferred[1]):
+            slot = i + DEPTH_PREFERRED
+        else:
+            slot = i + ALWAYS_REPLACE
+
+        old = self.slots[slot]
+        if old is None:
+            self.filled += 1
+        elif old[0] != key:
+            self.collisions += 1
+        self.slots[slot] = (key, depth, value, bound, move)
+        self.stores += 1
+
+    def fill(self):
+        """
+        -> float
+
+        Returns the fraction of slots holding an entry.
+
+        """
+        return self.filled / len(self.slots)
+
+    def hit_rate(self):
+        """
+        -> float
+
+        Returns the fraction of probes that found an entry.
+
+        """
+        return self.hits / max(self.probes, 1)
@@ -0,0 +1,75 @@
+import random
+import app.board_layout as board_layout
+from app.piece import Owner
+from app.rank import NUM_RANKS
+
+"""
+Zobrist keys for identifying board states.
+
+Every (space, owner, rank) combination is assigned a random 64-bit
+key, with an extra "hidden" rank for opponent pieces whose rank is not
+yet known. The key of a board is the xor of the keys of all of its
+pieces, so it can be updated in constant time whenever a single piece
+is added, removed or has its rank revealed.
+"""
+
+HIDDEN = NUM_RANKS
+
+# A fixed seed keeps keys identical between runs and processes
+_generator = random.Random(4500)
+_KEYS = [[[_generator.getrandbits(64) for rank in range(HIDDEN + 1)]
+          for owner in range(2)]
+         for space in range(board_layout.NUM_SPACES)]
+
+# Xored into a key when the opponent is the one to move
+OPPONENT_TO_MOVE = _generator.getrandbits(64)
+
+
+def piece_key(piece):
+    """
+    Piece -> int
+
+    Returns the key for the given piece at its current position.
+
+    """
+    return _KEYS[board_layout.index_of(piece.position)][piece.owner][
+        _code_of(piece)]
+
+
+def move_key(piece, dest):
+    """
+    Piece Position -> int
+
+    Returns the change in a board's key when the given piece moves to
+    dest, i.e. piece_key(piece) ^ piece_key(piece.move(dest)).
+
+    """
+    code = _code_of(piece)
+    return (_KEYS[board_layout.index_of(piece.position)][piece.owner][code] ^
+            _KEYS[board_layout.index_of(dest)][piece.owner][code])
+
+
+def _code_of(piece):
+    """
+    Piece -> int
+
+    Returns the rank code the key of the given piece uses.
+
+    """
+    rank = piece.known_rank()
+    if rank is None:
+        return HIDDEN
+    return rank.code
+
+
+def position_key(board, owner):
+    """
+    Board Owner -> int
+
+    Returns the key for the given board with owner to move, so that
+    the same pieces with different players to move have different keys.
+
+    """
+    if owner == Owner.OPPONENT:
+        return board.zobrist_key ^ OPPONENT_TO_MOVE
+    return board.zobrist_key
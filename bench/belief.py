@@ -0,0 +1,63 @@
+import timeit
+from app.board import Board
+from app.rank import Rank, RANKS
+
+"""
+Times BeliefMatrix.balance on the opponent's starting pieces, after a
+few reveals have made the rank counts disagree with the rows, and
+after landmines have been ruled out for all but one piece so that
+their count cannot be met.
+"""
+
+ITERATIONS = 500
+
+
+def revealed_board():
+    """
+    -> Board
+
+    Returns the opponent's starting board after several reveals.
+
+    """
+    board = Board().initialize_opponent_pieces().with_beliefs()
+    soldiers = [Rank(str(r)) for r in range(1, 10)]
+    for (position, ranks) in [((0, 6), soldiers[:7]),
+                              ((2, 6), soldiers[:7]),
+                              ((0, 10), [Rank('L')]),
+                              ((4, 7), soldiers[:4])]:
+        board = board.exclude_ranks(board.piece_at(position), ranks)
+    return board
+
+
+def infeasible_board():
+    """
+    -> Board
+
+    Returns the opponent's starting board with landmines ruled out for
+    all but one of the pieces that could be one.
+
+    """
+    board = Board().initialize_opponent_pieces().with_beliefs()
+    landmine = Rank('L')
+    pieces = [p for p in board.pieces_list if p.probability(landmine) > 0]
+    for piece in pieces[1:]:
+        board = board.exclude_ranks(board.piece_at(piece.position),
+                                    [landmine])
+    return board
+
+
+def main():
+    for (name, board) in [
+            ("start", Board().initialize_opponent_pieces().with_beliefs()),
+            ("revealed", revealed_board()),
+            ("infeasible", infeasible_board())]:
+        beliefs = board.beliefs
+        seconds = timeit.timeit(beliefs.balance, number=ITERATIONS)
+        worst = max(abs(sum(beliefs.balance().column(r)) - c)
+                    for (r, c) in zip(RANKS, beliefs.counts))
+        print("belief balance %-10s %8.1f us/call (max count error %.3f)" %
+              (name, 1e6 * seconds / ITERATIONS, worst))
+
+
+if __name__ == "__main__":
+    main()
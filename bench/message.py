@@ -0,0 +1,86 @@
+import re
+import timeit
+import app.message as message
+
+"""
+Compares message.deserialize with the implementation it replaced,
+which searched for every regex in message.RE_MAP in turn without
+compiling them, on the messages used by test/message.py.
+"""
+
+ITERATIONS = 2000
+
+# The messages of test/message.py, valid and invalid
+CASES = ["Invalid Board Setup",
+         "Invalid Board Move Piece not movable",
+         "Invalid Board Move No Piece",
+         "Invalid Board Move From To Invalid",
+         "Invalid Board Move Location Invalid",
+         "A1 A1 1 move",
+         "A2 E3 2 win",
+         "Z1 A2 1 move",
+         "A1 F2 1 move",
+         "F A2",
+         "F E13",
+         "1 Victory",
+         "No Victory"]
+
+
+def legacy_deserialize(packet):
+    """
+    str -> Message
+
+    The replaced implementation of message.deserialize.
+
+    """
+    p = packet.strip()
+    for rx in message.RE_MAP:
+        match = re.search(rx, p)
+        if match:
+            return message.RE_MAP[rx](match)
+    if len(p) == 0:
+        return message.EmptyMessage()
+
+    raise message.BadMessageException(
+        "Invalid Message from the Ref: %s" % (packet))
+
+
+def parse_all(deserialize):
+    """
+    (str -> Message) -> list(Message | None)
+
+    Deserializes every case, with None for invalid messages.
+
+    """
+    results = []
+    for case in CASES:
+        try:
+            results.append(deserialize(case + "\n"))
+        except message.BadMessageException:
+            results.append(None)
+    return results
+
+
+def main():
+    legacy = parse_all(legacy_deserialize)
+    current = parse_all(message.deserialize)
+    assert [type(m) for m in legacy] == [type(m) for m in current]
+    assert all(a == b for (a, b) in zip(legacy, current) if a is not None)
+
+    for (name, deserialize) in [("legacy", legacy_deserialize),
+                                ("compiled", message.deserialize)]:
+        seconds = timeit.timeit(lambda: parse_all(deserialize),
+                                number=ITERATIONS)
+        print("deserialize %-8s %5.2f us/message" %
+              (name, 1e6 * seconds / (ITERATIONS * len(CASES))))
+
+    lines = [case + "\n" for (case, m) in zip(CASES, current)
+             if m is not None]
+    seconds = timeit.timeit(lambda: message.deserialize_many(lines),
+                            number=ITERATIONS)
+    print("deserialize_many  %5.2f us/message" %
+          (1e6 * seconds / (ITERATIONS * len(lines))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import statistics
+import timeit
+import app.bitboard as bitboard
+import app.board_layout as board_layout
+import app.board_parser as board_parser
+from app.piece import Owner
+
+"""
+Compares the bitboard generator of adjacent moves against the previous
+generator, which checked every adjacent space with
+Board.is_space_blocked_for, and times Board.iterate_all_moves
+including railroad moves. Each timing is the median of several runs,
+and the speedup is the median ratio of runs timed back to back.
+"""
+
+REPEATS = 500
+RUNS = 15
+
+
+def median_time(function):
+    """
+    (->) -> float
+
+    Returns the median number of seconds a call to function takes.
+
+    """
+    return statistics.median(
+        timeit.repeat(function, number=REPEATS, repeat=RUNS)) / REPEATS
+
+
+def filter_all_moves(board, owner):
+    """
+    Board Owner -> iter((Position, Position))
+
+    The move generator Board used before bitboards were introduced.
+
+    """
+    for piece in board.iterate_pieces(owner):
+        if piece.is_stationary():
+            continue
+        i = board_layout.iterate_adjacent(piece.position)
+        i = filter(lambda m: not board.is_space_blocked_for(m, piece.owner),
+                   i)
+        for move in i:
+            yield (piece.position, move)
+
+
+def bitboard_step_moves(board, owner):
+    """
+    Board Owner -> iter((Position, Position))
+
+    The bitboard generator of moves to adjacent spaces.
+
+    """
+    for piece in board.iterate_pieces(owner):
+        if piece.is_stationary():
+            continue
+        for move in bitboard.iterate_positions(board.step_mask_for(piece)):
+            yield (piece.position, move)
+
+
+def iterate_all_moves(board, owner):
+    """
+    Board Owner -> iter((Position, Position))
+
+    The full move generator, including railroad moves.
+
+    """
+    return board.iterate_all_moves(owner)
+
+
+def main():
+    board = board_parser.parse_board().initialize_opponent_pieces()
+    assert (set(filter_all_moves(board, Owner.PLAYER)) ==
+            set(bitboard_step_moves(board, Owner.PLAYER)))
+
+    for name, generate in [("filter", filter_all_moves),
+                           ("bitboard", bitboard_step_moves),
+                           ("railroad", iterate_all_moves)]:
+        seconds = median_time(lambda: list(generate(board, Owner.PLAYER)))
+        print("movegen %-8s %8.1f us/call" % (name, 1e6 * seconds))
+
+    # Timing the two generators back to back in each run exposes both
+    # to the same load, so the ratio is steadier than the times
+    ratios = []
+    for _ in range(RUNS):
+        filtered = timeit.timeit(
+            lambda: list(filter_all_moves(board, Owner.PLAYER)),
+            number=REPEATS)
+        masked = timeit.timeit(
+            lambda: list(bitboard_step_moves(board, Owner.PLAYER)),
+            number=REPEATS)
+        ratios.append(filtered / masked)
+    print("bitboard speedup over filter %.2fx (runs %.2fx to %.2fx)" %
+          (statistics.median(ratios), min(ratios), max(ratios)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import timeit
+import app.board_parser as board_parser
+import app.numeric as numeric
+import app.strategy as strategy
+from app.piece import Owner
+from app.rank import Rank
+
+"""
+Compares the exact (Fraction) and float numeric backends on a mid-game
+board, timing the work done for each move decision: generating every
+move, scoring it with strategy.action_value and computing the expected
+outcome of every possible attack.
+"""
+
+ITERATIONS = 20
+
+
+def mid_game_board():
+    """
+    -> Board
+
+    Returns a board where several opponent ranks have been narrowed
+    down, as happens after a few attacks.
+
+    """
+    board = board_parser.parse_board().initialize_opponent_pieces()
+    soldiers = [Rank(str(r)) for r in range(1, 10)]
+    for (position, ranks) in [((0, 6), soldiers[:5]),
+                              ((2, 6), soldiers[:3]),
+                              ((4, 6), [Rank('L')]),
+                              ((1, 11), [Rank('L'), Rank('B')]),
+                              ((0, 10), soldiers[5:])]:
+        board = board.exclude_ranks(board.piece_at(position), ranks)
+    return board
+
+
+def decide(board):
+    """
+    Board ->
+
+    Does the probability work needed to pick a move.
+
+    """
+    for (src, dest) in board.iterate_all_moves(Owner.PLAYER):
+        strategy.action_value(board, src, dest)
+    for player_piece in board.iterate_pieces(Owner.PLAYER):
+        for opponent_piece in board.iterate_pieces(Owner.OPPONENT):
+            player_piece.expected_attack_outcome(opponent_piece)
+
+
+def main():
+    board = mid_game_board()
+    for backend in numeric.BACKENDS:
+        numeric.set_backend(backend)
+        seconds = timeit.timeit(lambda: decide(board), number=ITERATIONS)
+        print("numeric %-6s %8.2f ms/decision" %
+              (backend, 1000 * seconds / ITERATIONS))
+    numeric.set_backend(numeric.EXACT)
+
+
+if __name__ == "__main__":
+    main()
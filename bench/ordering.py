@@ -0,0 +1,32 @@
+import time
+import app.board_parser as board_parser
+import app.numeric as numeric
+from app.search import ExpectimaxEngine
+
+"""
+Compares fixed depth searches of the starting board with and without
+move ordering, reporting the nodes searched and the cutoffs found.
+"""
+
+DEPTH = 3
+
+
+def main():
+    numeric.set_backend(numeric.FLOAT)
+    board = board_parser.parse_board().initialize_opponent_pieces()
+
+    for ordering in [False, True]:
+        engine = ExpectimaxEngine(max_depth=DEPTH, ordering=ordering)
+        start = time.monotonic()
+        engine.search(board, start + 600)
+        seconds = time.monotonic() - start
+        print("ordering %-5s depth %d: %7d nodes, %6d cutoffs "
+              "(%5.1f%% on first move) in %.2f s" %
+              (ordering, engine.depth, engine.nodes, engine.cutoffs,
+               100 * engine.first_move_cutoffs / max(engine.cutoffs, 1),
+               seconds))
+    numeric.set_backend(numeric.EXACT)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import random
+import time
+import app.board_parser as board_parser
+import app.numeric as numeric
+
+"""
+Measures how many rank assignments per second Board.sample_ranks
+draws for the opponent's starting pieces, and how long building the
+sampler takes before the first sample.
+"""
+
+SAMPLES = 20000
+
+
+def main():
+    numeric.set_backend(numeric.FLOAT)
+    board = board_parser.parse_board().initialize_opponent_pieces()
+
+    for (name, b) in [("distributions", board),
+                      ("beliefs", board.with_beliefs())]:
+        generator = random.Random(4500)
+        start = time.monotonic()
+        sampler = b.rank_sampler()
+        built = time.monotonic() - start
+
+        start = time.monotonic()
+        sampler.sample_many(SAMPLES, generator)
+        seconds = time.monotonic() - start
+        print("%-13s: sampler built in %.2f ms, %8.0f samples/s" %
+              (name, 1000 * built, SAMPLES / seconds))
+    numeric.set_backend(numeric.EXACT)
+
+
+if __name__ == "__main__":
+    main()
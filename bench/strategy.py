@@ -0,0 +1,55 @@
+import random
+import statistics
+import timeit
+import app.board_parser as board_parser
+import app.numeric as numeric
+import app.strategy as strategy
+from app.piece import Owner
+
+"""
+Compares rating every player move one at a time with
+strategy.action_value and all at once with strategy.score_moves, on
+the starting board (where every move is quiet) and on a board with
+attacks, and times strategy.evaluate. Each timing is the median of
+several runs.
+"""
+
+REPEATS = 200
+RUNS = 7
+
+
+def median_time(function):
+    """
+    (->) -> float
+
+    Returns the median number of seconds a call to function takes.
+
+    """
+    return statistics.median(
+        timeit.repeat(function, number=REPEATS, repeat=RUNS)) / REPEATS
+
+
+def main():
+    numeric.set_backend(numeric.FLOAT)
+    start_board = board_parser.parse_board().initialize_opponent_pieces()
+    # Removing two pieces opens up attacks, as in test/strategy.py
+    attack_board = start_board.remove_piece((0, 0)).remove_piece((2, 5))
+
+    for (name, board) in [("start", start_board),
+                          ("attacks", attack_board)]:
+        moves = list(board.iterate_all_moves(Owner.PLAYER))
+        random.seed(4500)
+        single = median_time(lambda: [strategy.action_value(board, src, dest)
+                                      for (src, dest) in moves])
+        random.seed(4500)
+        batched = median_time(lambda: strategy.score_moves(board, moves))
+        print("%-8s %d moves: action_value %.0f us, score_moves %.0f us" %
+              (name, len(moves), 1e6 * single, 1e6 * batched))
+
+    print("evaluate %.1f us" %
+          (1e6 * median_time(lambda: strategy.evaluate(start_board))))
+    numeric.set_backend(numeric.EXACT)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import os
+import random
+import tempfile
+import time
+import app.board_layout as board_layout
+import app.board_parser as board_parser
+import app.transcript as transcript
+from app.message import InitMessage, MoveMessage, WinningMessage
+
+"""
+Measures the size of game transcripts and how quickly a file holding
+many of them can be scanned. The games are made of random moves, which
+the transcript does not check.
+"""
+
+GAMES = 1000
+PLIES = 200
+
+
+def random_position():
+    """
+    -> Position
+
+    Returns a random position on the board.
+
+    """
+    return board_layout.position_of(random.randrange(board_layout.NUM_SPACES))
+
+
+def main():
+    random.seed(4500)
+    init_msg = InitMessage(board_parser.parse_board())
+    (fd, path) = tempfile.mkstemp()
+    os.close(fd)
+    os.remove(path)
+
+    recorder = transcript.Recorder(path, 1, 1000)
+    start = time.monotonic()
+    for game in range(GAMES):
+        recorder.record(init_msg)
+        for ply in range(PLIES):
+            move = (random_position(), random_position())
+            if ply % 2 == 0:
+                recorder.record_our_move(move, 0.9, 0.002)
+            recorder.record(MoveMessage(
+                move[0], move[1], 1 + ply % 2,
+                random.choice(transcript.OUTCOMES)))
+        recorder.record(WinningMessage("1"))
+    recorder.close()
+    recorded = time.monotonic() - start
+
+    start = time.monotonic()
+    games = transcript.read_games(path)
+    scanned = time.monotonic() - start
+    assert len(games) == GAMES
+
+    print("%d games of %d plies: %.0f bytes/game, recorded in %.1f us/ply, "
+          "scanned at %.0f games/s" %
+          (GAMES, PLIES, os.path.getsize(path) / GAMES,
+           1e6 * recorded / (GAMES * PLIES), GAMES / scanned))
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
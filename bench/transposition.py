@@ -0,0 +1,36 @@
+import time
+import app.board_parser as board_parser
+import app.numeric as numeric
+from app.search import ExpectimaxEngine
+
+"""
+Compares fixed depth searches of the starting board with transposition
+tables of different sizes, reporting the nodes searched along with the
+table's hit rate, collisions and fill.
+"""
+
+DEPTH = 3
+SIZES_MB = [0, 1, 16]
+
+
+def main():
+    numeric.set_backend(numeric.FLOAT)
+    board = board_parser.parse_board().initialize_opponent_pieces()
+
+    for size_mb in SIZES_MB:
+        engine = ExpectimaxEngine(max_depth=DEPTH, table_mb=size_mb)
+        start = time.monotonic()
+        engine.search(board, start + 600)
+        seconds = time.monotonic() - start
+        line = ("table %2d MB depth %d: %7d nodes in %.2f s" %
+                (size_mb, engine.depth, engine.nodes, seconds))
+        if engine.table is not None:
+            line += (", %5.1f%% hits, %6d collisions, %5.1f%% full" %
+                     (100 * engine.table.hit_rate(), engine.table.collisions,
+                      100 * engine.table.fill()))
+        print(line)
+    numeric.set_backend(numeric.EXACT)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import math
+import unittest
+import app.belief as belief
+from app.board import Board, Owner
+from app.piece import Piece
+from app.rank import Rank, RANKS, INITIAL_RANK_COUNTS
+from app.message import MoveMessage
+
+
+board = Board().initialize_opponent_pieces().with_beliefs()
+player = Piece((0, 5), Owner.PLAYER, Rank('5'))
+
+
+class TestBeliefMatrix(unittest.TestCase):
+    def test_rows_sum_to_one(self):
+        for row in board.beliefs.rows.values():
+            self.assertAlmostEqual(sum(row), 1.0)
+
+    def test_initial_rows_match_pieces(self):
+        row = board.beliefs.row((1, 11))
+        self.assertAlmostEqual(row[Rank('F').code], 1 / 2)
+        self.assertAlmostEqual(row[Rank('L').code], 1 / 6)
+
+    def test_column(self):
+        flags = board.beliefs.column(Rank('F'))
+        self.assertEqual(len(flags), 25)
+        self.assertAlmostEqual(sum(flags), 1.0)
+        positions = board.beliefs.positions()
+        self.assertAlmostEqual(flags[positions.index((3, 11))], 0.5)
+
+    def test_exclude_ranks(self):
+        piece = board.piece_at((0, 6))
+        b = board.exclude_ranks(piece, {Rank(str(r)) for r in range(1, 7)})
+        row = b.beliefs.row((0, 6))
+        self.assertEqual(row[Rank('1').code], 0)
+        self.assertAlmostEqual(row[Rank('7').code], 1 / 2)
+        self.assertAlmostEqual(row[Rank('9').code], 1 / 4)
+        self.assertAlmostEqual(board.beliefs.row((0, 6))[Rank('1').code],
+                               3 / 19)
+
+    def test_set_flag(self):
+        row = board.set_flag((1, 11)).beliefs.row((1, 11))
+        self.assertEqual(row[Rank('F').code], 1.0)
+        self.assertEqual(sum(row), 1.0)
+
+    def test_update_from_attack(self):
+        b = board.place_piece(player).update(
+            MoveMessage((0, 6), (0, 5), 2, "win"))
+        row = b.beliefs.row((0, 5))
+        for r in "12345":
+            self.assertEqual(row[Rank(r).code], 0)
+        self.assertAlmostEqual(sum(row), 1.0)
+        self.assertFalse((0, 6) in b.beliefs.rows)
+
+    def test_removed_pieces_leave_beliefs(self):
+        b = board.place_piece(player).update(
+            MoveMessage((0, 5), (0, 6), 1, "tie"))
+        self.assertFalse((0, 6) in b.beliefs.rows)
+        self.assertEqual(len(b.beliefs.rows), 24)
+
+    def test_balanced_columns_match_rank_counts(self):
+        columns = [sum(board.beliefs.column(r)) for r in RANKS]
+        for (rank, total) in zip(RANKS, columns):
+            self.assertAlmostEqual(total, INITIAL_RANK_COUNTS[rank], places=2)
+
+    def test_balance_converges_after_reveals(self):
+        b = board
+        for (position, ranks) in [((0, 6), "1234567"), ((2, 6), "1234567"),
+                                  ((0, 10), "L"), ((4, 7), "1234")]:
+            b = b.exclude_ranks(b.piece_at(position),
+                                {Rank(r) for r in ranks})
+        beliefs = b.beliefs.balance()
+        for (rank, count) in zip(RANKS, beliefs.counts):
+            self.assertLess(abs(sum(beliefs.column(rank)) - count),
+                            belief.BALANCE_TOLERANCE)
+
+    def test_balance_caps_counts_that_cannot_be_met(self):
+        b = board
+        landmine = Rank('L')
+        pieces = [p for p in b.pieces_list if p.probability(landmine) > 0]
+        for piece in pieces[1:]:
+            b = b.exclude_ranks(b.piece_at(piece.position), {landmine})
+        beliefs = b.beliefs.balance()
+        for row in beliefs.rows.values():
+            self.assertTrue(all(math.isfinite(p) for p in row))
+            self.assertAlmostEqual(sum(row), 1.0)
+        self.assertAlmostEqual(sum(beliefs.column(landmine)), 1.0)
+
+    def test_balance_keeps_excluded_ranks_excluded(self):
+        b = board.place_piece(player).update(
+            MoveMessage((0, 5), (0, 6), 1, "loss"))
+        row = b.beliefs.row((0, 6))
+        for r in "12345B":
+            self.assertEqual(row[Rank(r).code], 0)
+        self.assertAlmostEqual(sum(row), 1.0)
+
+    def test_capture_removes_expected_counts(self):
+        piece = board.piece_at((0, 6))
+        b = board.exclude_ranks(piece, set(piece.ranks()) - {Rank('9')})
+        b = b.place_piece(player).update(
+            MoveMessage((0, 6), (0, 5), 2, "win")).update(
+            MoveMessage((0, 5), (1, 5), 2, "move"))
+        self.assertAlmostEqual(b.beliefs.counts[Rank('5').code], 2)
+        beliefs = b.remove_piece((1, 5)).beliefs
+        self.assertAlmostEqual(beliefs.counts[Rank('9').code], 0)
+        self.assertEqual(sum(beliefs.balance().column(Rank('9'))), 0)
+
+    def test_belief_pieces_use_rows(self):
+        b = board.exclude_ranks(board.piece_at((0, 6)), {Rank('9')})
+        pieces = b.with_belief_pieces()
+        for position in b.beliefs.positions():
+            self.assertEqual(pieces.piece_at(position).distribution(),
+                             b.beliefs.row(position))
+        self.assertEqual(pieces.material, Board(pieces.pieces_list).material)
+
+    def test_rank_distribution(self):
+        self.assertEqual(board.rank_distribution((0, 6)),
+                         board.beliefs.row((0, 6)))
+        self.assertEqual(Board().place_piece(player).rank_distribution(
+            (0, 5))[Rank('5').code], 1)
+
+if __name__ == '__main__':
+    unittest.main()
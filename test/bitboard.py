@@ -0,0 +1,91 @@
+import unittest
+import random
+import app.bitboard as bitboard
+import app.board_layout as layout
+from app.board import Board, Owner
+from app.piece import Piece
+from app.position import Position
+from app.rank import Rank
+
+
+def reference_moves(board, owner):
+    """
+    Board Owner -> set((Position, Position))
+
+    Generates moves by checking every adjacent space individually.
+
+    """
+    moves = set()
+    for piece in board.iterate_pieces(owner):
+        if piece.is_stationary():
+            continue
+        for m in layout.iterate_adjacent(piece.position):
+            if not board.is_space_blocked_for(m, owner):
+                moves.add((piece.position, m))
+    return moves
+
+
+def random_board(rng):
+    """
+    Random -> Board
+
+    Returns a board with pieces of random ranks and owners.
+
+    """
+    board = Board()
+    for i in rng.sample(range(layout.NUM_SPACES), 30):
+        rank = Rank(rng.choice("123456789BLF"))
+        owner = rng.choice([Owner.PLAYER, Owner.OPPONENT])
+        board = board.place_piece(Piece(layout.position_of(i), owner, rank))
+    return board
+
+
+class TestBitboard(unittest.TestCase):
+    def test_bit_and_iterate_positions(self):
+        mask = bitboard.bit(Position(0, 1)) | bitboard.bit(Position(4, 11))
+        self.assertEqual(list(bitboard.iterate_positions(mask)),
+                         [(0, 1), (4, 11)])
+
+    def test_adjacent_masks_match_layout(self):
+        for i in range(layout.NUM_SPACES):
+            p = layout.position_of(i)
+            self.assertEqual(
+                set(bitboard.iterate_positions(bitboard.ADJACENT_MASKS[i])),
+                set(layout.iterate_adjacent(p)))
+
+    def test_camp_mask(self):
+        self.assertEqual(len(list(bitboard.iterate_positions(
+            bitboard.CAMP_MASK))), 10)
+
+    def test_step_moves_match_reference_generator(self):
+        rng = random.Random(0)
+        for n in range(50):
+            board = random_board(rng)
+            for owner in [Owner.PLAYER, Owner.OPPONENT]:
+                moves = set()
+                for piece in board.iterate_pieces(owner):
+                    if not piece.is_stationary():
+                        moves.update(
+                            (piece.position, m)
+                            for m in bitboard.iterate_positions(
+                                board.step_mask_for(piece)))
+                self.assertEqual(moves, reference_moves(board, owner))
+
+    def test_all_moves_visit_every_piece_that_can_move(self):
+        rng = random.Random(1)
+        for n in range(50):
+            board = random_board(rng)
+            for owner in [Owner.PLAYER, Owner.OPPONENT]:
+                moves = set()
+                for piece in board.iterate_pieces(owner):
+                    moves.update((piece.position, m)
+                                 for m in board.iterate_moves_for_piece(piece))
+                self.assertEqual(set(board.iterate_all_moves(owner)), moves)
+
+    def test_iterate_indices(self):
+        mask = bitboard.bit(Position(0, 1)) | bitboard.bit(Position(4, 11))
+        self.assertEqual(list(bitboard.iterate_indices(mask)),
+                         [layout.index_of((0, 1)), layout.index_of((4, 11))])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 import unittest
 from app.board import Board, Owner, PieceNotFoundException
 from app.piece import Piece
-from app.rank import Rank
+from app.rank import Rank, RANK_WORTH
 from app.message import *
 from fractions import Fraction
 
@@ -35,6 +35,12 @@ class TestBoard(unittest.TestCase):
         self.assertTrue(isinstance(b.piece_at((0, 1)), Piece))
         self.assertEqual(b.piece_at((0, 0)), None)
 
+    def test_move_piece_keeps_original_board(self):
+        b = Board().place_piece(p2)
+        b.move_piece((0, 0), (0, 1))
+        self.assertEqual(b.piece_at((0, 0)), p2)
+        self.assertEqual(b.piece_at((0, 1)), None)
+
     def test_move_piece_nonexistant(self):
         p = Piece((0, 0), Owner.PLAYER, Rank('1'))
         b = Board().place_piece(p).move_piece((0, 0), (0, 1))
@@ -82,10 +88,31 @@ class TestBoard(unittest.TestCase):
 
     def test_iterate_moves_for_piece_forbids_attacking_in_camp(self):
         b = Board().place_piece(p1).place_piece(opponent)
-        self.assertEqual(len(list(b.iterate_moves_for_piece(p1))), 3)
+        # A1 plus the 31 other railroad spaces the engineer can reach
+        self.assertEqual(len(list(b.iterate_moves_for_piece(p1))), 32)
         self.assertFalse((1, 2) in list(b.iterate_moves_for_piece(p1)))
         self.assertTrue((0, 1) in list(b.iterate_moves_for_piece(opponent)))
 
+    def test_iterate_moves_for_piece_slides_along_railroad(self):
+        p = Piece((0, 5), Owner.PLAYER, Rank('4'))
+        blocker = Piece((0, 2), Owner.PLAYER, Rank('5'))
+        target = Piece((0, 9), Owner.OPPONENT, Rank('5'))
+        b = Board().place_piece(p).place_piece(blocker).place_piece(target)
+        moves = set(b.iterate_moves_for_piece(p))
+
+        self.assertEqual(moves, {(0, 3), (0, 4), (0, 6), (0, 7), (0, 8),
+                                 (0, 9), (1, 5), (2, 5), (3, 5), (4, 5),
+                                 (1, 4)})
+
+    def test_iterate_moves_for_piece_engineer_turns_corners(self):
+        p = Piece((0, 5), Owner.PLAYER, Rank('1'))
+        b = Board().place_piece(p)
+        moves = set(b.iterate_moves_for_piece(p))
+
+        self.assertTrue((4, 10) in moves)
+        self.assertTrue((2, 1) in moves)
+        self.assertFalse((2, 2) in moves)
+
     def test_iterate_all_moves_with_one_piece(self):
         b = Board().place_piece(p2)
 
@@ -140,5 +167,50 @@ class TestBoard(unittest.TestCase):
         self.assertEqual(flag.probability(Rank('L')), Fraction('0'))
         self.assertEqual(flag.probability(Rank('F')), Fraction('1'))
 
+    def assert_tallies_match_pieces(self, b):
+        fresh = Board(b.pieces_list)
+        self.assertEqual(b.rank_counts, fresh.rank_counts)
+        self.assertEqual(b.material, fresh.material)
+        self.assertEqual(b.movable, fresh.movable)
+        self.assertEqual(b.mobile, fresh.mobile)
+        self.assertAlmostEqual(b.placement, fresh.placement)
+
+    def test_tallies(self):
+        b = Board().place_piece(p1).place_piece(p2).place_piece(opponent)
+        self.assertEqual(b.rank_counts[Owner.PLAYER][Rank('1').code], 1)
+        self.assertEqual(b.rank_counts[Owner.PLAYER][Rank('4').code], 1)
+        self.assertEqual(b.material, [6, 8])
+        self.assertEqual(b.movable, [2, 1])
+
+    def test_tallies_of_opponent_are_expected_values(self):
+        b = opponent_board
+        self.assertEqual(b.rank_counts[Owner.OPPONENT][Rank('F').code], 1)
+        self.assertEqual(sum(b.rank_counts[Owner.OPPONENT]), 25)
+        self.assertEqual(b.material[Owner.OPPONENT], sum(
+            piece.probability(rank) * RANK_WORTH[rank]
+            for piece in b.pieces_list for rank in RANK_WORTH))
+
+    def test_tallies_follow_changes(self):
+        b = opponent_board.place_piece(p2)
+        self.assert_tallies_match_pieces(b.move_piece((0, 0), (0, 1)))
+        self.assert_tallies_match_pieces(b.remove_piece((1, 11)))
+        self.assert_tallies_match_pieces(b.set_flag((1, 11)))
+        self.assert_tallies_match_pieces(
+            b.exclude_ranks(b.piece_at((0, 6)), {Rank('9'), Rank('B')}))
+        self.assertEqual(b.movable, [1, 23])
+
+    def test_tallies_of_original_board_are_kept(self):
+        b = opponent_board.place_piece(p2)
+        counts = [list(c) for c in b.rank_counts]
+        b.remove_piece((0, 0)).exclude_ranks(b.piece_at((0, 6)), {Rank('9')})
+        self.assertEqual(b.rank_counts, counts)
+
+    def test_moving_into_headquarters_stops_piece(self):
+        b = Board().place_piece(Piece((1, 1), Owner.PLAYER, Rank('4')))
+        self.assertEqual(b.movable, [1, 0])
+        b = b.move_piece((1, 1), (1, 0))
+        self.assertEqual(b.movable, [0, 0])
+        self.assert_tallies_match_pieces(b)
+
 if __name__ == '__main__':
     unittest.main()
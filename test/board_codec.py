@@ -0,0 +1,50 @@
+import unittest
+import pickle
+from app.board import Owner
+from app.rank import Rank
+import app.board_codec as board_codec
+import app.board_parser as board_parser
+
+
+start_board = board_parser.parse_board().initialize_opponent_pieces()
+
+
+class TestBoardCodec(unittest.TestCase):
+    def assert_same_board(self, b1, b2):
+        self.assertEqual(b1.pieces_list, b2.pieces_list)
+        self.assertEqual(b1.zobrist_key, b2.zobrist_key)
+        for (p1, p2) in zip(b1.pieces_list, b2.pieces_list):
+            self.assertEqual(p1.prob_numerators, p2.prob_numerators)
+            self.assertEqual(p1.prob_denominators, p2.prob_denominators)
+
+    def test_round_trip(self):
+        decoded = board_codec.decode(board_codec.encode(start_board))
+        self.assert_same_board(decoded, start_board)
+        self.assertEqual(decoded.beliefs, None)
+
+    def test_round_trip_with_beliefs(self):
+        b = start_board.with_beliefs().set_flag((1, 11))
+        b = b.exclude_ranks(b.piece_at((0, 6)), {Rank('9')})
+        decoded = board_codec.decode(board_codec.encode(b))
+        self.assert_same_board(decoded, b)
+        self.assertEqual(decoded.beliefs.rows, b.beliefs.rows)
+        self.assertEqual(decoded.beliefs.counts, b.beliefs.counts)
+
+    def test_known_pieces_share_dictionaries(self):
+        decoded = board_codec.decode(board_codec.encode(start_board))
+        player = next(decoded.iterate_pieces(Owner.PLAYER))
+        original = start_board.piece_at(player.position)
+        self.assertIs(player.prob_numerators, original.prob_numerators)
+
+    def test_encoding_is_compact(self):
+        b = start_board.with_beliefs()
+        self.assertTrue(len(board_codec.encode(b)) < len(pickle.dumps(b)))
+
+    def test_moves_round_trip(self):
+        moves = list(start_board.iterate_all_moves(Owner.PLAYER))
+        data = board_codec.encode_moves(moves)
+        self.assertEqual(len(data), 2 * len(moves))
+        self.assertEqual(board_codec.decode_moves(data), moves)
+
+if __name__ == '__main__':
+    unittest.main()
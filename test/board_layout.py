@@ -25,6 +25,12 @@ class TestBoardLayout(unittest.TestCase):
         self.assertEqual(len(list(layout.iterate_adjacent(Position(1, 2)))), 8)
         self.assertEqual(len(list(layout.iterate_adjacent(Position(2, 5)))), 6)
 
+    def test_index_of_and_position_of_round_trip(self):
+        self.assertEqual(layout.index_of(Position(0, 0)), 0)
+        self.assertEqual(layout.index_of(Position(4, 11)), 59)
+        for i in range(layout.NUM_SPACES):
+            self.assertEqual(layout.index_of(layout.position_of(i)), i)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+import random
+import time
+from app.board import Board, Owner
+from app.piece import Piece
+from app.rank import Rank, RANKS
+from app.mcts import ISMCTSEngine, determinize
+import app.board_parser as board_parser
+
+
+start_board = board_parser.parse_board().initialize_opponent_pieces()
+flag = Piece((1, 0), Owner.PLAYER, Rank('F'))
+marshal = Piece((2, 5), Owner.PLAYER, Rank('9'))
+
+
+class TestISMCTS(unittest.TestCase):
+    def test_determinize(self):
+        (positions, assignment) = start_board.sample_ranks(random.Random(2))
+        b = determinize(start_board, positions, assignment)
+        for (position, code) in zip(positions, assignment):
+            self.assertEqual(b.piece_at(position).known_rank(), RANKS[code])
+        self.assertEqual(len(b.pieces_list), len(start_board.pieces_list))
+
+    def test_captures_flag(self):
+        enemy_flag = Piece((1, 11), Owner.OPPONENT, Rank('F'))
+        scout = Piece((1, 10), Owner.PLAYER, Rank('3'))
+        b = Board().place_piece(flag).place_piece(scout)
+        b = b.place_piece(enemy_flag)
+        b = b.place_piece(Piece((4, 6), Owner.OPPONENT, Rank('9')))
+        engine = ISMCTSEngine(seed=3)
+        self.assertEqual(engine.search(b, time.monotonic() + 0.5),
+                         ((1, 10), (1, 11)))
+        self.assertTrue(engine.iterations > 0)
+
+    def test_has_move_when_out_of_time(self):
+        engine = ISMCTSEngine(seed=4)
+        move = engine.search(start_board, time.monotonic())
+        self.assertTrue(move in
+                        list(start_board.iterate_all_moves(Owner.PLAYER)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -95,6 +95,31 @@ class TestMessage(unittest.TestCase):
         d2 = WinningMessage("No")
         self.assertEqual(d1, d2)
 
+    def testDeserializeEmpty(self):
+        self.assertTrue(isinstance(deserialize(" \n"), EmptyMessage))
+
+    def testDeserializeUnknownEnding(self):
+        self.assertRaises(BadMessageException, deserialize,
+                          "Invalid Board Move Too Slow")
+        self.assertRaises(BadMessageException, deserialize, "A1 A2 1 fled")
+
+    def testDeserializeIgnoresPrefix(self):
+        d1 = deserialize("Ref says A2 E3 2 win\n")
+        d2 = MoveMessage((0, 1), (4, 2), 2, "win")
+        self.assertEqual(d1, d2)
+
+    def testDeserializeMany(self):
+        d = deserialize_many(["A1 A2 1 move\n", "\n", "F A2\n",
+                              "2 Victory\n"])
+        self.assertEqual(d[0], MoveMessage((0, 0), (0, 1), 1, "move"))
+        self.assertTrue(isinstance(d[1], EmptyMessage))
+        self.assertEqual(d[2], FlagMessage((0, 1)))
+        self.assertEqual(d[3], WinningMessage("2"))
+
+    def testDeserializeManyBadMessage(self):
+        self.assertRaises(BadMessageException, deserialize_many,
+                          ["A1 A2 1 move", "Z1 A2 1 move"])
+
 
 if __name__ == '__main__':
     unittest.main()
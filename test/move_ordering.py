@@ -0,0 +1,55 @@
+import unittest
+from app.board import Board, Owner
+from app.move_ordering import MoveOrderer
+from app.piece import Piece
+from app.rank import Rank
+
+
+marshal = Piece((2, 5), Owner.PLAYER, Rank('9'))
+weak = Piece((2, 6), Owner.OPPONENT, Rank('2'))
+strong = Piece((1, 5), Owner.OPPONENT, Rank('9'))
+board = Board().place_piece(marshal).place_piece(weak).place_piece(strong)
+
+
+class TestMoveOrderer(unittest.TestCase):
+    def test_captures_first(self):
+        orderer = MoveOrderer()
+        moves = list(board.iterate_all_moves(Owner.PLAYER))
+        ordered = orderer.order(board, moves, 1, Owner.PLAYER)
+        self.assertEqual(ordered[0], ((2, 5), (2, 6)))
+        self.assertEqual(ordered[1], ((2, 5), (1, 5)))
+        self.assertEqual(sorted(ordered), sorted(moves))
+
+    def test_killer_moves(self):
+        orderer = MoveOrderer()
+        killer = ((2, 5), (3, 5))
+        orderer.record_cutoff(board, killer, 2)
+        moves = list(board.iterate_all_moves(Owner.PLAYER))
+        # Killers come right after the even or better captures
+        self.assertEqual(orderer.order(board, moves, 2, Owner.PLAYER)[2],
+                         killer)
+        # At other depths only its history counts
+        self.assertEqual(orderer.score(board, killer, 3, Owner.PLAYER), 4)
+
+    def test_keeps_two_killers_per_depth(self):
+        orderer = MoveOrderer()
+        for dest in [(3, 5), (2, 4), (4, 5)]:
+            orderer.record_cutoff(board, ((2, 5), dest), 1)
+        self.assertEqual(orderer.killers[1],
+                         [((2, 5), (4, 5)), ((2, 5), (2, 4))])
+
+    def test_history(self):
+        orderer = MoveOrderer()
+        orderer.record_cutoff(board, ((2, 5), (3, 5)), 3)
+        orderer.record_cutoff(board, ((2, 5), (3, 5)), 2)
+        self.assertEqual(orderer.history[((2, 5), (3, 5))], 13)
+        orderer.new_turn()
+        self.assertEqual(orderer.history, {})
+
+    def test_captures_are_not_killers(self):
+        orderer = MoveOrderer()
+        orderer.record_cutoff(board, ((2, 5), (2, 6)), 1)
+        self.assertEqual(orderer.killers, {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import time
+from app.board import Board, Owner
+from app.piece import Piece
+from app.rank import Rank
+from app.parallel import ParallelEngine
+import app.board_codec as board_codec
+import app.numeric as numeric
+import app.parallel as parallel
+import app.piece_square as piece_square
+import app.search as search
+from app.search import NODES_PER_TIME_CHECK
+
+
+flag = Piece((1, 0), Owner.PLAYER, Rank('F'))
+marshal = Piece((2, 5), Owner.PLAYER, Rank('9'))
+scout = Piece((0, 0), Owner.PLAYER, Rank('3'))
+weak = Piece((2, 6), Owner.OPPONENT, Rank('2'))
+enemy_flag = Piece((1, 11), Owner.OPPONENT, Rank('F'))
+enemy_scout = Piece((4, 11), Owner.OPPONENT, Rank('3'))
+board = (Board().place_piece(flag).place_piece(marshal).place_piece(scout)
+         .place_piece(weak).place_piece(enemy_flag).place_piece(enemy_scout))
+
+
+class TestParallelEngine(unittest.TestCase):
+    def test_expectimax_workers(self):
+        engine = ParallelEngine(search.EXPECTIMAX, 2)
+        try:
+            move = engine.search(board, time.monotonic() + 1)
+            self.assertEqual(move, ((2, 5), (2, 6)))
+            self.assertTrue(engine.depth > 0)
+        finally:
+            engine.shutdown()
+
+    def test_worker_completes_first_iteration(self):
+        parallel._start_worker(search.EXPECTIMAX, 0, numeric.get_backend(),
+                               piece_square.TABLES)
+        moves = list(board.iterate_all_moves(Owner.PLAYER))
+        search.NODES_PER_TIME_CHECK = 1
+        try:
+            results = parallel._search(board_codec.encode(board),
+                                       board_codec.encode_moves(moves),
+                                       time.monotonic())
+        finally:
+            search.NODES_PER_TIME_CHECK = NODES_PER_TIME_CHECK
+        self.assertEqual(results[0][0], 1)
+        self.assertTrue(results[0][2] in moves)
+
+    def test_mcts_workers(self):
+        engine = ParallelEngine(search.MCTS, 2)
+        try:
+            move = engine.search(board, time.monotonic() + 0.5)
+            self.assertTrue(
+                move in list(board.iterate_all_moves(Owner.PLAYER)))
+        finally:
+            engine.shutdown()
+
+if __name__ == '__main__':
+    unittest.main()
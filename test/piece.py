@@ -1,8 +1,9 @@
 import unittest
 from app.piece import Piece
-from app.rank import Rank
+from app.rank import Rank, RANK_NAMES
 from app.board import Board, Owner
 from fractions import Fraction
+import app.numeric as numeric
 
 opponent_board = Board().initialize_opponent_pieces()
 p1 = Piece((0, 1), Owner.PLAYER, Rank('1'))
@@ -12,6 +13,36 @@ flag = Piece((0, 1), Owner.PLAYER, Rank('F'))
 landmine = Piece((0, 0), Owner.PLAYER, Rank('L'))
 
 
+def rules_outcome(rank, other_rank):
+    """
+    str str -> Result
+
+    The attack rules as written before they were tabulated in app.rank,
+    kept here so the table can be checked against something other than
+    itself.
+
+    """
+    def wins_against(rank, other_rank):
+        if rank in "123456789":
+            if other_rank in "123456789":
+                return rank > other_rank
+            elif other_rank == 'B':
+                return False
+            elif other_rank == 'L':
+                return rank == '1'
+            else:
+                return True
+        else:
+            return False
+
+    if wins_against(rank, other_rank):
+        return "win"
+    elif wins_against(other_rank, rank):
+        return "loss"
+    else:
+        return "tie"
+
+
 class TestPiece(unittest.TestCase):
     def test_create_rank_with_dict_of_ranks(self):
         p = Piece((0, 0), Owner.PLAYER, {Rank('1'): 1})
@@ -52,5 +83,58 @@ class TestPiece(unittest.TestCase):
         self.assertEqual(p_after.probability(Rank('8')), Fraction('1/4'))
         self.assertEqual(p_after.probability(Rank('9')), Fraction('1/4'))
 
+    def test_expected_attack_outcome_matches_rules(self):
+        for a in RANK_NAMES:
+            for b in RANK_NAMES:
+                self.assertEqual(Rank(a).attack_outcome(Rank(b)),
+                                 rules_outcome(a, b))
+
+        attackers = [Piece((0, 0), Owner.PLAYER, Rank(r))
+                     for r in "123456789B"]
+        for attacker in attackers:
+            for defender in opponent_board.pieces_list:
+                p_win = p_tie = p_loss = 0
+                for a in attacker.ranks():
+                    for b in defender.ranks():
+                        p = attacker.probability(a) * defender.probability(b)
+                        outcome = rules_outcome(a.rank, b.rank)
+                        if outcome == "win":
+                            p_win += p
+                        elif outcome == "loss":
+                            p_loss += p
+                        else:
+                            p_tie += p
+                self.assertEqual(
+                    attacker.expected_attack_outcome(defender),
+                    (p_win, p_tie, p_loss))
+
+    def test_expected_attack_outcome_against_known_piece(self):
+        self.assertEqual(p2.expected_attack_outcome(opponent), (0, 0, 1))
+        self.assertEqual(opponent.expected_attack_outcome(p2), (1, 0, 0))
+
+    def test_distribution_is_cached(self):
+        hq_piece = opponent_board.piece_at((1, 11))
+        self.assertTrue(hq_piece.distribution() is hq_piece.distribution())
+        self.assertEqual(sum(hq_piece.distribution()), 1)
+        self.assertEqual(hq_piece.distribution()[Rank('L').code],
+                         Fraction('1/6'))
+
+    def test_move_keeps_cached_distribution(self):
+        piece = opponent_board.piece_at((0, 6))
+        moved = piece.move((0, 5))
+        self.assertEqual(moved.position, (0, 5))
+        self.assertTrue(moved.distribution() is piece.distribution())
+
+    def test_probability_with_float_backend(self):
+        hq_piece = opponent_board.piece_at((1, 11))
+        numeric.set_backend(numeric.FLOAT)
+        try:
+            self.assertTrue(isinstance(hq_piece.probability(Rank('F')), float))
+            self.assertAlmostEqual(hq_piece.probability(Rank('1')), 21 / 456)
+            self.assertAlmostEqual(
+                sum(hq_piece.probability(r) for r in hq_piece.ranks()), 1)
+        finally:
+            numeric.set_backend(numeric.EXACT)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+import app.board_layout as board_layout
+import app.piece_square as piece_square
+from app.rank import Rank
+
+
+tables = piece_square.generate()
+
+
+def value(rank, position):
+    return tables[Rank(rank).code][board_layout.index_of(position)]
+
+
+class TestPieceSquare(unittest.TestCase):
+    def test_generate(self):
+        self.assertEqual(len(tables), 12)
+        for table in tables:
+            self.assertEqual(len(table), board_layout.NUM_SPACES)
+
+    def test_enemy_headquarters(self):
+        self.assertEqual(sorted(piece_square.enemy_headquarters()),
+                         [(1, 11), (3, 11)])
+
+    def test_stationary_ranks_have_no_value(self):
+        self.assertEqual(set(tables[Rank('F').code]), {0.0})
+        self.assertEqual(set(tables[Rank('L').code]), {0.0})
+
+    def test_values_favour_advancing(self):
+        self.assertLess(value('5', (0, 5)), value('5', (0, 6)))
+        self.assertLess(value('5', (0, 6)), value('5', (1, 7)))
+
+    def test_values_favour_headquarters(self):
+        self.assertGreater(value('5', (1, 11)), value('5', (0, 11)))
+        self.assertGreater(value('5', (1, 11)), value('5', (2, 11)))
+
+    def test_engineer_values_railroad(self):
+        self.assertGreater(value('1', (0, 5)), value('5', (0, 5)))
+        self.assertEqual(value('1', (0, 0)), value('5', (0, 0)))
+
+    def test_dump_and_load(self):
+        (fd, path) = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            piece_square.dump(tables, path)
+            self.assertEqual(piece_square.load(path), tables)
+        finally:
+            os.remove(path)
+
+    def test_load_malformed(self):
+        (fd, path) = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            with open(path, "w") as fp:
+                fp.write("# Only the flag\nF\n" + "0 0 0 0 0\n" * 12)
+            self.assertRaises(ValueError, piece_square.load, path)
+            with open(path, "w") as fp:
+                fp.write("F\n" + "0 0 0 0\n" * 12)
+            self.assertRaises(ValueError, piece_square.load, path)
+        finally:
+            os.remove(path)
+
+if __name__ == '__main__':
+    unittest.main()
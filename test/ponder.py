@@ -0,0 +1,71 @@
+import unittest
+import time
+from app.board import Board, Owner
+from app.message import MoveMessage
+from app.piece import Piece
+from app.ponder import Ponderer, PONDER_REPLIES
+from app.rank import Rank
+from app.mcts import ISMCTSEngine
+from app.search import ExpectimaxEngine
+from app.timing import CancellationToken
+
+
+flag = Piece((1, 0), Owner.PLAYER, Rank('F'))
+marshal = Piece((2, 5), Owner.PLAYER, Rank('9'))
+enemy_flag = Piece((1, 11), Owner.OPPONENT, Rank('F'))
+enemy = Piece((2, 6), Owner.OPPONENT, Rank('4'))
+board = (Board().place_piece(flag).place_piece(marshal)
+         .place_piece(enemy_flag).place_piece(enemy))
+
+
+class TestPonderer(unittest.TestCase):
+    def test_replies(self):
+        ponderer = Ponderer(ExpectimaxEngine(), 2)
+        replies = ponderer.replies(board)
+        self.assertTrue(0 < len(replies) <= PONDER_REPLIES)
+        # The attack on the marshal is most likely to be lost
+        self.assertEqual(replies[0], ((2, 6), (2, 5), "loss"))
+        moves = list(board.iterate_all_moves(Owner.OPPONENT))
+        for (src, dest, outcome) in replies:
+            self.assertTrue((src, dest) in moves)
+
+    def test_reuses_pondered_board(self):
+        ponderer = Ponderer(ExpectimaxEngine(max_depth=2), 2)
+        ponderer.start(board, 0.05)
+        time.sleep(0.3)
+        ponderer.stop()
+        ponderer.wait()
+        (src, dest, outcome) = ponderer.replies(board)[0]
+        msg = MoveMessage(src, dest, 2, outcome)
+        self.assertIs(ponderer.board_after(board, msg),
+                      ponderer.boards[(src, dest, outcome)])
+        self.assertEqual(ponderer.hits, 1)
+
+        other = MoveMessage((2, 6), (3, 6), 2, "move")
+        self.assertEqual(ponderer.board_after(board, other).pieces_list,
+                         board.update(other).pieces_list)
+        self.assertEqual(ponderer.misses, 1)
+
+    def test_stop_ends_search(self):
+        engine = ISMCTSEngine(seed=1)
+        ponderer = Ponderer(engine, 2)
+        ponderer.start(board, 60)
+        time.sleep(0.1)
+        start = time.monotonic()
+        ponderer.stop()
+        self.assertTrue(ponderer.token.is_cancelled())
+        ponderer.wait()
+        self.assertTrue(time.monotonic() - start < 1)
+        self.assertIsNone(ponderer.thread)
+
+    def test_cancelled_search_returns_at_once(self):
+        engine = ExpectimaxEngine()
+        token = CancellationToken()
+        token.cancel()
+        start = time.monotonic()
+        move = engine.search(board, start + 60, token)
+        self.assertTrue(time.monotonic() - start < 1)
+        self.assertTrue(move in list(board.iterate_all_moves(Owner.PLAYER)))
+
+if __name__ == '__main__':
+    unittest.main()
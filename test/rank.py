@@ -1,5 +1,6 @@
 import unittest
-from app.rank import Rank
+import pickle
+from app.rank import Rank, RANKS
 
 
 class TestRank(unittest.TestCase):
@@ -9,5 +10,31 @@ class TestRank(unittest.TestCase):
         r2 = Rank('1')
         self.assertTrue(r1 == r2)
 
+    def test_ranks_are_interned(self):
+        self.assertTrue(Rank('L') is Rank('L'))
+        self.assertTrue(pickle.loads(pickle.dumps(Rank('9'))) is Rank('9'))
+
+    def test_rank_codes(self):
+        self.assertEqual(Rank('1').code, 0)
+        self.assertEqual(Rank('F').code, 11)
+        for code, rank in enumerate(RANKS):
+            self.assertEqual(rank.code, code)
+
+    def test_attack_outcomes(self):
+        self.assertEqual(Rank('9').attack_outcome(Rank('8')), "win")
+        self.assertEqual(Rank('8').attack_outcome(Rank('9')), "loss")
+        self.assertEqual(Rank('5').attack_outcome(Rank('5')), "tie")
+        self.assertEqual(Rank('1').attack_outcome(Rank('L')), "win")
+        self.assertEqual(Rank('9').attack_outcome(Rank('L')), "tie")
+        self.assertEqual(Rank('9').attack_outcome(Rank('B')), "tie")
+        self.assertEqual(Rank('B').attack_outcome(Rank('1')), "tie")
+        self.assertEqual(Rank('1').attack_outcome(Rank('F')), "win")
+        self.assertTrue(Rank('1').wins_against(Rank('F')))
+        self.assertTrue(Rank('F').loses_against(Rank('1')))
+        self.assertTrue(Rank('B').ties_against(Rank('9')))
+
+    def test_invalid_rank(self):
+        self.assertRaises(ValueError, Rank, 'X')
+
 if __name__ == '__main__':
     unittest.main()
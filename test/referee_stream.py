@@ -0,0 +1,52 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from app.io import RefereeStream
+from app.message import MoveMessage, EmptyMessage
+
+
+async def exchange(stream, msg):
+    await stream.open()
+    received = await stream.receive()
+    await stream.send(msg)
+    last = await stream.receive()
+    stream.close()
+    return (received, last)
+
+
+class TestRefereeStream(unittest.TestCase):
+    def test_pipes(self):
+        (input_read, input_write) = os.pipe()
+        (output_read, output_write) = os.pipe()
+        with open(input_read, "rb", buffering=0) as input, \
+                open(output_write, "wb", buffering=0) as output:
+            os.write(input_write, b"A1 A2 1 move\n")
+            os.close(input_write)
+            stream = RefereeStream(input, output)
+            (received, last) = asyncio.run(
+                exchange(stream, MoveMessage((2, 1), (3, 2))))
+            self.assertIsNotNone(stream.reader)
+            self.assertIsNotNone(stream.writer)
+            self.assertEqual(os.read(output_read, 100), b"( C2 D3 )")
+        os.close(output_read)
+        self.assertEqual(received, MoveMessage((0, 0), (0, 1), 1, "move"))
+        self.assertTrue(isinstance(last, EmptyMessage))
+
+    def test_files(self):
+        with tempfile.TemporaryFile("w+") as input, \
+                tempfile.TemporaryFile("w+") as output:
+            input.write("A1 A2 1 move\n")
+            input.seek(0)
+            stream = RefereeStream(input, output)
+            (received, last) = asyncio.run(
+                exchange(stream, MoveMessage((2, 1), (3, 2))))
+            self.assertIsNone(stream.reader)
+            self.assertIsNone(stream.writer)
+            output.seek(0)
+            self.assertEqual(output.read(), "( C2 D3 )")
+        self.assertEqual(received, MoveMessage((0, 0), (0, 1), 1, "move"))
+        self.assertTrue(isinstance(last, EmptyMessage))
+
+if __name__ == '__main__':
+    unittest.main()
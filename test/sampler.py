@@ -0,0 +1,66 @@
+import unittest
+import random
+from collections import Counter
+from app.board import Board, Owner
+from app.piece import Piece
+from app.rank import Rank, RANKS, INITIAL_RANK_COUNTS
+from app.sampler import placement_allows
+import app.board_parser as board_parser
+
+
+start_board = board_parser.parse_board().initialize_opponent_pieces()
+
+
+class TestRankSampler(unittest.TestCase):
+    def assert_consistent(self, board, positions, assignment):
+        self.assertEqual(len(assignment), len(positions))
+        ranks = [RANKS[code] for code in assignment]
+        for (position, rank) in zip(positions, ranks):
+            piece = board.piece_at(position)
+            self.assertEqual(piece.owner, Owner.OPPONENT)
+            self.assertTrue(piece.probability(rank) > 0)
+            self.assertTrue(placement_allows(position, rank.code))
+        counts = Counter(ranks)
+        for (rank, count) in counts.items():
+            self.assertTrue(count <= INITIAL_RANK_COUNTS[rank])
+        self.assertEqual(counts[Rank('F')], 1)
+
+    def test_samples_are_consistent(self):
+        generator = random.Random(1)
+        for i in range(50):
+            (positions, assignment) = start_board.sample_ranks(generator)
+            self.assertEqual(len(positions), 25)
+            self.assert_consistent(start_board, positions, assignment)
+
+    def test_samples_with_beliefs(self):
+        b = start_board.with_beliefs().set_flag((3, 11))
+        sampler = b.rank_sampler()
+        for assignment in sampler.sample_many(20, random.Random(2)):
+            self.assert_consistent(b, sampler.positions, assignment)
+            flag = sampler.positions[list(assignment).index(Rank('F').code)]
+            self.assertEqual(flag, (3, 11))
+
+    def test_placement_rules(self):
+        self.assertTrue(placement_allows((1, 11), Rank('F').code))
+        self.assertFalse(placement_allows((0, 11), Rank('F').code))
+        self.assertTrue(placement_allows((0, 10), Rank('L').code))
+        self.assertFalse(placement_allows((0, 9), Rank('L').code))
+        self.assertTrue(placement_allows((0, 6), Rank('B').code))
+
+    def test_moved_landmine_excluded(self):
+        # A piece could only be a landmine here if it had moved
+        numerators = {Rank('L'): 1, Rank('5'): 1}
+        denominators = {Rank('L'): 2, Rank('5'): 2}
+        piece = Piece((2, 8), Owner.OPPONENT, numerators, denominators)
+        b = Board().place_piece(piece)
+        (positions, assignment) = b.sample_ranks(random.Random(3))
+        self.assertEqual(list(assignment), [Rank('5').code])
+
+    def test_sampler_is_reused(self):
+        self.assertIs(start_board.rank_sampler(), start_board.rank_sampler())
+        moved = start_board.move_piece((0, 6), (0, 5))
+        self.assertIsNot(moved.rank_sampler(), start_board.rank_sampler())
+        self.assertTrue((0, 5) in moved.rank_sampler().positions)
+
+if __name__ == '__main__':
+    unittest.main()
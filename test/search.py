@@ -0,0 +1,139 @@
+import unittest
+import time
+from app.board import Board, Owner
+from app.piece import Piece
+import app.belief as belief
+from app.belief import BeliefMatrix
+from app.rank import Rank, NUM_RANKS
+from app.search import ExpectimaxEngine, GreedyEngine, NODES_PER_TIME_CHECK
+import app.search as search
+import app.strategy as strategy
+from app.timing import CancellationToken
+
+
+flag = Piece((1, 0), Owner.PLAYER, Rank('F'))
+marshal = Piece((2, 5), Owner.PLAYER, Rank('9'))
+weak = Piece((2, 6), Owner.OPPONENT, Rank('2'))
+strong = Piece((2, 6), Owner.OPPONENT, Rank('9'))
+enemy_flag = Piece((1, 11), Owner.OPPONENT, Rank('F'))
+
+
+class TestExpectimaxEngine(unittest.TestCase):
+    def test_takes_winning_capture(self):
+        b = Board().place_piece(flag).place_piece(enemy_flag)
+        b = b.place_piece(marshal).place_piece(weak)
+        engine = ExpectimaxEngine(max_depth=2)
+        self.assertEqual(engine.search(b, time.monotonic() + 10),
+                         ((2, 5), (2, 6)))
+        self.assertEqual(engine.depth, 2)
+
+    def test_avoids_losing_capture(self):
+        piece = Piece((2, 5), Owner.PLAYER, Rank('5'))
+        b = Board().place_piece(flag).place_piece(enemy_flag)
+        b = b.place_piece(piece).place_piece(strong)
+        engine = ExpectimaxEngine(max_depth=1)
+        self.assertNotEqual(engine.search(b, time.monotonic() + 10),
+                            ((2, 5), (2, 6)))
+
+    def test_chance_nodes_use_balanced_beliefs(self):
+        # Unbalanced, the defender is a 2 or a 9 with equal probability,
+        # but the opponent only has a 9 left
+        piece = Piece((2, 5), Owner.PLAYER, Rank('5'))
+        unknown = Piece((2, 6), Owner.OPPONENT,
+                        {Rank('2'): 1, Rank('9'): 1},
+                        {Rank('2'): 2, Rank('9'): 2})
+        b = Board().place_piece(flag).place_piece(enemy_flag)
+        b = b.place_piece(piece).place_piece(unknown)
+        engine = ExpectimaxEngine(max_depth=1)
+        self.assertEqual(engine.search(b, time.monotonic() + 10),
+                         ((2, 5), (2, 6)))
+
+        counts = [0.0] * NUM_RANKS
+        counts[Rank('9').code] = 1.0
+        counts[Rank('F').code] = 1.0
+        b = b.with_beliefs()
+        b.beliefs = BeliefMatrix(belief.from_board(b).rows,
+                                 tuple(counts)).balance()
+        self.assertNotEqual(engine.search(b, time.monotonic() + 10),
+                            ((2, 5), (2, 6)))
+
+    def test_captures_flag(self):
+        scout = Piece((1, 10), Owner.PLAYER, Rank('3'))
+        b = Board().place_piece(flag).place_piece(marshal)
+        b = b.place_piece(weak).place_piece(scout).place_piece(enemy_flag)
+        engine = ExpectimaxEngine(max_depth=2)
+        self.assertEqual(engine.search(b, time.monotonic() + 10),
+                         ((1, 10), (1, 11)))
+        self.assertEqual(engine.best_value, strategy.WIN_SCORE)
+
+    def test_no_moves(self):
+        b = Board().place_piece(flag)
+        engine = ExpectimaxEngine()
+        self.assertEqual(engine.search(b, time.monotonic() + 10), None)
+
+    def test_has_move_when_out_of_time(self):
+        b = Board().place_piece(flag).place_piece(marshal).place_piece(weak)
+        engine = ExpectimaxEngine()
+        move = engine.search(b, time.monotonic())
+        self.assertTrue(move in list(b.iterate_all_moves(Owner.PLAYER)))
+
+    def test_completes_first_iteration_when_out_of_time(self):
+        b = Board().place_piece(flag).place_piece(marshal).place_piece(weak)
+        engine = ExpectimaxEngine()
+        search.NODES_PER_TIME_CHECK = 1
+        try:
+            engine.search(b, time.monotonic())
+        finally:
+            search.NODES_PER_TIME_CHECK = NODES_PER_TIME_CHECK
+        self.assertEqual(engine.depth, 1)
+
+    def test_cancelled_first_iteration_stops(self):
+        b = Board().place_piece(flag).place_piece(marshal).place_piece(weak)
+        token = CancellationToken()
+        token.cancel()
+        engine = ExpectimaxEngine()
+        search.NODES_PER_TIME_CHECK = 1
+        try:
+            move = engine.search(b, time.monotonic() + 10, token)
+        finally:
+            search.NODES_PER_TIME_CHECK = NODES_PER_TIME_CHECK
+        self.assertEqual(engine.depth, 0)
+        self.assertTrue(move in list(b.iterate_all_moves(Owner.PLAYER)))
+
+    def test_search_leaves_board_unchanged(self):
+        b = Board().place_piece(flag).place_piece(marshal).place_piece(weak)
+        cells = list(b.cells)
+        ExpectimaxEngine(max_depth=3).search(b, time.monotonic() + 10)
+        self.assertEqual(b.cells, cells)
+
+    def test_table_keeps_result(self):
+        b = Board().place_piece(flag).place_piece(marshal)
+        b = b.place_piece(Piece((4, 0), Owner.PLAYER, Rank('3')))
+        b = b.place_piece(Piece((1, 11), Owner.OPPONENT, Rank('F')))
+        b = b.place_piece(Piece((3, 9), Owner.OPPONENT, Rank('4')))
+        plain = ExpectimaxEngine(max_depth=4, ordering=False, table_mb=0)
+        cached = ExpectimaxEngine(max_depth=4, ordering=False, table_mb=1)
+        plain.search(b, time.monotonic() + 60)
+        cached.search(b, time.monotonic() + 60)
+        self.assertAlmostEqual(plain.best_value, cached.best_value)
+        self.assertTrue(cached.table.hits > 0)
+        self.assertTrue(cached.nodes < plain.nodes)
+
+    def test_greedy_engine(self):
+        b = Board().place_piece(flag).place_piece(marshal).place_piece(weak)
+        engine = GreedyEngine()
+        move = engine.search(b, time.monotonic() + 10)
+        self.assertTrue(move in list(b.iterate_all_moves(Owner.PLAYER)))
+        self.assertEqual(engine.search(Board().place_piece(flag),
+                                       time.monotonic() + 10), None)
+
+    def test_evaluate_without_flag(self):
+        b = Board().place_piece(marshal)
+        self.assertEqual(strategy.evaluate(b), -strategy.WIN_SCORE)
+
+    def test_evaluate_flag_captured(self):
+        b = Board().place_piece(flag).place_piece(marshal)
+        self.assertEqual(strategy.evaluate(b), strategy.WIN_SCORE)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+from app.board import Board, Owner, PieceNotFoundException
+from app.piece import Piece
+from app.rank import Rank
+from app.search_board import SearchBoard
+
+
+p1 = Piece((0, 1), Owner.PLAYER, Rank('1'))
+p2 = Piece((0, 0), Owner.PLAYER, Rank('4'))
+opponent = Piece((0, 2), Owner.OPPONENT, Rank('8'))
+board = Board().place_piece(p1).place_piece(p2).place_piece(opponent)
+
+
+class TestSearchBoard(unittest.TestCase):
+    def test_make_move(self):
+        b = SearchBoard(board)
+        b.make_move((0, 0), (1, 0), "move")
+        self.assertEqual(b.piece_at((0, 0)), None)
+        self.assertEqual(b.piece_at((1, 0)), p2.move((1, 0)))
+
+    def test_make_move_does_not_change_original_board(self):
+        b = SearchBoard(board)
+        b.make_move((0, 1), (0, 2), "win")
+        self.assertEqual(board.piece_at((0, 1)), p1)
+        self.assertEqual(board.piece_at((0, 2)), opponent)
+
+    def test_make_move_with_each_outcome(self):
+        b = SearchBoard(board)
+        b.make_move((0, 1), (0, 2), "win")
+        self.assertEqual(b.piece_at((0, 2)), p1.move((0, 2)))
+        b.unmake_move()
+        b.make_move((0, 1), (0, 2), "loss")
+        self.assertEqual(b.piece_at((0, 1)), None)
+        self.assertEqual(b.piece_at((0, 2)), opponent)
+        b.unmake_move()
+        b.make_move((0, 1), (0, 2), "tie")
+        self.assertEqual(b.piece_at((0, 1)), None)
+        self.assertEqual(b.piece_at((0, 2)), None)
+
+    def test_unmake_move_restores_board(self):
+        b = SearchBoard(board)
+        b.make_move((0, 1), (0, 2), "win")
+        b.make_move((0, 2), (0, 3), "move")
+        b.unmake_move()
+        b.unmake_move()
+        self.assertEqual(b.cells, board.cells)
+        self.assertEqual(b.history, [])
+
+    def test_unmake_move_restores_tallies(self):
+        b = SearchBoard(board)
+        b.make_move((0, 1), (0, 2), "win")
+        self.assertEqual(b.material, [6, 0])
+        self.assertEqual(b.rank_counts[Owner.OPPONENT][Rank('8').code], 0)
+        b.unmake_move()
+        self.assertEqual(b.rank_counts, board.rank_counts)
+        self.assertEqual(b.material, board.material)
+        self.assertEqual(b.movable, board.movable)
+        self.assertEqual(b.mobile, board.mobile)
+        self.assertEqual(b.placement, board.placement)
+
+    def test_make_move_keeps_tallies_of_original_board(self):
+        counts = [list(c) for c in board.rank_counts]
+        b = SearchBoard(board)
+        b.make_move((0, 1), (0, 2), "tie")
+        self.assertEqual(board.rank_counts, counts)
+        self.assertEqual(b.movable, [1, 0])
+        self.assertEqual(b.to_board().rank_counts, b.rank_counts)
+
+    def test_make_move_nonexistant(self):
+        b = SearchBoard(board)
+        self.assertRaises(PieceNotFoundException,
+                          b.make_move, (2, 1), (3, 2), "move")
+
+    def test_iterate_all_moves_follows_make_move(self):
+        b = SearchBoard(board)
+        b.make_move((0, 0), (1, 0), "move")
+        expected = board.move_piece((0, 0), (1, 0))
+        self.assertEqual(sorted(b.iterate_all_moves(Owner.PLAYER)),
+                         sorted(expected.iterate_all_moves(Owner.PLAYER)))
+
+    def test_to_board(self):
+        b = SearchBoard(board)
+        b.make_move((0, 1), (0, 2), "tie")
+        self.assertEqual(b.to_board().serialize(), "( ( A1 4 ) )")
+
+if __name__ == '__main__':
+    unittest.main()
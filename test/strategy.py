@@ -0,0 +1,46 @@
+import unittest
+import random
+from app.board import Owner
+from app.rank import Rank
+from app.board_layout import index_of
+import app.piece_square as piece_square
+import app.board_parser as board_parser
+import app.strategy as strategy
+
+
+board = board_parser.parse_board().initialize_opponent_pieces()
+board = board.remove_piece((0, 0)).remove_piece((2, 5))
+
+
+class TestStrategy(unittest.TestCase):
+    def test_score_moves_matches_action_value(self):
+        moves = list(board.iterate_all_moves(Owner.PLAYER))
+        self.assertTrue(any(board.piece_at(dest) is not None
+                            for (src, dest) in moves))
+
+        random.seed(4500)
+        expected = [strategy.action_value(board, src, dest)
+                    for (src, dest) in moves]
+        random.seed(4500)
+        self.assertEqual(strategy.score_moves(board, moves), expected)
+
+    def test_evaluate_matches_pieces(self):
+        worths = dict(strategy.RANK_WORTH)
+        worths[Rank('F')] = strategy.FLAG_WORTH
+        expected = 0
+        for piece in board.pieces_list:
+            worth = sum(piece.probability(rank) * w
+                        for (rank, w) in worths.items())
+            if piece.owner == Owner.PLAYER:
+                table = piece_square.TABLES[piece.get_rank().code]
+                expected += worth + (strategy.PLACEMENT_FACTOR *
+                                     table[index_of(piece.position)])
+            else:
+                expected -= worth
+        self.assertAlmostEqual(strategy.evaluate(board), expected)
+
+    def test_score_no_moves(self):
+        self.assertEqual(strategy.score_moves(board, []), [])
+
+if __name__ == '__main__':
+    unittest.main()
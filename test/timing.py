@@ -0,0 +1,57 @@
+import asyncio
+import unittest
+import threading
+import time
+from app.timing import CancellationToken, TimeManager, MIN_RESERVE, \
+    SAFETY_FACTOR
+
+
+class TestCancellationToken(unittest.TestCase):
+    def test_cancel(self):
+        token = CancellationToken()
+        self.assertFalse(token.is_cancelled())
+        self.assertFalse(token.wait(0))
+        token.cancel()
+        self.assertTrue(token.is_cancelled())
+        self.assertTrue(token.wait(0))
+
+    def test_cancel_from_another_thread(self):
+        token = CancellationToken()
+        threading.Timer(0.01, token.cancel).start()
+        self.assertTrue(token.wait(5))
+
+
+class TestTimeManager(unittest.TestCase):
+    def test_deadline_keeps_reserve(self):
+        clock = TimeManager(1.5)
+        before = time.monotonic()
+        deadline = clock.start_move()
+        self.assertTrue(before + 1.5 - MIN_RESERVE <= deadline)
+        self.assertTrue(deadline <= time.monotonic() + 1.5 - MIN_RESERVE)
+
+    def test_reserve_follows_measured_latency(self):
+        clock = TimeManager(1.5)
+        self.assertEqual(clock.reserve(), MIN_RESERVE)
+        clock.measure(time.sleep, 0.05)
+        self.assertTrue(clock.reserve() >= SAFETY_FACTOR * 0.05)
+
+        deadline = clock.start_move()
+        self.assertTrue(deadline <= clock.received + 1.5 - 0.1)
+
+    def test_measure_async(self):
+        clock = TimeManager(1.5)
+        result = asyncio.run(clock.measure_async(asyncio.sleep(0.05, 3)))
+        self.assertEqual(result, 3)
+        self.assertTrue(clock.reserve() >= SAFETY_FACTOR * 0.05)
+
+    def test_move_timing(self):
+        clock = TimeManager(1)
+        clock.start_move()
+        clock.search_ended()
+        time.sleep(0.02)
+        clock.move_sent()
+        self.assertEqual(clock.moves, 1)
+        self.assertTrue(clock.latencies[-1] >= 0.02)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import os
+import tempfile
+import unittest
+import app.board_parser as board_parser
+import app.transcript as transcript
+from app.message import InitMessage, MoveMessage, FlagMessage, \
+    WinningMessage, EmptyMessage
+
+
+setup = board_parser.parse_board()
+messages = [MoveMessage((2, 1), (3, 2), 1, "move"),
+            MoveMessage((4, 11), (4, 10), 2, "move"),
+            MoveMessage((3, 2), (3, 3), 1, "move"),
+            FlagMessage((1, 11)),
+            MoveMessage((1, 10), (1, 9), 2, "move"),
+            WinningMessage("No")]
+
+
+def pieces_of(board):
+    return [(p.position, p.owner, p.distribution()) for p in board.pieces_list]
+
+
+class TestTranscript(unittest.TestCase):
+    def setUp(self):
+        (fd, self.path) = tempfile.mkstemp()
+        os.close(fd)
+        os.remove(self.path)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def record_game(self):
+        recorder = transcript.Recorder(self.path, 1, 1500)
+        recorder.record(InitMessage(setup))
+        recorder.record_our_move(((2, 1), (3, 2)), 0.0, 0.0)
+        recorder.record(EmptyMessage())
+        for msg in messages:
+            recorder.record(msg)
+            if msg is messages[1]:
+                recorder.record_our_move(((3, 2), (3, 3)), 1.25, 0.0025)
+        recorder.close()
+
+    def test_record_and_read(self):
+        self.record_game()
+        [game] = transcript.read_games(self.path)
+        self.assertEqual((game.turn, game.time), (1, 1500))
+        self.assertEqual(pieces_of(game.setup()), pieces_of(setup))
+        self.assertEqual(game.messages, messages)
+        self.assertEqual(game.plies(), 4)
+        self.assertEqual(game.result(), "No")
+        self.assertEqual([(ply, move) for (ply, move, s, l)
+                          in game.our_moves],
+                         [(0, ((2, 1), (3, 2))), (2, ((3, 2), (3, 3)))])
+        self.assertAlmostEqual(game.our_moves[1][2], 1.25)
+        self.assertAlmostEqual(game.our_moves[1][3], 0.0025)
+
+    def test_compact(self):
+        self.record_game()
+        self.assertLess(os.path.getsize(self.path), 120)
+
+    def test_board_at(self):
+        self.record_game()
+        [game] = transcript.read_games(self.path)
+        board = setup.initialize_opponent_pieces().with_beliefs()
+        self.assertEqual(pieces_of(game.board_at(0)), pieces_of(board))
+        for msg in messages[:3]:
+            board = board.update(msg)
+        board = board.set_flag((1, 11))
+        self.assertEqual(pieces_of(game.board_at(3)), pieces_of(board))
+        self.assertEqual(game.board_at(3).beliefs.rows, board.beliefs.rows)
+        board = board.update(messages[4])
+        self.assertEqual(pieces_of(game.board_at(4)), pieces_of(board))
+
+    def test_games_are_appended(self):
+        self.record_game()
+        self.record_game()
+        games = transcript.read_games(self.path)
+        self.assertEqual(len(games), 2)
+        self.assertEqual(games[1].messages, messages)
+
+    def test_cut_short(self):
+        self.record_game()
+        with open(self.path, "rb") as fp:
+            data = fp.read()
+        [game] = transcript.decode(data[:-3])
+        self.assertEqual(game.messages, messages[:-2])
+        self.assertEqual(game.result(), None)
+
+    def test_game_appended_after_one_cut_short(self):
+        self.record_game()
+        with open(self.path, "rb") as fp:
+            data = fp.read()
+        with open(self.path, "wb") as fp:
+            fp.write(data[:-3])
+        self.record_game()
+        games = transcript.read_games(self.path)
+        self.assertEqual(len(games), 2)
+        self.assertEqual(games[0].messages, messages[:-2])
+        self.assertEqual(games[1].messages, messages)
+
+    def test_unknown_record_keeps_games(self):
+        self.record_game()
+        with open(self.path, "ab") as fp:
+            fp.write(b"\xff\x00\x00")
+        self.record_game()
+        games = transcript.read_games(self.path)
+        self.assertEqual(len(games), 2)
+        self.assertEqual(games[0].result(), "No")
+        self.assertEqual(games[1].messages, messages)
+
+    def test_not_a_transcript(self):
+        self.record_game()
+        self.assertRaises(ValueError, transcript.decode, b"( A1 2 )")
+
+if __name__ == '__main__':
+    unittest.main()
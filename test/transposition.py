@@ -0,0 +1,64 @@
+import unittest
+from app.board import Board, Owner
+from app.piece import Piece
+from app.rank import Rank
+from app.transposition import TranspositionTable, EXACT, LOWER, \
+    ENTRY_BYTES
+import app.zobrist as zobrist
+
+
+move = ((0, 0), (1, 0))
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_store_and_probe(self):
+        table = TranspositionTable(1)
+        table.store(12345, 3, 1.5, EXACT, move)
+        self.assertEqual(table.probe(12345), (12345, 3, 1.5, EXACT, move))
+        self.assertEqual(table.probe(54321), None)
+        self.assertEqual((table.probes, table.hits), (2, 1))
+
+    def test_size_cap(self):
+        table = TranspositionTable(2)
+        self.assertTrue(len(table.slots) * ENTRY_BYTES <= 2 * 2 ** 20)
+        self.assertTrue(len(table.slots) * ENTRY_BYTES > 2 ** 20)
+
+    def test_depth_preferred_and_always_replace(self):
+        table = TranspositionTable(1)
+        # Three keys in the same bucket
+        (k1, k2, k3) = [1 + i * table.buckets for i in range(3)]
+        table.store(k1, 5, 1.0, EXACT, move)
+        table.store(k2, 2, 2.0, EXACT, move)
+        table.store(k3, 1, 3.0, LOWER, None)
+
+        # The deep entry is kept and the shallow ones replace each other
+        self.assertEqual(table.probe(k1)[1], 5)
+        self.assertEqual(table.probe(k2), None)
+        self.assertEqual(table.probe(k3)[2], 3.0)
+        self.assertEqual(table.collisions, 1)
+
+        # A deeper entry takes the depth-preferred slot
+        table.store(k2, 6, 4.0, EXACT, move)
+        self.assertEqual(table.probe(k1), None)
+        self.assertEqual(table.probe(k2)[1], 6)
+        self.assertEqual(table.collisions, 2)
+
+    def test_fill_and_clear(self):
+        table = TranspositionTable(1)
+        self.assertEqual(table.fill(), 0)
+        table.store(1, 1, 0, EXACT, None)
+        table.store(1, 2, 0, EXACT, None)
+        self.assertEqual(table.fill(), 1 / len(table.slots))
+        table.clear()
+        self.assertEqual((table.fill(), table.stores, table.probe(1)),
+                         (0, 0, None))
+
+    def test_side_to_move_changes_key(self):
+        b = Board().place_piece(Piece((0, 0), Owner.PLAYER, Rank('4')))
+        self.assertEqual(zobrist.position_key(b, Owner.PLAYER),
+                         b.zobrist_key)
+        self.assertNotEqual(zobrist.position_key(b, Owner.OPPONENT),
+                            b.zobrist_key)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from app.board import Board, Owner
+from app.piece import Piece
+from app.rank import Rank
+from app.search_board import SearchBoard
+import app.zobrist as zobrist
+
+
+opponent_board = Board().initialize_opponent_pieces()
+p1 = Piece((0, 1), Owner.PLAYER, Rank('1'))
+p2 = Piece((0, 0), Owner.PLAYER, Rank('4'))
+board = Board().place_piece(p1).place_piece(p2)
+
+
+class TestZobrist(unittest.TestCase):
+    def test_empty_board_key(self):
+        self.assertEqual(Board().zobrist_key, 0)
+
+    def test_piece_keys_differ_by_rank_and_owner(self):
+        p3 = Piece((0, 1), Owner.OPPONENT, Rank('1'))
+        p4 = Piece((0, 1), Owner.PLAYER, Rank('2'))
+        self.assertNotEqual(zobrist.piece_key(p1), zobrist.piece_key(p3))
+        self.assertNotEqual(zobrist.piece_key(p1), zobrist.piece_key(p4))
+
+    def test_incremental_key_matches_rebuilt_key(self):
+        b = board.move_piece((0, 0), (1, 0)).remove_piece((0, 1))
+        self.assertEqual(b.zobrist_key, Board(b.pieces_list).zobrist_key)
+
+    def test_same_position_by_different_move_orders(self):
+        b1 = board.move_piece((0, 0), (1, 0)).move_piece((0, 1), (0, 2))
+        b2 = board.move_piece((0, 1), (0, 2)).move_piece((0, 0), (1, 0))
+        self.assertEqual(b1.zobrist_key, b2.zobrist_key)
+        self.assertNotEqual(b1.zobrist_key, board.zobrist_key)
+
+    def test_rank_reveal_changes_key(self):
+        b = opponent_board.set_flag((1, 11))
+        self.assertNotEqual(b.zobrist_key, opponent_board.zobrist_key)
+        self.assertEqual(b.zobrist_key, Board(b.pieces_list).zobrist_key)
+
+    def test_exclude_ranks_keeps_key_while_hidden(self):
+        piece = opponent_board.piece_at((0, 6))
+        b = opponent_board.exclude_ranks(piece, {Rank('9')})
+        self.assertEqual(b.zobrist_key, opponent_board.zobrist_key)
+
+    def test_unmake_move_restores_key(self):
+        b = SearchBoard(board)
+        b.make_move((0, 0), (1, 0), "move")
+        self.assertEqual(b.zobrist_key,
+                         board.move_piece((0, 0), (1, 0)).zobrist_key)
+        b.unmake_move()
+        self.assertEqual(b.zobrist_key, board.zobrist_key)
+
+if __name__ == '__main__':
+    unittest.main()